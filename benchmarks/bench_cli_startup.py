@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Benchmark how long ``netmaster-pro scan`` takes to send its first probe.
+
+Each run starts a fresh interpreter that parses a scan command line, runs
+the headless CLI and exits at the first probe, reporting when each phase
+finished. The goal of under 100 ms from process start to the first probe
+is not met; "total" typically lands around 140 ms. The asyncio import the
+prober needs costs 40-70 ms on its own and cannot be deferred past the
+first probe. "own" reports everything after interpreter
+start except the asyncio import. Run ``python -m compileall src`` first;
+without cached bytecode every module is compiled on import.
+
+Usage: python benchmarks/bench_cli_startup.py [--runs N]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+
+CHILD = """
+import time
+start = time.time()
+marks = {}
+import json, os, sys
+from netmaster_pro import cli
+args = cli.build_parser().parse_args(["scan", "-n", "127.0.0.1/32", "-o", os.devnull])
+marks["parsed"] = time.time()
+import asyncio
+marks["asyncio"] = time.time()
+from netmaster_pro.core import scan_engine
+marks["engine"] = time.time()
+
+async def probe(self, ip):
+    marks["first_probe"] = time.time()
+    print(json.dumps(dict(marks, start=start)))
+    sys.stdout.flush()
+    os._exit(0)
+
+scan_engine.ScanEngine.probe = probe
+cli.run_headless(args)
+"""
+
+
+def run_once():
+    spawned = time.time()
+    result = subprocess.run([sys.executable, "-c", CHILD], capture_output=True, text=True, check=True,
+                            env=dict(os.environ, PYTHONPATH=SRC))
+    marks = json.loads(result.stdout)
+    return {
+        'interpreter': marks['start'] - spawned,
+        'parse': marks['parsed'] - marks['start'],
+        'asyncio': marks['asyncio'] - marks['parsed'],
+        'pipeline': marks['first_probe'] - marks['asyncio'],
+        'own': marks['first_probe'] - marks['start'] - (marks['asyncio'] - marks['parsed']),
+        'total': marks['first_probe'] - spawned,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+    runs = [run_once() for _ in range(args.runs)]
+    for phase in ('interpreter', 'parse', 'asyncio', 'pipeline', 'own', 'total'):
+        values = [run[phase] * 1000 for run in runs]
+        print(f"{phase:<12} median {statistics.median(values):6.1f} ms   max {max(values):6.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Compare the memory and query cost of device records.
+
+The legacy layout is a dict per device keyed by dotted-quad string, with
+preformatted display strings; the compact layout is a slotted Device keyed
+by its integer address. Memory is what tracemalloc attributes to building
+the whole collection, keys included. Queries on the legacy layout key the
+dotted quads with ``socket.inet_aton``, the cheapest ordering the standard
+library offers for them.
+
+Usage: python benchmarks/bench_device_memory.py [--count N]
+"""
+
+import argparse
+import ipaddress
+import os
+import socket
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from netmaster_pro.core.device import Device, ip_to_int, int_to_ip
+
+BASE = 0x0A000000  # 10.0.0.0
+
+
+def legacy_devices(count):
+    devices = {}
+    for i in range(count):
+        ip = int_to_ip(BASE + i)
+        devices[ip] = {
+            'ip': ip, 'mac': f"aa:bb:cc:{i >> 16 & 255:02x}:{i >> 8 & 255:02x}:{i & 255:02x}",
+            'hostname': f"host-{i}.lan", 'vendor': "Raspberry Pi Foundation", 'status': "Active",
+            'bandwidth': "0 KB/s", 'last_seen': float(i), 'stale': False, 'interface': "eth0"
+        }
+    return devices
+
+
+def compact_devices(count):
+    devices = {}
+    for i in range(count):
+        device = Device(BASE + i, mac=0xAABBCC000000 + i, hostname=f"host-{i}.lan",
+                        vendor="Raspberry Pi Foundation", interface="eth0", last_seen=float(i))
+        devices[device.address] = device
+    return devices
+
+
+def measure(build, count):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    devices = build(count)
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return devices, used
+
+
+def timed(fn, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--count", type=int, default=50000)
+    args = parser.parse_args()
+    count = args.count
+
+    legacy, legacy_bytes = measure(legacy_devices, count)
+    compact, compact_bytes = measure(compact_devices, count)
+    print(f"{count:,} devices")
+    print(f"  dict layout:    {legacy_bytes / 2**20:7.2f} MiB  {legacy_bytes / count:6.0f} B/device")
+    print(f"  Device records: {compact_bytes / 2**20:7.2f} MiB  {compact_bytes / count:6.0f} B/device "
+          f"({compact_bytes / legacy_bytes:.0%})")
+
+    # Sorting by address and selecting a /24 out of the middle of the range
+    subnet = ipaddress.IPv4Network(f"{int_to_ip(BASE + count // 2 & ~255)}/24")
+    low, high = int(subnet.network_address), int(subnet.broadcast_address)
+    # The dict layout's best plain-Python key: packed bytes order like the numbers
+    legacy_sort = timed(lambda: sorted(legacy, key=socket.inet_aton))
+    compact_sort = timed(lambda: sorted(compact))
+    low_key, high_key = subnet.network_address.packed, subnet.broadcast_address.packed
+    legacy_range = timed(lambda: [d for ip, d in legacy.items() if low_key <= socket.inet_aton(ip) <= high_key])
+    compact_range = timed(lambda: [d for a, d in compact.items() if low <= a <= high])
+    print(f"  sort by address: dict {legacy_sort * 1000:8.2f} ms   Device {compact_sort * 1000:8.2f} ms")
+    print(f"  /24 range query: dict {legacy_range * 1000:8.2f} ms   Device {compact_range * 1000:8.2f} ms")
+    assert ip_to_int(next(iter(legacy))) == next(iter(compact))
+
+
+if __name__ == "__main__":
+    main()
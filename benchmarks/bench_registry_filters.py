@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Compare filtering the device registry through its indexes with a linear pass.
+
+Builds registries of increasing size where a fixed number of devices match
+the filter, so indexed lookups should stay flat while linear scans grow
+with the registry.
+
+Usage: python benchmarks/bench_registry_filters.py [--sizes N ...] [--matches M]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from netmaster_pro.core.device import Device
+from netmaster_pro.core.registry import DeviceRegistry
+
+BASE = 0x0A000000  # 10.0.0.0
+
+
+def build(size, matches):
+    registry = DeviceRegistry()
+    for i in range(size):
+        registry.put(Device(BASE + i, mac=0xAABBCC000000 + i, interface="eth0",
+                            vendor="Rare Vendor" if i < matches else f"Vendor {i % 50}",
+                            stale=i % 10 == 0))
+    return registry
+
+
+def timed(fn, repeat=20):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="*", default=[1000, 10000, 50000])
+    parser.add_argument("--matches", type=int, default=20)
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        registry = build(size, args.matches)
+        linear = timed(lambda: [d for d in registry.values() if d.vendor == "Rare Vendor" and not d.stale])
+        indexed = timed(lambda: registry.find(vendor="Rare Vendor", status="Active"))
+        by_mac = timed(lambda: registry.by_mac(0xAABBCC000000 + size - 1))
+        print(f"{size:>7,} devices: linear {linear * 1e6:9.1f} us   indexed {indexed * 1e6:7.1f} us   "
+              f"by MAC {by_mac * 1e6:5.1f} us")
+
+
+if __name__ == "__main__":
+    main()
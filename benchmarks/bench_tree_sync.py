@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Compare redrawing the device list from scratch with incremental updates.
+
+For each list size a render changes a fixed number of rows (a status flip
+and a bandwidth tick), adds one device and removes one. The rebuild deletes
+and re-inserts every row, as the device list used to; TreeviewSync applies
+only the differences. Uses a real ttk.Treeview when a display is available,
+otherwise a stand-in that counts the Treeview calls each strategy makes.
+
+Without a display the times are Python time only. The stand-in makes no
+Tcl calls but does keep its rows, and that per-call bookkeeping counts
+against the rebuild. Both strategies are O(N) in Python per render:
+TreeviewSync still compares every row, and against a stand-in that does no
+work per call it can be the slower of the two. What it cuts is Treeview
+calls, from O(N) per render to O(changed rows), each a Tcl round trip that
+a real widget also has to redraw for; compare the call counts, or run with
+a display to see both costs together.
+
+Usage: python benchmarks/bench_tree_sync.py [--sizes N ...] [--changes K]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from netmaster_pro.core.tree_sync import TreeviewSync
+from netmaster_pro.utils.fake_tree import FakeTree
+
+
+def make_rows(size, generation, changes):
+    rows = []
+    for i in range(generation, size + generation):
+        changed = i % max(1, size // changes) == 0
+        rows.append((str(i), (f"10.0.{i >> 8 & 255}.{i & 255}", "aa:bb:cc:00:00:01", "host", "Vendor",
+                              "eth0", "Stale" if changed and generation % 2 else "Active",
+                              f"{generation if changed else 0} KB/s")))
+    return rows
+
+
+def rebuild(tree, rows):
+    tree.delete(*tree.get_children())
+    for iid, values in rows:
+        tree.insert("", "end", iid=iid, values=values)
+
+
+def bench(make_tree, size, changes, renders=10):
+    results = {}
+    for name in ("rebuild", "incremental"):
+        tree = make_tree()
+        sync = TreeviewSync(tree)
+        sync.apply(make_rows(size, 0, changes)) if name == "incremental" else rebuild(tree, make_rows(size, 0, changes))
+        frames = [make_rows(size, generation, changes) for generation in range(1, renders + 1)]
+        calls = getattr(tree, "calls", 0)
+        start = time.perf_counter()
+        for rows in frames:
+            sync.apply(rows) if name == "incremental" else rebuild(tree, rows)
+            if hasattr(tree, "update_idletasks"):
+                tree.update_idletasks()
+        results[name] = ((time.perf_counter() - start) / renders, (getattr(tree, "calls", 0) - calls) / renders)
+        if hasattr(tree, "destroy"):
+            tree.destroy()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="*", default=[100, 500, 2000, 10000])
+    parser.add_argument("--changes", type=int, default=5)
+    args = parser.parse_args()
+
+    try:
+        import tkinter as tk
+        from tkinter import ttk
+        root = tk.Tk()
+
+        def make_tree():
+            return ttk.Treeview(root, columns=tuple(range(7)), show="headings")
+        print("ttk.Treeview")
+    except Exception:
+        root = None
+        make_tree = FakeTree
+        print("No display: Python time only (no Tcl calls), counting Treeview calls")
+
+    for size in args.sizes:
+        results = bench(make_tree, size, args.changes)
+        line = f"{size:>6} rows"
+        for name, (seconds, calls) in results.items():
+            line += f"   {name}: {seconds * 1000:8.2f} ms/render"
+            if root is None:
+                line += f" {calls:7.0f} calls"
+        print(line)
+    if root is not None:
+        root.destroy()
+
+
+if __name__ == "__main__":
+    main()
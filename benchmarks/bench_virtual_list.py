@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Scroll a virtualized device list through a large registry.
+
+Fills a DeviceRegistry, then drags the view from top to bottom in steps
+the way a scrollbar does, rendering rows with the device manager's
+formatters. Reports the cost per scroll step and the largest number of
+rows ever held by the widget. With a display a real ttk.Treeview is used
+and compared with loading every row into a plain Treeview; without one a
+stand-in counts the Treeview calls.
+
+Usage: python benchmarks/bench_virtual_list.py [--count N] [--steps S]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from netmaster_pro.core.device import Device, format_mac, format_hostname, format_vendor, format_bandwidth
+from netmaster_pro.core.registry import DeviceRegistry, device_status
+from netmaster_pro.core.virtual_list import VirtualList
+from netmaster_pro.utils.fake_tree import FakeTree
+
+BASE = 0x0A000000  # 10.0.0.0
+
+
+def render(device):
+    return str(device.address), (device.ip, format_mac(device), format_hostname(device), format_vendor(device),
+                                 device.interface or "", device_status(device), format_bandwidth(device))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--count", type=int, default=50000)
+    parser.add_argument("--steps", type=int, default=500)
+    args = parser.parse_args()
+
+    registry = DeviceRegistry()
+    registry.merge({BASE + i: Device(BASE + i, mac=0xAABBCC000000 + i, hostname=f"host-{i}.lan",
+                                     vendor="Raspberry Pi Foundation", interface="eth0")
+                    for i in range(args.count)})
+    snapshot = registry.snapshot().devices
+    devices = [snapshot[address] for address in sorted(snapshot)]
+
+    try:
+        import tkinter as tk
+        from tkinter import ttk
+        root = tk.Tk()
+        tree = ttk.Treeview(root, columns=tuple(range(7)), show="headings", height=30)
+        tree.pack()
+        print(f"ttk.Treeview, {args.count:,} devices")
+    except Exception:
+        root = None
+        tree = FakeTree()
+        print(f"No display: counting Treeview calls, {args.count:,} devices")
+
+    view = VirtualList(tree, row_height=22, visible=30)
+    start = time.perf_counter()
+    view.set_rows(devices, render)
+    print(f"  first render:  {(time.perf_counter() - start) * 1000:8.2f} ms")
+
+    timings = []
+    for step in range(args.steps + 1):
+        start = time.perf_counter()
+        view.yview("moveto", str(step / args.steps))
+        if root is not None:
+            root.update_idletasks()
+        timings.append(time.perf_counter() - start)
+    timings.sort()
+    print(f"  scroll step:   p50 {timings[len(timings) // 2] * 1000:6.2f} ms   "
+          f"max {timings[-1] * 1000:6.2f} ms   over {args.steps} steps")
+    if root is None:
+        print(f"  rows in widget: peak {tree.peak}   Treeview calls {tree.calls:,}")
+    else:
+        print(f"  rows in widget: {len(tree.get_children())}")
+        plain = ttk.Treeview(root, columns=tuple(range(7)), show="headings")
+        start = time.perf_counter()
+        for device in devices:
+            iid, values = render(device)
+            plain.insert("", "end", iid=iid, values=values)
+        root.update_idletasks()
+        print(f"  plain Treeview load of every row: {(time.perf_counter() - start) * 1000:8.1f} ms")
+        root.destroy()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Compare per-keystroke cost of the WiFi network search.
+
+Types a query one character at a time over a large list of saved profiles.
+The rebuild strategy is what the list used to do on every keystroke:
+lowercase every SSID, filter, sort and re-insert every row. The indexed
+strategy is NetworkListFilter. A stand-in Treeview counts the calls each
+makes, so this runs without a display.
+
+Usage: python benchmarks/bench_wifi_search.py [--profiles N] [--query Q]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from netmaster_pro.core.wifi_search import NetworkListFilter
+from netmaster_pro.utils.fake_tree import FakeTree
+
+
+def render(network):
+    return network['ssid'], (network['security'], network['signal'], network['status'])
+
+
+def rebuild(tree, networks, query):
+    for item in tree.get_children():
+        tree.delete(item)
+    filtered = [n for n in networks if query.lower() in n['ssid'].lower()]
+    filtered.sort(key=lambda n: (not n['is_connected'], n['ssid'].lower()))
+    for network in filtered:
+        text, values = render(network)
+        tree.insert('', 'end', text=text, values=values)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--profiles", type=int, default=5000)
+    parser.add_argument("--query", default="lab-floor3")
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    words = ["Lab", "Office", "Guest", "Warehouse", "Site", "Store"]
+    networks = [{'ssid': f"{rng.choice(words)}-floor{rng.randrange(10)}-{i:05d}", 'security': "WPA2-Personal",
+                 'signal': "N/A", 'status': "Saved", 'password': None, 'is_connected': i == 0, 'is_saved': True}
+                for i in range(args.profiles)]
+    prefixes = [args.query[:n] for n in range(1, len(args.query) + 1)]
+
+    tree = FakeTree()
+    start = time.perf_counter()
+    for query in prefixes:
+        rebuild(tree, networks, query)
+    rebuild_time = (time.perf_counter() - start) / len(prefixes)
+    rebuild_calls = tree.calls / len(prefixes)
+
+    tree = FakeTree()
+    network_filter = NetworkListFilter(tree, render)
+    start = time.perf_counter()
+    network_filter.load(networks)
+    load_time = time.perf_counter() - start
+    tree.calls = 0
+    start = time.perf_counter()
+    for query in prefixes:
+        network_filter.filter(query)
+    indexed_time = (time.perf_counter() - start) / len(prefixes)
+    indexed_calls = tree.calls / len(prefixes)
+
+    print(f"{args.profiles:,} profiles, typing {args.query!r} ({len(network_filter.visible)} matches)")
+    print(f"  rebuild: {rebuild_time * 1000:7.2f} ms/keystroke  {rebuild_calls:8.1f} Treeview calls")
+    print(f"  indexed: {indexed_time * 1000:7.2f} ms/keystroke  {indexed_calls:8.1f} Treeview calls  "
+          f"(load once per refresh: {load_time * 1000:.1f} ms)")
+
+
+if __name__ == "__main__":
+    main()
@@ -67,7 +67,7 @@ setup(
     },
     entry_points={
         "console_scripts": [
-            "netmaster-pro=netmaster_pro.ui.main_interface:run",
+            "netmaster-pro=netmaster_pro.cli:main",
         ],
     },
     include_package_data=True,
@@ -9,10 +9,23 @@ __version__ = "1.0.0"
 __author__ = "Moanes BBR"
 __description__ = "Professional Network Management Suite"
 
-from .core.network_manager import NetworkManager
-from .core.wifi_qr_generator import WiFiQRGenerator
-from .ui.main_interface import MainInterface
-from .ui.splash_screen import SplashScreen
+# GUI classes are imported lazily so that the scanning core can be used
+# without tkinter, PIL or qrcode being importable.
+_LAZY_IMPORTS = {
+    "NetworkManager": ".core.network_manager",
+    "WiFiQRGenerator": ".core.wifi_qr_generator",
+    "MainInterface": ".ui.main_interface",
+    "SplashScreen": ".ui.splash_screen",
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_IMPORTS:
+        import importlib
+        module = importlib.import_module(_LAZY_IMPORTS[name], __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 __all__ = [
     "NetworkManager",
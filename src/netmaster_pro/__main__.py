@@ -12,21 +12,25 @@ import os
 # Add the src directory to the path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
 
-from netmaster_pro.ui.splash_screen import SplashScreen
-from netmaster_pro.ui.main_interface import MainInterface
-import tkinter as tk
-
 def launch_main():
     """Launch the main interface after splash screen closes"""
+    import tkinter as tk
+    from netmaster_pro.ui.main_interface import MainInterface
     root = tk.Tk()
     MainInterface(root)
     root.mainloop()
 
 def main():
     """Main function for console script entry point"""
+    # Subcommands (scan, daemon) run headless and must not import the GUI
+    if len(sys.argv) > 1:
+        from netmaster_pro.cli import main as cli_main
+        return cli_main()
+    
     # Show splash screen first, then launch main interface
+    from netmaster_pro.ui.splash_screen import SplashScreen
     splash = SplashScreen(on_close=launch_main)
     splash.show()
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    sys.exit(main()) 
\ No newline at end of file
@@ -0,0 +1,149 @@
+"""
+Command line entry point for NetMaster Pro.
+
+``netmaster-pro scan`` runs one discovery sweep and ``netmaster-pro daemon``
+keeps discovering until interrupted. Both stream device records and events
+as JSON lines and never import tkinter, PIL or qrcode, so they run on
+headless routers and servers. Without a subcommand the GUI is started.
+"""
+
+import argparse
+import json
+import signal
+import sys
+import threading
+import time
+
+DEVICE_FIELDS = ("ip", "mac", "hostname", "vendor", "interface", "last_seen", "stale")
+
+
+class JsonLinesWriter:
+    """Thread-safe writer of one JSON object per line"""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self._lock = threading.Lock()
+
+    def write(self, record_type, **fields):
+        record = {"type": record_type, "ts": round(time.time(), 3)}
+        record.update(fields)
+        line = json.dumps(record, separators=(",", ":"), default=str)
+        with self._lock:
+            self.stream.write(line + "\n")
+            self.stream.flush()
+
+
+def device_record(device):
+    return {field: getattr(device, field) for field in DEVICE_FIELDS}
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="netmaster-pro",
+        description="NetMaster Pro network device discovery. Run without a command to open the GUI."
+    )
+    subparsers = parser.add_subparsers(dest="command")
+    for name, help_text in (("scan", "run one discovery sweep and print the devices found"),
+                            ("daemon", "discover continuously and stream changes")):
+        command = subparsers.add_parser(name, help=help_text)
+        command.add_argument("-n", "--network", help="CIDR range to scan (default: detected)")
+        command.add_argument("-i", "--interface", action="append",
+                             help="interface to scan; repeat to scan several in parallel")
+        command.add_argument("-a", "--all-interfaces", action="store_true",
+                             help="scan every up interface in parallel, each no wider than a /24 around the host")
+        command.add_argument("-g", "--gateway", help="gateway address, probed first")
+        command.add_argument("-o", "--output", help="append JSON lines to this file instead of stdout")
+        command.add_argument("--inventory", help="SQLite inventory to warm start from and update")
+        command.add_argument("--concurrency", type=int, default=64, help="probes in flight")
+        command.add_argument("--deadline", type=float, default=30.0, help="seconds per sweep")
+    return parser
+
+
+def run_headless(args):
+    # Imported here so that starting the GUI does not pay for the scan stack
+    from netmaster_pro.core.discovery import DiscoveryService, MultiInterfaceDiscovery
+    from netmaster_pro.core.device import ip_to_int
+    from netmaster_pro.core.inventory import InventoryStore
+    from netmaster_pro.core.registry import STATUS_ACTIVE
+
+    output = open(args.output, "a", encoding="utf-8") if args.output else sys.stdout
+    writer = JsonLinesWriter(output)
+
+    def on_events(events):
+        for event in events:
+            device = service.devices.get(ip_to_int(event.ip))
+            writer.write(
+                "event", event=event.kind, ip=event.ip,
+                previous=event.previous, current=event.current,
+                device=device_record(device) if device is not None else None
+            )
+
+    def on_sweep(stats):
+        writer.write("sweep", devices=len(service.devices), **stats)
+
+    inventory = InventoryStore(args.inventory) if args.inventory else None
+    interfaces = args.interface or []
+    if args.all_interfaces or len(interfaces) > 1:
+        service = MultiInterfaceDiscovery(
+            interfaces=interfaces or None,
+            all_interfaces=args.all_interfaces,
+            inventory=inventory,
+            on_events=on_events,
+            on_sweep=on_sweep,
+            concurrency=args.concurrency,
+            deadline=args.deadline
+        )
+    else:
+        service = DiscoveryService(
+            network=args.network,
+            interface=interfaces[0] if interfaces else None,
+            gateway=args.gateway,
+            inventory=inventory,
+            on_events=on_events,
+            on_sweep=on_sweep,
+            concurrency=args.concurrency,
+            deadline=args.deadline
+        )
+    writer.write("start", command=args.command, network=str(service.network),
+                 interface=service.interface, gateway=service.gateway)
+
+    if args.command == "daemon":
+        # Service managers stop daemons with SIGTERM
+        signal.signal(signal.SIGTERM, lambda signum, frame: service.stop())
+    try:
+        if args.command == "scan":
+            service.run(max_sweeps=1)
+            # Let pending reverse lookups land so the records carry hostnames
+            service.wait_idle()
+            for device in service.devices.find(status=STATUS_ACTIVE):
+                writer.write("device", **device_record(device))
+        else:
+            service.start_neighbor_watch()
+            service.run()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.close()
+        if inventory is not None:
+            inventory.close()
+        if output is not sys.stdout:
+            output.close()
+    return 0
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.command is not None and (args.all_interfaces or len(args.interface or []) > 1):
+        # Each interface's range and gateway come from its own address
+        if args.network or args.gateway:
+            parser.error("-n/--network and -g/--gateway apply to a single interface; "
+                         "they cannot be combined with -a or several -i")
+    if args.command is None:
+        from netmaster_pro.ui.main_interface import run
+        return run()
+    return run_headless(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
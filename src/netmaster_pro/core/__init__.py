@@ -5,7 +5,19 @@ This package contains the core business logic for network management,
 device monitoring, and WiFi QR code generation.
 """
 
-from .network_manager import NetworkManager
-from .wifi_qr_generator import WiFiQRGenerator
+_LAZY_IMPORTS = {
+    "NetworkManager": ".network_manager",
+    "WiFiQRGenerator": ".wifi_qr_generator",
+}
+
+
+def __getattr__(name):
+    # The GUI modules pull in tkinter/PIL/qrcode, so load them on first use
+    if name in _LAZY_IMPORTS:
+        import importlib
+        module = importlib.import_module(_LAZY_IMPORTS[name], __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 __all__ = ["NetworkManager", "WiFiQRGenerator"] 
\ No newline at end of file
@@ -0,0 +1,208 @@
+"""
+Link-layer ARP sweep engine for NetMaster Pro.
+
+On the local segment an ARP who-has is the cheapest and most reliable way
+to find every device: hosts that drop ICMP still have to answer ARP, and the
+reply carries the MAC address, so liveness and MAC resolution happen in one
+pass. :class:`ArpProbeStage` plugs this into the scan engine, which sweeps
+the planned range through it. Requests and replies share a single
+``AF_PACKET`` socket, which needs CAP_NET_RAW; callers fall back to the
+ICMP/TCP stages without it.
+"""
+
+import asyncio
+import errno
+import select
+import socket
+import struct
+import threading
+import time
+
+from netmaster_pro.core.scan_engine import ProbeStage
+
+ETH_P_ARP = 0x0806
+ETH_P_IP = 0x0800
+ARP_REQUEST = 1
+ARP_REPLY = 2
+
+SIOCGIFADDR = 0x8915
+
+BROADCAST_MAC = b"\xff" * 6
+
+# Back-off before retrying a send into a full transmit queue
+POLL_INTERVAL = 0.02
+
+_ETH_HEADER = struct.Struct("!6s6sH")
+_ARP_PACKET = struct.Struct("!HHBBH6s4s6s4s")
+
+
+def mac_to_str(mac):
+    return ":".join(f"{b:02x}" for b in mac)
+
+
+def mac_to_bytes(mac):
+    return bytes(int(part, 16) for part in mac.replace("-", ":").split(":"))
+
+
+def build_arp_request(source_mac, source_ip, target_ip):
+    """Build a broadcast Ethernet frame carrying an ARP who-has for ``target_ip``"""
+    return _ETH_HEADER.pack(BROADCAST_MAC, source_mac, ETH_P_ARP) + _ARP_PACKET.pack(
+        1, ETH_P_IP, 6, 4, ARP_REQUEST,
+        source_mac, socket.inet_aton(source_ip),
+        b"\x00" * 6, socket.inet_aton(target_ip)
+    )
+
+
+def parse_arp_reply(frame, own_mac=None):
+    """Return ``(sender_ip, sender_mac)`` for an ARP reply frame, else ``None``"""
+    if len(frame) < _ETH_HEADER.size + _ARP_PACKET.size:
+        return None
+    _dst, _src, ethertype = _ETH_HEADER.unpack_from(frame)
+    if ethertype != ETH_P_ARP:
+        return None
+    (htype, ptype, hlen, plen, op,
+     sender_mac, sender_ip, target_mac, _target_ip) = _ARP_PACKET.unpack_from(frame, _ETH_HEADER.size)
+    if htype != 1 or ptype != ETH_P_IP or hlen != 6 or plen != 4 or op != ARP_REPLY:
+        return None
+    if own_mac is not None and target_mac != own_mac:
+        return None
+    return socket.inet_ntoa(sender_ip), mac_to_str(sender_mac)
+
+
+def interface_mac(interface):
+    """Read the hardware address of ``interface``"""
+    with open(f"/sys/class/net/{interface}/address") as f:
+        return mac_to_bytes(f.read().strip())
+
+
+def interface_ipv4(interface):
+    """Read the primary IPv4 address of ``interface``"""
+    import fcntl  # POSIX only; keep the module importable on Windows
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+        request = struct.pack("256s", interface.encode()[:15])
+        return socket.inet_ntoa(fcntl.ioctl(sock.fileno(), SIOCGIFADDR, request)[20:24])
+
+
+class ArpSocket:
+    """AF_PACKET socket bound to one interface for ARP requests and replies"""
+
+    def __init__(self, interface, source_ip=None):
+        if not hasattr(socket, "AF_PACKET"):
+            raise OSError("AF_PACKET sockets are only available on Linux")
+        self.interface = interface
+        self.mac = interface_mac(interface)
+        self.source_ip = source_ip or interface_ipv4(interface)
+        self.sock = socket.socket(socket.AF_PACKET, socket.SOCK_RAW, socket.htons(ETH_P_ARP))
+        try:
+            self.sock.bind((interface, ETH_P_ARP))
+            self.sock.setblocking(False)
+        except OSError:
+            self.sock.close()
+            raise
+
+    def send(self, target_ip):
+        """Send a who-has; returns ``False`` when the transmit queue is full"""
+        try:
+            self.sock.send(build_arp_request(self.mac, self.source_ip, target_ip))
+            return True
+        except (BlockingIOError, InterruptedError):
+            return False
+        except OSError as e:
+            if e.errno == errno.ENOBUFS:
+                return False
+            raise
+
+    def receive(self):
+        """Yield ``(ip, mac)`` for every ARP reply queued on the socket"""
+        while True:
+            try:
+                frame = self.sock.recv(2048)
+            except OSError:
+                # Nothing queued, or an error such as ENETDOWN that reading cleared
+                return
+            reply = parse_arp_reply(frame, self.mac)
+            if reply is not None:
+                yield reply
+
+    def close(self):
+        self.sock.close()
+
+
+class ArpProbeStage(ProbeStage):
+    """Scan engine stage that probes liveness with ARP over one socket.
+
+    ``on_reply(ip, mac)`` is called for every reply so the MAC learned by the
+    probe can be used directly, without a separate neighbor lookup. Requests
+    go out at no more than ``rate`` per second however many probes are in
+    flight, so a scan engine sweep over the planned range is an ARP sweep at
+    a controlled rate; a full transmit queue is retried until
+    the probe's ``timeout`` runs out. As with the ICMP stage, probing from a
+    second event loop while the first still runs in another thread raises
+    ``RuntimeError``.
+    """
+
+    def __init__(self, interface, timeout=1.0, on_reply=None, source_ip=None, rate=500):
+        self.timeout = timeout
+        self.on_reply = on_reply
+        self.interval = 1.0 / rate
+        self.arp = ArpSocket(interface, source_ip)
+        self._waiters = {}
+        self._loop = None
+        self._lock = threading.Lock()
+        self._next_send = 0.0
+
+    def _attach(self, loop):
+        with self._lock:
+            if self._loop is loop:
+                return
+            if self._loop is not None and self._loop.is_running():
+                raise RuntimeError("ARP probe stage is in use by an event loop in another thread")
+            if self._loop is not None and not self._loop.is_closed():
+                self._loop.remove_reader(self.arp.sock)
+            self._loop = loop
+            loop.add_reader(self.arp.sock, self._on_readable)
+
+    def _on_readable(self):
+        now = time.monotonic()
+        for ip, mac in self.arp.receive():
+            if self.on_reply is not None:
+                self.on_reply(ip, mac)
+            waiter = self._waiters.get(ip)
+            if waiter is not None and not waiter[1].done():
+                waiter[1].set_result(now - waiter[0])
+
+    async def _send(self, ip, deadline):
+        """Send a who-has in the next free rate slot; ``False`` if ``deadline`` passes first"""
+        while True:
+            now = time.monotonic()
+            slot = max(self._next_send, now)
+            self._next_send = slot + self.interval
+            if slot > now:
+                await asyncio.sleep(slot - now)
+            if self.arp.send(ip):
+                return True
+            if time.monotonic() >= deadline:
+                return False
+            # Transmit queue full: back off, then wait for a new slot
+            await asyncio.sleep(POLL_INTERVAL)
+
+    async def probe(self, ip):
+        loop = asyncio.get_running_loop()
+        self._attach(loop)
+        future = loop.create_future()
+        deadline = time.monotonic() + self.timeout
+        try:
+            if not await self._send(ip, deadline):
+                return None
+            self._waiters[ip] = (time.monotonic(), future)
+            return await asyncio.wait_for(future, max(0.0, deadline - time.monotonic()))
+        except (asyncio.TimeoutError, OSError):
+            return None
+        finally:
+            self._waiters.pop(ip, None)
+
+    def close(self):
+        if self._loop is not None and not self._loop.is_closed():
+            self._loop.remove_reader(self.arp.sock)
+        self._loop = None
+        self.arp.close()
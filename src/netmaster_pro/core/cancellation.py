@@ -0,0 +1,57 @@
+"""
+Cooperative cancellation for NetMaster Pro.
+
+One token is shared by everything working on behalf of a scan. Loops poll
+``cancelled``, sleeps use ``wait`` and asynchronous or blocking operations
+register a callback that interrupts them, so a stop takes effect at once
+instead of after the slowest in-flight probe has timed out.
+"""
+
+import sys
+import threading
+
+
+class CancellationToken:
+    """Thread-safe, one-shot cancellation signal"""
+
+    def __init__(self):
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._callbacks = []
+
+    @property
+    def cancelled(self):
+        return self._event.is_set()
+
+    def cancel(self):
+        """Cancel the token and run its callbacks once"""
+        with self._lock:
+            if self._event.is_set():
+                return
+            self._event.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as e:
+                print(f"Cancellation callback error: {e}", file=sys.stderr)
+
+    def wait(self, timeout=None):
+        """Sleep up to ``timeout`` seconds; returns ``True`` if cancelled"""
+        return self._event.wait(timeout)
+
+    def add_callback(self, callback):
+        """Call ``callback()`` on cancellation, immediately if already cancelled"""
+        with self._lock:
+            if not self._event.is_set():
+                self._callbacks.append(callback)
+                return callback
+        callback()
+        return callback
+
+    def remove_callback(self, callback):
+        with self._lock:
+            try:
+                self._callbacks.remove(callback)
+            except ValueError:
+                pass
@@ -0,0 +1,109 @@
+"""
+Compact device records for NetMaster Pro.
+
+A :class:`Device` stores raw values only: the IPv4 address and MAC as
+integers, counters as numbers and ``None`` for what is not known yet.
+Device collections are keyed by the integer address, which sorts
+numerically and makes range queries simple comparisons. Turning values into
+display text is left to the view layer through the ``format_*`` helpers.
+"""
+
+import socket
+import struct
+import sys
+
+_IPV4 = struct.Struct("!I")
+
+
+def ip_to_int(ip):
+    """``"192.168.1.10"`` -> ``3232235786``"""
+    return _IPV4.unpack(socket.inet_aton(ip))[0]
+
+
+def int_to_ip(value):
+    return socket.inet_ntoa(_IPV4.pack(value))
+
+
+def mac_to_int(mac):
+    """``"aa:bb:cc:dd:ee:ff"`` (or with dashes) -> 48-bit integer"""
+    return int(mac.replace(":", "").replace("-", ""), 16)
+
+
+def int_to_mac(value):
+    return ":".join(f"{byte:02x}" for byte in value.to_bytes(6, "big"))
+
+
+def _intern(value):
+    # Vendors and interface names repeat across thousands of devices
+    return sys.intern(value) if value is not None else None
+
+
+class Device:
+    """One discovered device.
+
+    ``hostname`` is ``None`` while the reverse lookup is pending and ``""``
+    when the address has no name. ``bandwidth`` is in bytes per second.
+    """
+
+    __slots__ = ("address", "mac_address", "hostname", "vendor", "interface",
+                 "last_seen", "stale", "bandwidth")
+
+    def __init__(self, ip, mac=None, hostname=None, vendor=None, interface=None,
+                 last_seen=0.0, stale=False, bandwidth=0):
+        self.address = ip if isinstance(ip, int) else ip_to_int(ip)
+        self.mac = mac
+        self.hostname = hostname
+        self.vendor = _intern(vendor)
+        self.interface = _intern(interface)
+        self.last_seen = last_seen
+        self.stale = stale
+        self.bandwidth = bandwidth
+
+    @property
+    def ip(self):
+        return int_to_ip(self.address)
+
+    @property
+    def mac(self):
+        return int_to_mac(self.mac_address) if self.mac_address is not None else None
+
+    @mac.setter
+    def mac(self, mac):
+        self.mac_address = mac if mac is None or isinstance(mac, int) else mac_to_int(mac)
+
+    def replace(self, **changes):
+        """Return a copy with ``changes`` applied (``mac`` may be given as text)"""
+        device = Device.__new__(Device)
+        for name in self.__slots__:
+            setattr(device, name, getattr(self, name))
+        for name, value in changes.items():
+            setattr(device, name, value)
+        return device
+
+    def __eq__(self, other):
+        if not isinstance(other, Device):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"Device({self.ip!r}, mac={self.mac!r}, hostname={self.hostname!r}, interface={self.interface!r})"
+
+
+def format_mac(device):
+    return device.mac or "Unknown"
+
+
+def format_hostname(device):
+    if device.hostname is None:
+        return "Resolving..."
+    return device.hostname or "Unknown"
+
+
+def format_vendor(device):
+    return device.vendor or "Unknown"
+
+
+def format_bandwidth(device):
+    return f"{device.bandwidth // 1024} KB/s"
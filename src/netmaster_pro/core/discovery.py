@@ -0,0 +1,793 @@
+"""
+Device discovery service for NetMaster Pro.
+
+This drives the whole scan pipeline (probing, enrichment, scheduling,
+diffing and persistence) without any GUI dependency, so the same code backs
+the Tk device manager and the headless ``netmaster-pro scan``/``daemon``
+commands. Consumers are notified through callbacks: ``on_events(events)``
+for device deltas, ``on_status(message)`` and ``on_sweep(stats)``.
+``MultiInterfaceDiscovery`` runs one service per attached interface.
+"""
+
+import functools
+import ipaddress
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from netmaster_pro.core.cancellation import CancellationToken
+from netmaster_pro.core.scan_engine import ScanEngine, ExecutorStage
+from netmaster_pro.core.tcp_probe import create_probe_stage_with_fallback
+from netmaster_pro.core.neighbors import NeighborTable, NeighborCacheStage, ALIVE_STATES
+from netmaster_pro.core.netlink_watcher import NeighborWatcher
+from netmaster_pro.core.scan_planner import ScanPlanner
+from netmaster_pro.core.probe_scheduler import ProbeScheduler
+from netmaster_pro.core.dns_resolver import ReverseResolver
+from netmaster_pro.core.oui_db import default_database
+from netmaster_pro.core.inventory import InventoryStore
+from netmaster_pro.core.interfaces import default_monitor
+from netmaster_pro.core.probe_backend import SystemBackend
+from netmaster_pro.core.device import Device, ip_to_int
+from netmaster_pro.core.registry import DeviceRegistry
+from netmaster_pro.core.scan_diff import (
+    ScanDiff, JOINED, LEFT, IP_CHANGED, MAC_CHANGED, HOSTNAME_RESOLVED
+)
+
+# Fields the per-interface services own in the merged registry; the rest
+# (bandwidth) are written there by its consumers and survive a merge
+DISCOVERED_FIELDS = ("mac_address", "hostname", "vendor", "interface", "last_seen", "stale")
+
+# Interfaces scanned without being named are swept no wider than this
+# prefix around the host's address, so a /16 on a VPN or docker bridge does
+# not turn into 65k probes nobody asked for
+AUTO_SWEEP_PREFIX = 24
+
+
+def auto_sweep_network(interface, max_prefix=AUTO_SWEEP_PREFIX):
+    """Return the part of ``interface``'s network to sweep when it was not named"""
+    if interface.network.prefixlen >= max_prefix:
+        return interface.network
+    return ipaddress.IPv4Network(f"{interface.ip}/{max_prefix}", strict=False)
+
+
+class DiscoveryService:
+    """Continuously discover the devices of one network.
+
+    ``network``, ``interface`` and ``gateway`` are detected from the host's
+    interfaces when not given, and followed when rtnetlink reports a link,
+    address or route change. ``inventory`` is an ``InventoryStore``; an in-memory one
+    is used when it is omitted, so nothing persists. ``backend`` supplies
+    probes, neighbor entries and hostnames (the host's network stack by
+    default); ``probe_stage`` replaces the liveness probe it would build.
+
+    ``devices`` is a :class:`DeviceRegistry` of :class:`Device` records
+    keyed by integer address; read it through ``devices.snapshot()``.
+    Every sweep runs under a ``CancellationToken``; ``stop`` cancels it,
+    which aborts in-flight probes instead of waiting for them.
+    """
+
+    def __init__(self, network=None, interface=None, gateway=None, inventory=None,
+                 on_events=None, on_status=None, on_sweep=None,
+                 concurrency=64, deadline=30.0, probe_stage=None, backend=None):
+        self.backend = backend if backend is not None else SystemBackend()
+        self.on_events = on_events
+        self.on_status = on_status
+        self.on_sweep = on_sweep
+        self.devices = DeviceRegistry()
+        self.token = None
+        self.scan_thread = None
+        self._closed = False
+        self._wakeup = threading.Event()
+        self._pending_interface = None
+        self.event_changes = {
+            JOINED: self.joined_changes,
+            LEFT: self.left_changes,
+            IP_CHANGED: self.ip_changed_changes,
+            MAC_CHANGED: self.mac_changed_changes,
+            HOSTNAME_RESOLVED: self.hostname_changes,
+        }
+
+        # Per-address probe scheduling; with event-driven discovery active,
+        # sweeps become rare reconciliation passes
+        self.probe_interval = 30.0
+        self.reconcile_interval = 300
+
+        # Get network info
+        self.requested_network = ipaddress.IPv4Network(network, strict=False) if network is not None else None
+        self.requested_interface = interface
+        self.requested_gateway = gateway
+        self.interface_monitor = default_monitor()
+        self.get_network_info()
+
+        # Warm start from the persistent inventory; the first sweep reconciles it
+        self.inventory = inventory if inventory is not None else InventoryStore(":memory:")
+        self.owns_inventory = inventory is None
+        self.set_network(self.network)
+
+        # Scan engine settings
+        self.scan_concurrency = concurrency
+        self.scan_deadline = deadline
+        self.neighbors = NeighborTable(reader=self.backend.read_neighbors)
+        self.resolver = ReverseResolver(max_workers=8, timeout=2.0, lookup=self.backend.lookup_hostname)
+        self.oui_db = default_database()
+        self._own_probe_stage = probe_stage is None
+        self.probe_stage = probe_stage if probe_stage is not None else self.build_probe_stage()
+        self.scan_engine = self.build_scan_engine()
+
+        # Ranges at least this large are fully swept by a pool of scanner
+        # processes every reconcile interval
+        self.shard_threshold = 4096
+        self.shard_workers = os.cpu_count() or 1
+        self._sharded_scanner = None
+        self.last_full_sweep = float('-inf')
+        self.neighbor_watcher = NeighborWatcher(self.on_neighbor_event)
+        self.event_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="netmaster-events")
+
+    def get_network_info(self):
+        """Pick the interface, network and gateway to scan from the cached interface list"""
+        selected = self.select_interface(self.interface_monitor.interfaces())
+        if selected is not None:
+            self.interface = selected.name
+            self.local_ip = selected.ip
+            self.gateway = selected.gateway
+            self.network = selected.network
+            self.link_network = selected.network
+        else:
+            self.interface = self.requested_interface
+            self.local_ip = None
+            self.gateway = None
+            self.link_network = None
+            if self.requested_network is None:
+                print("Error getting network info: no IPv4 interface is up", file=sys.stderr)
+                self.network = ipaddress.IPv4Network("192.168.1.0/24")
+        if self.requested_network is not None:
+            self.network = self.requested_network
+        if self.requested_gateway is not None:
+            self.gateway = self.requested_gateway
+
+    def select_interface(self, interfaces):
+        """Return the interface matching the requested network and name.
+
+        Without either, the interface carrying the default route is used.
+        """
+        for interface in interfaces:
+            if self.requested_interface is not None and interface.name != self.requested_interface:
+                continue
+            if self.requested_network is not None and not interface.network.overlaps(self.requested_network):
+                continue
+            return interface
+        return None
+
+    def set_network(self, network):
+        """Target ``network``: rebuild the planner and diff and warm start from the inventory"""
+        self.network = network
+        self.scan_planner = ScanPlanner(self.network, gateway=self.gateway)
+        self.scan_diff = ScanDiff(self.scan_planner)
+        self.probe_scheduler = ProbeScheduler(base_interval=self.probe_interval)
+
+        # Reset in place: the GUI holds a reference to the registry
+        self.devices.reset(self.inventory.load(self.network))
+        for device in self.devices.values():
+            ip = device.ip
+            if not device.stale and ip in self.scan_planner:
+                self.scan_diff.observe(ip, device.mac)
+                if device.hostname:
+                    self.scan_diff.resolved(ip, device.hostname)
+
+    def build_scan_engine(self):
+        return ScanEngine(
+            NeighborCacheStage(self.probe_stage, self.neighbors),
+            ExecutorStage(self.get_device_info),
+            concurrency=self.scan_concurrency,
+            deadline=self.scan_deadline
+        )
+
+    def on_interfaces_changed(self, interfaces):
+        """Queue a move to the new interface selection for the next sweep"""
+        selected = self.select_interface(interfaces)
+        if selected is None:
+            return
+        network = self.requested_network or selected.network
+        if (selected.name, selected.ip, network) != (self.interface, self.local_ip, self.network):
+            self._pending_interface = selected
+            self._wakeup.set()
+
+    def apply_pending_interface(self):
+        """Switch to an interface selection queued by ``on_interfaces_changed``"""
+        selected, self._pending_interface = self._pending_interface, None
+        if selected is None:
+            return
+        previous = (self.interface, self.local_ip, self.on_link())
+        self.interface = selected.name
+        self.local_ip = selected.ip
+        self.gateway = self.requested_gateway or selected.gateway
+        self.link_network = selected.network
+        network = self.requested_network or selected.network
+        if network != self.network:
+            self.inventory.flush()
+            self.set_network(network)
+        if self._own_probe_stage and (self.interface, self.local_ip, self.on_link()) != previous:
+            # An ARP stage is bound to the old interface and source address
+            self.scan_engine.close()
+            self.probe_stage = self.build_probe_stage()
+            self.scan_engine = self.build_scan_engine()
+            self._sharded_scanner = None
+        self.report_status(f"Network changed: scanning {self.network} on {self.interface}")
+
+    def build_probe_stage(self):
+        """Ask the backend for the cheapest liveness probe on this interface"""
+        return self.backend.create_probe_stage(
+            interface=self.interface, source_ip=self.local_ip, on_arp_reply=self.on_arp_reply,
+            on_link=self.on_link()
+        )
+
+    def on_link(self):
+        """Whether the whole network is directly attached to the interface"""
+        return self.link_network is not None and self.network.subnet_of(self.link_network)
+
+    @property
+    def sharded_scanner(self):
+        # Created on first use: multiprocessing is slow to import and most
+        # networks are too small to need it
+        if self._sharded_scanner is None:
+            from netmaster_pro.core.sharded_scan import ShardedScanner
+            self._sharded_scanner = ShardedScanner(
+                workers=self.shard_workers,
+                rate=None,
+                probe_factory=functools.partial(create_probe_stage_with_fallback, interface=self.interface)
+            )
+        return self._sharded_scanner
+
+    def on_arp_reply(self, ip, mac):
+        """Remember the MAC carried by an ARP reply"""
+        self.neighbors.learn(ip, mac, interface=self.interface)
+
+    @property
+    def running(self):
+        return self.token is not None and not self.token.cancelled
+
+    def start(self, max_sweeps=None):
+        """Run sweeps on a background thread until ``stop``"""
+        if not self.running:
+            self.token = CancellationToken()
+            self.scan_thread = threading.Thread(
+                target=self.run, kwargs={'max_sweeps': max_sweeps, 'token': self.token},
+                daemon=True, name="netmaster-scan"
+            )
+            self.scan_thread.start()
+
+    def stop(self):
+        """Stop sweeping; in-flight probes are cancelled, not awaited"""
+        if self.token is not None:
+            self.token.cancel()
+
+    def run(self, max_sweeps=None, token=None):
+        """Sweep repeatedly until ``token`` is cancelled, sleeping until the next address is due"""
+        token = self.token = token if token is not None else CancellationToken()
+        self._wakeup.clear()
+        token.add_callback(self._wakeup.set)
+        sweeps = 0
+        try:
+            while not token.cancelled:
+                stats = self.sweep(token)
+                sweeps += 1
+                if max_sweeps is not None and sweeps >= max_sweeps:
+                    break
+
+                # A sweep cut short by its deadline continues immediately;
+                # an interface change wakes the loop early
+                if not stats['timed_out']:
+                    self._wakeup.wait(max(1.0, self.probe_scheduler.time_until_due()))
+                    self._wakeup.clear()
+        except Exception as e:
+            self.report_status(f"Scan error: {str(e)}")
+        finally:
+            token.remove_callback(self._wakeup.set)
+            token.cancel()
+
+    def sweep(self, token=None):
+        """Run one sweep under ``token`` and return its stats"""
+        token = self.token = token if token is not None else CancellationToken()
+        self.apply_pending_interface()
+        self.report_status("Scanning network...")
+
+        # One neighbor table read per sweep replaces per-host arp calls
+        self.neighbors.refresh()
+        if self.sharding_enabled() and time.monotonic() - self.last_full_sweep >= self.reconcile_interval:
+            self.report_status(
+                f"Sweeping {self.network} with {self.sharded_scanner.workers} processes..."
+            )
+            self.scan_diff.begin_sweep(full=True)
+            stats = self.sharded_scanner.scan(self.scan_planner, on_result=self.on_sharded_result, token=token)
+            self.last_full_sweep = time.monotonic()
+            complete = not stats['cancelled'] and not stats['timed_out'] and not stats['errors']
+        else:
+            # Between full sharded sweeps only known addresses are re-probed
+            self.scan_diff.begin_sweep()
+            stats = self.scan_engine.run(
+                self.scan_targets(include_new=not self.sharding_enabled()),
+                on_result=self.on_device_found,
+                on_probe=self.on_probe_result,
+                token=token
+            )
+            complete = not stats['cancelled'] and not stats['timed_out']
+        # Hosts that were present, probed and silent have left
+        self.apply_device_events(self.scan_diff.end_sweep(complete))
+        self.inventory.flush()
+
+        if not token.cancelled:
+            self.report_status(
+                f"Scan complete. Found {len(self.devices)} devices "
+                f"in {stats['elapsed']:.1f}s."
+            )
+        if self.on_sweep is not None:
+            self.on_sweep(stats)
+        return stats
+
+    def report_status(self, message):
+        if self.on_status is not None:
+            self.on_status(message)
+
+    def sharding_enabled(self):
+        """Whether the network is large enough for multi-process sweeps"""
+        # Scanner processes build their own system probes
+        if not (self.backend.shardable and self._own_probe_stage):
+            return False
+        return self.scan_planner.size >= self.shard_threshold and self.shard_workers > 1
+
+    def scan_targets(self, include_new=True):
+        """Lazily yield the addresses to probe in this sweep.
+
+        Addresses with a liveness history come from the scheduler's due-queue;
+        addresses never probed before are streamed by the planner.
+        """
+        yield from self.probe_scheduler.iter_due()
+        if not include_new:
+            return
+
+        recent = [device.ip for device in sorted(self.devices.values(), key=lambda d: d.last_seen, reverse=True)]
+        yield from self.scan_planner.iter_targets(
+            recent=recent,
+            skip=lambda ip: ip in self.probe_scheduler
+        )
+
+    def on_probe_result(self, ip, rtt):
+        """Feed a probe outcome into the scheduler and the scan diff"""
+        self.probe_scheduler.record(ip, rtt is not None, rtt)
+        self.scan_diff.probed(ip)
+        if rtt is not None:
+            # A host that answered is alive even if enrichment fails or the
+            # sweep is stopped before it is merged
+            self.scan_diff.answered(ip)
+
+    def on_sharded_result(self, ip, rtt):
+        """Merge a live host reported by a scanner process"""
+        self.on_probe_result(ip, rtt)
+        self.on_device_found(ip, rtt, self.get_device_info(ip))
+
+    def on_device_found(self, ip, rtt, device_info):
+        """Record a live device reported by the scan engine"""
+        if device_info and self.running:
+            self.merge_device(device_info)
+
+    def merge_device(self, device_info):
+        """Merge a freshly enriched device and apply what changed"""
+        ip = device_info.ip
+        device = self.devices.get(device_info.address)
+        if device is None:
+            device = self.devices.put(device_info)
+        else:
+            device = self.devices.update(
+                device.address, last_seen=device_info.last_seen, interface=device_info.interface
+            )
+        self.inventory.stage(self.network, device)
+        events = self.scan_diff.observe(ip, device_info.mac)
+        # A lookup may have finished between enrichment and this merge
+        found, hostname = self.resolver.cached(ip)
+        if found:
+            events += self.hostname_events(ip, hostname)
+        self.apply_device_events(events)
+
+    def apply_device_events(self, events):
+        """Update the inventory from scan diff events and notify ``on_events``"""
+        if not events:
+            return
+        for event in events:
+            address = ip_to_int(event.ip)
+            device = self.devices.get(address)
+            changes = self.event_changes[event.kind](event, device)
+            if device is None:
+                continue
+            device = self.devices.update(address, **changes) or device
+            self.inventory.stage(self.network, device)
+        if self.on_events is not None:
+            self.on_events(events)
+
+    # One handler per event kind: each returns the changes for the device
+    # at the event's address (``device`` may be ``None``)
+
+    def joined_changes(self, event, device):
+        return {'stale': False}
+
+    def left_changes(self, event, device):
+        return {'stale': True}
+
+    def ip_changed_changes(self, event, device):
+        # The moved device keeps its hostname until the new one resolves
+        previous = self.devices.remove(ip_to_int(event.previous))
+        self.inventory.stage_removal(self.network, event.previous)
+        changes = {'stale': False}
+        if previous is not None and device is not None and not device.hostname:
+            changes['hostname'] = previous.hostname
+        return changes
+
+    def mac_changed_changes(self, event, device):
+        return {'mac': event.current, 'vendor': self.get_vendor_from_mac(event.current)}
+
+    def hostname_changes(self, event, device):
+        return {'hostname': event.current}
+
+    def start_neighbor_watch(self):
+        """Subscribe to kernel neighbor notifications when rtnetlink is available"""
+        try:
+            self.neighbor_watcher.start()
+        except OSError:
+            return False  # Periodic sweeps remain the discovery mechanism
+        self.probe_interval = self.probe_scheduler.base_interval = self.reconcile_interval
+        self.interface_monitor.add_listener(self.on_interfaces_changed)
+        self.interface_monitor.start()
+        return True
+
+    def on_neighbor_event(self, event):
+        """Add, update or mark stale the device behind a kernel neighbor change"""
+        self.neighbors.apply(event)
+        if event.ip not in self.scan_planner:
+            return
+
+        device = self.devices.get(ip_to_int(event.ip))
+        if event.action == "new" and event.state in ALIVE_STATES:
+            self.probe_scheduler.record(event.ip, True)
+            if device is None:
+                self.event_executor.submit(self.add_discovered_device, event.ip)
+                return
+            self.devices.update(device.address, last_seen=time.time())
+            self.apply_device_events(self.scan_diff.observe(event.ip, event.mac))
+        elif device is not None and (event.action == "del" or event.state in ("FAILED", "INCOMPLETE")):
+            self.apply_device_events(self.scan_diff.lost(event.ip))
+
+    def add_discovered_device(self, ip):
+        """Enrich and record a device learned from a neighbor event"""
+        if self._closed:
+            return
+        device_info = self.get_device_info(ip)
+        if device_info:
+            self.merge_device(device_info)
+
+    def refresh_device(self, ip):
+        """Re-enrich one device and store it; returns the new record"""
+        device_info = self.get_device_info(ip)
+        if device_info:
+            self.devices.put(device_info)
+            self.inventory.stage(self.network, device_info)
+        return device_info
+
+    def get_device_info(self, ip):
+        """Get detailed device information"""
+        try:
+            mac = self.get_mac_address(ip)
+            return Device(
+                ip,
+                mac=mac,
+                hostname=self.get_hostname(ip),
+                vendor=self.get_vendor_from_mac(mac) if mac else None,
+                interface=self.interface,
+                last_seen=time.time()
+            )
+        except Exception:
+            return None
+
+    def get_mac_address(self, ip):
+        """Get MAC address for an IP from the neighbor table snapshot"""
+        return self.neighbors.mac(ip)
+
+    def get_hostname(self, ip):
+        """Get hostname for an IP without blocking on DNS.
+
+        Cache misses start a background lookup and return ``None``; the
+        device is updated once the lookup completes. Addresses without a
+        name give ``""``.
+        """
+        found, hostname = self.resolver.cached(ip)
+        if found:
+            return hostname or ""
+        self.resolver.resolve(ip, self.on_hostname_resolved)
+        return None
+
+    def on_hostname_resolved(self, ip, hostname):
+        """Fill in a hostname once its reverse lookup completes"""
+        if ip_to_int(ip) in self.devices:
+            self.apply_device_events(self.hostname_events(ip, hostname))
+
+    def hostname_events(self, ip, hostname):
+        """Feed a lookup result to the scan diff and return its events"""
+        events = self.scan_diff.resolved(ip, hostname)
+        device = self.devices.get(ip_to_int(ip))
+        if not events and device is not None and device.hostname is None:
+            # A miss produces no event but still ends the pending lookup
+            device = self.devices.update(device.address, hostname=hostname or "")
+            if device is not None:
+                self.inventory.stage(self.network, device)
+        return events
+
+    def wait_idle(self, timeout=None):
+        """Wait for pending reverse lookups so records carry hostnames"""
+        return self.resolver.wait_idle(self.resolver.timeout if timeout is None else timeout)
+
+    def get_vendor_from_mac(self, mac):
+        """Get vendor from MAC address using the IEEE OUI index"""
+        return self.oui_db.vendor(mac, default=None)
+
+    def close(self, timeout=1.0):
+        """Stop everything, wait for the scan thread and persist what is pending"""
+        self._closed = True
+        self.stop()
+        self.neighbor_watcher.stop()
+        self.interface_monitor.remove_listener(self.on_interfaces_changed)
+        if not self.interface_monitor.listeners:
+            self.interface_monitor.stop()
+        self.event_executor.shutdown(wait=False)
+        self.resolver.close()
+        if self.scan_thread is not None:
+            self.scan_thread.join(timeout)
+        if self.scan_thread is None or not self.scan_thread.is_alive():
+            self.scan_engine.close()
+        self.inventory.flush()
+        if self.owns_inventory:
+            self.inventory.close()
+
+
+class MultiInterfaceDiscovery:
+    """Discover the devices attached to several interfaces at once.
+
+    One ``DiscoveryService`` runs per interface address, each with its own
+    scan thread, probe budget and interface-bound sockets, so a slow or lossy
+    segment never holds up the others. All of them share one inventory and
+    their devices are merged into the ``devices`` registry, tagged with the interface they
+    were found on. ``interfaces`` names the interfaces to scan, swept in
+    full. Without it only the default-route interface is scanned, or every
+    up IPv4 interface with ``all_interfaces``; those are swept no wider than
+    ``max_prefix`` around the host's address. More interfaces can be opted
+    into later with :meth:`attach`.
+    """
+
+    def __init__(self, interfaces=None, inventory=None, on_events=None, on_status=None, on_sweep=None,
+                 concurrency=64, deadline=30.0, probe_stage_factory=None, backend=None,
+                 all_interfaces=False, max_prefix=AUTO_SWEEP_PREFIX):
+        self.on_events = on_events
+        self.on_status = on_status
+        self.on_sweep = on_sweep
+        self.inventory = inventory if inventory is not None else InventoryStore(":memory:")
+        self.owns_inventory = inventory is None
+        self.devices = DeviceRegistry()
+        self.services = []
+        self.concurrency = concurrency
+        self.deadline = deadline
+        self.probe_stage_factory = probe_stage_factory
+        self.backend = backend
+        self.max_prefix = max_prefix
+        self.watching = False
+
+        if interfaces is not None:
+            names = set(interfaces)
+        elif all_interfaces:
+            names = set(self.available_interfaces())
+        else:
+            default = default_monitor().default()
+            names = {default.name} if default is not None else set()
+        for name in self.available_interfaces():
+            if name in names:
+                self.attach(name, full=interfaces is not None)
+        if not self.services:
+            # Nothing matched; scan whatever the host reports as its network
+            self.add_service(DiscoveryService(
+                inventory=self.inventory, on_status=self.report_status, on_sweep=self.on_sweep,
+                concurrency=concurrency, deadline=deadline, backend=backend
+            ))
+
+    def available_interfaces(self):
+        """Names of the up IPv4 interfaces, the default-route one first"""
+        return list(dict.fromkeys(interface.name for interface in default_monitor().interfaces()))
+
+    @property
+    def attached(self):
+        return list(dict.fromkeys(service.interface for service in self.services))
+
+    def attach(self, name, full=False):
+        """Start discovering on interface ``name``; returns the services added.
+
+        Each address of the interface gets a service. Unless ``full`` is set
+        its network is swept no wider than ``max_prefix``. Scanning starts
+        right away if the other interfaces are being scanned or watched.
+        """
+        if name in self.attached:
+            return []
+        running = self.running
+        added = []
+        for interface in default_monitor().interfaces():
+            if interface.name != name:
+                continue
+            network = interface.network if full else auto_sweep_network(interface, self.max_prefix)
+            service = DiscoveryService(
+                network=str(network),
+                interface=interface.name,
+                gateway=interface.gateway,
+                inventory=self.inventory,
+                on_status=functools.partial(self.on_service_status, interface.name),
+                on_sweep=functools.partial(self.on_service_sweep, interface.name),
+                concurrency=self.concurrency,
+                deadline=self.deadline,
+                probe_stage=self.probe_stage_factory(interface) if self.probe_stage_factory is not None else None,
+                backend=self.backend
+            )
+            self.add_service(service)
+            if running:
+                service.start()
+            if self.watching:
+                service.start_neighbor_watch()
+            added.append(service)
+        return added
+
+    def detach(self, name, timeout=1.0):
+        """Stop discovering on interface ``name`` and drop its devices"""
+        services = [service for service in self.services if service.interface == name]
+        for service in services:
+            self.services.remove(service)
+            service.close(timeout)
+        for device in self.devices.find(interface=name):
+            self.devices.remove(device.address)
+        return services
+
+    def add_service(self, service):
+        service.owns_inventory = False
+        service.on_events = functools.partial(self.on_service_events, service)
+        self.services.append(service)
+        self.sync_service(service)
+
+    @property
+    def primary(self):
+        """The service of the first (default-route) interface"""
+        return self.services[0]
+
+    @property
+    def network(self):
+        return self.primary.network
+
+    @property
+    def networks(self):
+        return [service.network for service in self.services]
+
+    @property
+    def interface(self):
+        return self.primary.interface
+
+    @property
+    def gateway(self):
+        return self.primary.gateway
+
+    @property
+    def local_ip(self):
+        return self.primary.local_ip
+
+    @property
+    def local_ips(self):
+        return {service.local_ip for service in self.services if service.local_ip}
+
+    @property
+    def running(self):
+        return any(service.running for service in self.services)
+
+    def service_for(self, ip):
+        """Return the service whose network contains ``ip``"""
+        for service in self.services:
+            if ip in service.scan_planner:
+                return service
+        return None
+
+    def start(self, max_sweeps=None):
+        """Sweep every interface on its own background thread"""
+        for service in self.services:
+            service.start(max_sweeps)
+
+    def stop(self):
+        for service in self.services:
+            service.stop()
+
+    def run(self, max_sweeps=None):
+        """Sweep every interface in parallel until stopped or ``max_sweeps`` is reached"""
+        self.start(max_sweeps)
+        try:
+            for service in self.services:
+                # Short joins keep the calling thread responsive to signals
+                while service.scan_thread.is_alive():
+                    service.scan_thread.join(0.2)
+        finally:
+            self.stop()
+
+    def wait_idle(self, timeout=None):
+        """Wait for every interface's pending reverse lookups"""
+        return all([service.wait_idle(timeout) for service in self.services])
+
+    def start_neighbor_watch(self):
+        self.watching = any([service.start_neighbor_watch() for service in self.services])
+        return self.watching
+
+    def refresh_device(self, ip):
+        service = self.service_for(ip)
+        device_info = service.refresh_device(ip) if service is not None else None
+        if device_info:
+            self.merge_device(device_info)
+        return device_info
+
+    def merged(self, device):
+        """Return ``device`` with the merged record's own fields kept, or ``None`` if nothing changed"""
+        current = self.devices.get(device.address)
+        if current is None:
+            return device
+        changes = {name: getattr(device, name) for name in DISCOVERED_FIELDS
+                   if getattr(device, name) != getattr(current, name)}
+        return current.replace(**changes) if changes else None
+
+    def merge_device(self, device):
+        """Copy the discovered fields of one service record into ``devices``"""
+        merged = self.merged(device)
+        if merged is not None:
+            self.devices.put(merged)
+
+    def sync_service(self, service):
+        """Copy every record of ``service`` into ``devices`` in one write"""
+        changed = {}
+        for address, device in service.devices.items():
+            merged = self.merged(device)
+            if merged is not None:
+                changed[address] = merged
+        if changed:
+            self.devices.merge(changed)
+
+    def on_service_events(self, service, events):
+        """Merge one interface's device changes into ``devices``"""
+        for event in events:
+            if event.kind == IP_CHANGED:
+                previous = self.devices.get(ip_to_int(event.previous))
+                if previous is not None and previous.interface == service.interface:
+                    self.devices.remove(previous.address)
+            device = service.devices.get(ip_to_int(event.ip))
+            if device is not None:
+                self.merge_device(device)
+        if self.on_events is not None:
+            self.on_events(events)
+
+    def on_service_status(self, name, message):
+        self.report_status(f"[{name}] {message}")
+
+    def on_service_sweep(self, name, stats):
+        # Sweeps refresh last_seen without producing diff events
+        for service in self.services:
+            if service.interface == name:
+                self.sync_service(service)
+        if self.on_sweep is not None:
+            self.on_sweep(dict(stats, interface=name))
+
+    def report_status(self, message):
+        if self.on_status is not None:
+            self.on_status(message)
+
+    def close(self, timeout=1.0):
+        """Close every interface's service, then the shared inventory if this opened it"""
+        self.stop()
+        for service in self.services:
+            service.close(timeout)
+        self.inventory.flush()
+        if self.owns_inventory:
+            self.inventory.close()
@@ -0,0 +1,163 @@
+"""
+Asynchronous reverse-DNS resolution for NetMaster Pro.
+
+PTR lookups run on a bounded worker pool so that a slow or unreachable DNS
+server never stalls probing. Every lookup has a deadline; when it passes,
+the caller is told the name is unknown and a late answer is still cached.
+Answers live in an LRU cache with a long TTL for hits and a shorter one for
+misses, so devices are listed immediately and named when the lookup lands.
+"""
+
+import socket
+import sys
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+
+class TTLCache:
+    """Thread-safe LRU cache whose entries expire after a per-entry TTL"""
+
+    def __init__(self, max_entries=4096):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, now=None):
+        """Return ``(found, value)`` for ``key``"""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False, None
+            value, expires = entry
+            if expires <= now:
+                del self._entries[key]
+                return False, None
+            self._entries.move_to_end(key)
+            return True, value
+
+    def put(self, key, value, ttl, now=None):
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            self._entries[key] = (value, now + ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def __len__(self):
+        return len(self._entries)
+
+
+def lookup_ptr(ip):
+    """Blocking PTR lookup; returns the hostname or ``None``"""
+    try:
+        return socket.gethostbyaddr(ip)[0]
+    except (OSError, UnicodeError):
+        return None
+
+
+class ReverseResolver:
+    """Bounded pool of reverse-DNS lookups with per-lookup deadlines"""
+
+    def __init__(self, max_workers=8, timeout=2.0, ttl=3600.0, negative_ttl=300.0,
+                 max_entries=4096, lookup=lookup_ptr):
+        self.timeout = timeout
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.lookup = lookup
+        self.cache = TTLCache(max_entries)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="netmaster-dns")
+        self._pending = {}  # ip -> [deadline, callbacks]
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        self._wakeup = threading.Event()
+        self._closed = False
+        self._watchdog = None
+
+    def cached(self, ip):
+        """Return ``(found, hostname)`` from the cache without resolving"""
+        return self.cache.get(ip)
+
+    def resolve(self, ip, callback=None):
+        """Return the cached hostname, or start a lookup and return ``None``.
+
+        ``callback(ip, hostname)`` is called from a worker thread once the
+        lookup finishes or times out; ``hostname`` is ``None`` for misses.
+        Concurrent requests for the same address share one lookup.
+        """
+        found, hostname = self.cache.get(ip)
+        if found:
+            return hostname
+
+        with self._lock:
+            if self._closed:
+                return None
+            pending = self._pending.get(ip)
+            if pending is not None:
+                if callback is not None:
+                    pending[1].append(callback)
+                return None
+            self._pending[ip] = [time.monotonic() + self.timeout, [callback] if callback else []]
+            self._ensure_watchdog()
+
+        self._executor.submit(self._run_lookup, ip)
+        return None
+
+    def _run_lookup(self, ip):
+        if self._closed:
+            return  # Queued before close(); don't start new lookups
+        hostname = self.lookup(ip)
+        if hostname:
+            # Cache late answers too, even if the caller already timed out
+            self.cache.put(ip, hostname, self.ttl)
+        else:
+            self.cache.put(ip, None, self.negative_ttl)
+        self._finish(ip, hostname)
+
+    def _finish(self, ip, hostname):
+        with self._lock:
+            pending = self._pending.pop(ip, None)
+            if not self._pending:
+                self._idle.notify_all()
+        if pending is None:
+            return
+        for callback in pending[1]:
+            try:
+                callback(ip, hostname)
+            except Exception as e:
+                print(f"Hostname callback error: {e}", file=sys.stderr)
+
+    def _ensure_watchdog(self):
+        if self._watchdog is None or not self._watchdog.is_alive():
+            self._watchdog = threading.Thread(target=self._expire_loop, daemon=True, name="netmaster-dns-timeout")
+            self._watchdog.start()
+
+    def _expire_loop(self):
+        # One thread enforces every lookup deadline instead of a timer per lookup
+        while not self._closed:
+            now = time.monotonic()
+            with self._lock:
+                if not self._pending:
+                    self._watchdog = None
+                    return
+                expired = [ip for ip, (deadline, _) in self._pending.items() if deadline <= now]
+                next_deadline = min(deadline for deadline, _ in self._pending.values())
+            for ip in expired:
+                self.cache.put(ip, None, self.negative_ttl)
+                self._finish(ip, None)
+            self._wakeup.wait(max(0.01, min(0.25, next_deadline - now)))
+
+    def wait_idle(self, timeout=None):
+        """Block until no lookup is pending; returns ``False`` on timeout"""
+        with self._idle:
+            return self._idle.wait_for(lambda: not self._pending, timeout)
+
+    def close(self):
+        with self._lock:
+            self._closed = True
+            self._pending.clear()
+            self._idle.notify_all()
+        self._wakeup.set()
+        self._executor.shutdown(wait=False)
@@ -0,0 +1,267 @@
+"""
+In-process ICMP echo prober for NetMaster Pro.
+
+Instead of forking a ``ping`` process per host, the prober owns a single
+ICMP socket, sends echo requests in bursts and matches the replies by
+identifier and sequence number. On Linux an unprivileged datagram socket
+(``SOCK_DGRAM``/``IPPROTO_ICMP``) is used when ``net.ipv4.ping_group_range``
+allows it; otherwise a raw socket is tried. When neither can be opened the
+subprocess ping stage remains the fallback backend.
+"""
+
+import asyncio
+import os
+import platform
+import select
+import socket
+import struct
+import threading
+import time
+
+from netmaster_pro.core.scan_engine import ProbeStage, SubprocessPingStage
+from netmaster_pro.core.interfaces import bind_to_device
+
+ICMP_ECHO_REPLY = 0
+ICMP_ECHO_REQUEST = 8
+
+_HEADER = struct.Struct("!BBHHH")
+
+# How often a probe retries a send into a full socket buffer
+SEND_RETRY_INTERVAL = 0.005
+
+
+def checksum(data):
+    """Compute the RFC 1071 internet checksum of ``data``"""
+    if len(data) % 2:
+        data += b"\x00"
+    total = sum(struct.unpack(f"!{len(data) // 2}H", data))
+    total = (total >> 16) + (total & 0xFFFF)
+    total += total >> 16
+    return ~total & 0xFFFF
+
+
+def build_echo_request(identifier, sequence, payload=b"netmaster"):
+    """Build an ICMP echo request packet"""
+    header = _HEADER.pack(ICMP_ECHO_REQUEST, 0, 0, identifier, sequence)
+    csum = checksum(header + payload)
+    return _HEADER.pack(ICMP_ECHO_REQUEST, 0, csum, identifier, sequence) + payload
+
+
+def parse_echo_reply(packet, has_ip_header=False):
+    """Return ``(identifier, sequence)`` for an echo reply, else ``None``.
+
+    Raw sockets deliver the IPv4 header in front of the ICMP message,
+    datagram sockets deliver the ICMP message only.
+    """
+    if has_ip_header:
+        if len(packet) < 20:
+            return None
+        packet = packet[(packet[0] & 0x0F) * 4:]
+    if len(packet) < _HEADER.size:
+        return None
+    icmp_type, code, _csum, identifier, sequence = _HEADER.unpack_from(packet)
+    if icmp_type != ICMP_ECHO_REPLY or code != 0:
+        return None
+    return identifier, sequence
+
+
+def ping_group_allows():
+    """Check whether ``net.ipv4.ping_group_range`` covers the current process"""
+    try:
+        with open("/proc/sys/net/ipv4/ping_group_range") as f:
+            low, high = (int(value) for value in f.read().split())
+    except (OSError, ValueError):
+        return False
+    groups = {os.getgid(), *os.getgroups()}
+    return any(low <= gid <= high for gid in groups)
+
+
+def open_icmp_socket(interface=None):
+    """Open an ICMP socket, returning ``(sock, is_raw)``.
+
+    With ``interface`` the socket is pinned to it where permitted. Raises
+    ``OSError`` when neither a datagram nor a raw socket is permitted.
+    """
+    if platform.system() == "Linux" and ping_group_allows():
+        try:
+            sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_ICMP)
+            bind_to_device(sock, interface)
+            # Binding assigns the echo identifier the kernel will use
+            sock.bind(("", 0))
+            return sock, False
+        except OSError:
+            pass
+    sock = socket.socket(socket.AF_INET, socket.SOCK_RAW, socket.IPPROTO_ICMP)
+    bind_to_device(sock, interface)
+    return sock, True
+
+
+class IcmpProber:
+    """Send ICMP echo requests over one socket and collect round-trip times"""
+
+    def __init__(self, timeout=1.0, interface=None):
+        self.timeout = timeout
+        self.sock, self.raw = open_icmp_socket(interface)
+        self.sock.setblocking(False)
+        if self.raw:
+            self.identifier = os.getpid() & 0xFFFF
+        else:
+            # Datagram sockets rewrite the identifier to the bound "port"
+            self.identifier = self.sock.getsockname()[1]
+        self._sequence = 0
+
+    def next_sequence(self):
+        self._sequence = (self._sequence + 1) & 0xFFFF
+        return self._sequence
+
+    def send_nowait(self, ip, sequence):
+        """Send one echo request; returns False if the kernel refused it.
+
+        Raises ``BlockingIOError`` when the socket buffer is full.
+        """
+        try:
+            self.sock.sendto(build_echo_request(self.identifier, sequence), (ip, 0))
+            return True
+        except BlockingIOError:
+            raise
+        except OSError:
+            return False
+
+    def send(self, ip, sequence):
+        """Send one echo request, blocking briefly for room in a full buffer"""
+        try:
+            return self.send_nowait(ip, sequence)
+        except BlockingIOError:
+            # Socket buffer full: wait briefly for room and retry once
+            select.select([], [self.sock], [], self.timeout)
+            try:
+                return self.send_nowait(ip, sequence)
+            except BlockingIOError:
+                return False
+
+    def receive(self):
+        """Yield ``(source_ip, sequence)`` for every reply queued on the socket"""
+        while True:
+            try:
+                packet, address = self.sock.recvfrom(2048)
+            except (BlockingIOError, InterruptedError):
+                return
+            except OSError:
+                return
+            reply = parse_echo_reply(packet, has_ip_header=self.raw)
+            if reply is None:
+                continue
+            identifier, sequence = reply
+            if self.raw and identifier != self.identifier:
+                continue
+            yield address[0], sequence
+
+    def ping_many(self, ips, timeout=None):
+        """Ping ``ips`` in one burst and return ``{ip: rtt_seconds}`` for replies"""
+        timeout = self.timeout if timeout is None else timeout
+        pending = {}
+        for ip in ips:
+            sequence = self.next_sequence()
+            if self.send(ip, sequence):
+                pending[sequence] = (ip, time.monotonic())
+
+        results = {}
+        deadline = time.monotonic() + timeout
+        while pending:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            readable, _, _ = select.select([self.sock], [], [], remaining)
+            if not readable:
+                break
+            now = time.monotonic()
+            for source, sequence in self.receive():
+                entry = pending.get(sequence)
+                if entry and entry[0] == source:
+                    del pending[sequence]
+                    results[source] = now - entry[1]
+        return results
+
+    def close(self):
+        self.sock.close()
+
+
+class IcmpProbeStage(ProbeStage):
+    """Scan engine stage that multiplexes all probes over one ICMP socket.
+
+    The socket is watched by one event loop at a time. Each sweep may run
+    on a fresh loop, but probing from a second loop while the first is
+    still running in another thread raises ``RuntimeError``: its reader can
+    only be moved by that loop's own thread.
+    """
+
+    def __init__(self, timeout=1.0, interface=None):
+        self.timeout = timeout
+        self.prober = IcmpProber(timeout, interface)
+        self._pending = {}
+        self._loop = None
+        self._lock = threading.Lock()
+
+    def _attach(self, loop):
+        with self._lock:
+            if self._loop is loop:
+                return
+            if self._loop is not None and self._loop.is_running():
+                raise RuntimeError("ICMP probe stage is in use by an event loop in another thread")
+            if self._loop is not None and not self._loop.is_closed():
+                self._loop.remove_reader(self.prober.sock)
+            self._loop = loop
+            loop.add_reader(self.prober.sock, self._on_readable)
+
+    def _on_readable(self):
+        now = time.monotonic()
+        for source, sequence in self.prober.receive():
+            entry = self._pending.get(sequence)
+            if entry is None:
+                continue
+            ip, sent_at, future = entry
+            if ip == source and not future.done():
+                future.set_result(now - sent_at)
+
+    async def _send(self, ip, sequence, deadline):
+        """Send without blocking the loop; a full buffer is retried until ``deadline``"""
+        while True:
+            try:
+                return self.prober.send_nowait(ip, sequence)
+            except BlockingIOError:
+                if time.monotonic() >= deadline:
+                    return False
+                await asyncio.sleep(SEND_RETRY_INTERVAL)
+
+    async def probe(self, ip):
+        loop = asyncio.get_running_loop()
+        self._attach(loop)
+        sequence = self.prober.next_sequence()
+        future = loop.create_future()
+        deadline = time.monotonic() + self.timeout
+        try:
+            if not await self._send(ip, sequence, deadline):
+                return None
+            # No await since the send: the reply cannot have been read yet
+            self._pending[sequence] = (ip, time.monotonic(), future)
+            return await asyncio.wait_for(future, max(0.0, deadline - time.monotonic()))
+        except asyncio.TimeoutError:
+            return None
+        finally:
+            self._pending.pop(sequence, None)
+
+    def close(self):
+        if self._loop is not None and not self._loop.is_closed():
+            self._loop.remove_reader(self.prober.sock)
+        self._loop = None
+        self.prober.close()
+
+
+def create_probe_stage(timeout=1.0, interface=None):
+    """Return the native ICMP stage when available, else the subprocess one"""
+    if platform.system() == "Linux":
+        try:
+            return IcmpProbeStage(timeout, interface)
+        except OSError:
+            pass
+    return SubprocessPingStage(timeout, interface)
@@ -0,0 +1,273 @@
+"""
+Native interface and route discovery for NetMaster Pro.
+
+Every up IPv4 interface is listed with its real prefix from
+``psutil.net_if_addrs()`` (or SIOCGIFADDR/SIOCGIFNETMASK when psutil is
+unavailable) and matched against the kernel routing table in
+``/proc/net/route``, so multi-homed machines scan the right subnets without
+shelling out to ``ip route``. :class:`InterfaceMonitor` caches the result and
+re-reads it only when an rtnetlink link, address or route change arrives.
+"""
+
+import ipaddress
+import socket
+import struct
+import sys
+import threading
+from collections import namedtuple
+
+from netmaster_pro.core.netlink_watcher import NeighborWatcher, _NLMSGHDR, _align, NLMSG_DONE, NLMSG_ERROR
+
+PROC_NET_ROUTE = "/proc/net/route"
+
+RTF_UP = 0x1
+RTF_GATEWAY = 0x2
+
+SO_BINDTODEVICE = getattr(socket, "SO_BINDTODEVICE", 25)
+
+SIOCGIFFLAGS = 0x8913
+SIOCGIFADDR = 0x8915
+SIOCGIFNETMASK = 0x891b
+IFF_UP = 0x1
+IFF_LOOPBACK = 0x8
+
+# Multicast groups for link, IPv4 address and IPv4 route changes
+RTMGRP_LINK = 0x1
+RTMGRP_IPV4_IFADDR = 0x10
+RTMGRP_IPV4_ROUTE = 0x40
+
+RTM_MESSAGES = {
+    16: "newlink", 17: "dellink",
+    20: "newaddr", 21: "deladdr",
+    24: "newroute", 25: "delroute",
+}
+
+Route = namedtuple("Route", ["interface", "destination", "gateway", "mask", "flags", "metric"])
+Interface = namedtuple("Interface", ["name", "ip", "network", "gateway", "default"])
+
+
+def _hex_to_ip(value):
+    # /proc/net/route prints addresses as host-order (little-endian) hex
+    return socket.inet_ntoa(struct.pack("<I", int(value, 16)))
+
+
+def parse_routes(text):
+    """Parse the contents of ``/proc/net/route`` into :class:`Route` tuples"""
+    routes = []
+    for line in text.splitlines()[1:]:
+        fields = line.split()
+        if len(fields) < 8:
+            continue
+        try:
+            routes.append(Route(
+                fields[0], _hex_to_ip(fields[1]), _hex_to_ip(fields[2]),
+                _hex_to_ip(fields[7]), int(fields[3], 16), int(fields[6])
+            ))
+        except ValueError:
+            continue
+    return routes
+
+
+def read_routes(path=PROC_NET_ROUTE):
+    """Read the IPv4 routing table; empty where ``/proc`` is unavailable"""
+    try:
+        with open(path) as f:
+            return parse_routes(f.read())
+    except OSError:
+        return []
+
+
+def bind_to_device(sock, interface):
+    """Pin ``sock`` to ``interface`` with SO_BINDTODEVICE; returns whether it took.
+
+    Linux only; kernels before 5.7 also require CAP_NET_RAW, without which
+    the socket stays unbound and follows the routing table.
+    """
+    if not interface or not sys.platform.startswith("linux"):
+        return False
+    try:
+        sock.setsockopt(socket.SOL_SOCKET, SO_BINDTODEVICE, interface.encode() + b"\0")
+        return True
+    except OSError:
+        return False
+
+
+def interface_name(ifindex):
+    """Name of the interface with kernel index ``ifindex``, or ``None`` if there is none"""
+    try:
+        return socket.if_indextoname(ifindex)
+    except (OSError, AttributeError):
+        return None  # Interface removed since the event, or no if_indextoname on this platform
+
+
+def _ioctl_addresses():
+    """``{name: [(ip, netmask)]}`` for up, non-loopback interfaces via ioctl"""
+    import fcntl  # POSIX only; keep the module importable on Windows
+    addresses = {}
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+        for _index, name in socket.if_nameindex():
+            request = struct.pack("256s", name.encode()[:15])
+            try:
+                flags = struct.unpack_from("H", fcntl.ioctl(sock.fileno(), SIOCGIFFLAGS, request), 16)[0]
+                if not flags & IFF_UP or flags & IFF_LOOPBACK:
+                    continue
+                ip = socket.inet_ntoa(fcntl.ioctl(sock.fileno(), SIOCGIFADDR, request)[20:24])
+                netmask = socket.inet_ntoa(fcntl.ioctl(sock.fileno(), SIOCGIFNETMASK, request)[20:24])
+            except OSError:
+                continue  # No IPv4 address configured
+            addresses[name] = [(ip, netmask)]
+    return addresses
+
+
+def interface_addresses():
+    """``{name: [(ip, netmask)]}`` for every up, non-loopback IPv4 interface"""
+    try:
+        import psutil
+    except ImportError:
+        try:
+            return _ioctl_addresses()
+        except (ImportError, OSError, AttributeError):
+            return {}
+
+    stats = psutil.net_if_stats()
+    addresses = {}
+    for name, entries in psutil.net_if_addrs().items():
+        if name in stats and not stats[name].isup:
+            continue
+        for entry in entries:
+            if entry.family == socket.AF_INET and entry.netmask and not entry.address.startswith("127."):
+                addresses.setdefault(name, []).append((entry.address, entry.netmask))
+    return addresses
+
+
+def list_interfaces(addresses=None, routes=None):
+    """Return the up IPv4 interfaces, the default-route one first.
+
+    ``addresses`` and ``routes`` default to the live system; passing them
+    allows recorded data to be used instead.
+    """
+    addresses = interface_addresses() if addresses is None else addresses
+    routes = read_routes() if routes is None else routes
+
+    # The lowest-metric default route on each interface supplies its gateway
+    gateways = {}
+    for route in sorted(routes, key=lambda r: r.metric):
+        if route.destination == "0.0.0.0" and route.flags & RTF_GATEWAY and route.flags & RTF_UP:
+            gateways.setdefault(route.interface, (route.metric, route.gateway))
+    default = min(gateways, key=lambda name: gateways[name][0]) if gateways else None
+
+    interfaces = []
+    for name, entries in addresses.items():
+        for ip, netmask in entries:
+            network = ipaddress.IPv4Network(f"{ip}/{netmask}", strict=False)
+            gateway = gateways.get(name, (None, None))[1]
+            if gateway is not None and ipaddress.IPv4Address(gateway) not in network:
+                gateway = None
+            interfaces.append(Interface(name, ip, network, gateway, name == default))
+    interfaces.sort(key=lambda i: (not i.default, i.name, int(i.network.network_address)))
+    return interfaces
+
+
+def parse_route_messages(data):
+    """Return the names of the link/address/route messages in a netlink datagram"""
+    kinds = []
+    offset = 0
+    while offset + _NLMSGHDR.size <= len(data):
+        length, msg_type, _flags, _seq, _pid = _NLMSGHDR.unpack_from(data, offset)
+        if length < _NLMSGHDR.size or offset + length > len(data):
+            break
+        if msg_type in RTM_MESSAGES:
+            kinds.append(RTM_MESSAGES[msg_type])
+        elif msg_type in (NLMSG_DONE, NLMSG_ERROR):
+            break
+        offset += _align(length)
+    # One refresh covers every change in the datagram
+    return kinds[:1]
+
+
+class InterfaceMonitor:
+    """Cached interface list that follows rtnetlink link/address/route changes.
+
+    Listeners are called as ``listener(interfaces)`` after a notification,
+    only when the list actually changed.
+    """
+
+    def __init__(self, on_change=None, lister=list_interfaces):
+        self.listeners = [on_change] if on_change is not None else []
+        self.lister = lister
+        self._interfaces = None
+        self._lock = threading.Lock()
+        self.watcher = NeighborWatcher(
+            self._on_notification,
+            groups=RTMGRP_LINK | RTMGRP_IPV4_IFADDR | RTMGRP_IPV4_ROUTE,
+            parser=parse_route_messages
+        )
+
+    def interfaces(self):
+        """Return the cached interface list, reading it on first use"""
+        with self._lock:
+            if self._interfaces is None:
+                self._interfaces = self.lister()
+            return self._interfaces
+
+    def default(self):
+        """The interface carrying the default route, else the first one"""
+        interfaces = self.interfaces()
+        return interfaces[0] if interfaces else None
+
+    def find(self, name=None, network=None):
+        """Return the interface called ``name`` or attached to ``network``"""
+        for interface in self.interfaces():
+            if name is not None and interface.name != name:
+                continue
+            if network is not None and not interface.network.overlaps(network):
+                continue
+            return interface
+        return None
+
+    def refresh(self):
+        """Re-read the interfaces; returns ``True`` if anything changed"""
+        interfaces = self.lister()
+        with self._lock:
+            changed = interfaces != self._interfaces
+            self._interfaces = interfaces
+        return changed
+
+    def add_listener(self, listener):
+        self.listeners.append(listener)
+
+    def remove_listener(self, listener):
+        if listener in self.listeners:
+            self.listeners.remove(listener)
+
+    def start(self):
+        """Watch for changes; returns ``False`` where rtnetlink is unavailable"""
+        try:
+            self.watcher.start()
+            return True
+        except OSError:
+            return False
+
+    def stop(self):
+        self.watcher.stop()
+
+    def _on_notification(self, _kind):
+        if not self.refresh():
+            return
+        interfaces = self.interfaces()
+        for listener in list(self.listeners):
+            try:
+                listener(interfaces)
+            except Exception as e:
+                print(f"Interface change handler error: {e}", file=sys.stderr)
+
+
+_default_monitor = None
+
+
+def default_monitor():
+    """Return the shared, lazily populated interface monitor"""
+    global _default_monitor
+    if _default_monitor is None:
+        _default_monitor = InterfaceMonitor()
+    return _default_monitor
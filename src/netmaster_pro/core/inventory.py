@@ -0,0 +1,123 @@
+"""
+Persistent device inventory for NetMaster Pro.
+
+Devices are kept in a WAL-mode SQLite database so the device list survives
+restarts and can be shown immediately while a reconciliation scan runs.
+Changes are staged in memory and written in one transaction per sweep
+instead of one write per device.
+"""
+
+import os
+import sqlite3
+import sys
+import threading
+
+from netmaster_pro.core.device import Device
+from netmaster_pro.utils.paths import data_dir
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS devices (
+    network   TEXT NOT NULL,
+    ip        TEXT NOT NULL,
+    mac       TEXT,
+    hostname  TEXT,
+    vendor    TEXT,
+    interface TEXT,
+    last_seen REAL NOT NULL,
+    stale     INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (network, ip)
+);
+CREATE INDEX IF NOT EXISTS devices_ip ON devices (ip);
+CREATE INDEX IF NOT EXISTS devices_mac ON devices (mac);
+CREATE INDEX IF NOT EXISTS devices_last_seen ON devices (last_seen);
+"""
+
+_COLUMNS = ("network", "ip", "mac", "hostname", "vendor", "interface", "last_seen", "stale")
+
+
+def default_path():
+    """Per-user location of the inventory database"""
+    return os.path.join(data_dir(), "inventory.db")
+
+
+class InventoryStore:
+    """SQLite-backed device inventory with batched writes"""
+
+    def __init__(self, path=None):
+        self.path = path or default_path()
+        if self.path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._lock = threading.Lock()
+        self._staged = {}     # (network, ip) -> device to write
+        self._removed = set()  # (network, ip) to delete
+
+    def load(self, network):
+        """Return ``{address: Device}`` for every stored device of ``network``"""
+        with self._lock:
+            if self._conn is None:
+                return {}
+            rows = self._conn.execute(
+                "SELECT ip, mac, hostname, vendor, interface, last_seen, stale FROM devices WHERE network = ?",
+                (str(network),)
+            ).fetchall()
+        devices = {}
+        for ip, mac, hostname, vendor, interface, last_seen, stale in rows:
+            device = Device(ip, mac=mac, hostname=hostname, vendor=vendor, interface=interface,
+                            last_seen=last_seen, stale=bool(stale))
+            devices[device.address] = device
+        return devices
+
+    def stage(self, network, device):
+        """Queue ``device`` to be written by the next ``flush``"""
+        key = (str(network), device.ip)
+        with self._lock:
+            self._removed.discard(key)
+            self._staged[key] = device
+
+    def stage_removal(self, network, ip):
+        """Queue ``ip`` to be deleted by the next ``flush``"""
+        key = (str(network), ip)
+        with self._lock:
+            self._staged.pop(key, None)
+            self._removed.add(key)
+
+    def flush(self):
+        """Write every staged change in one transaction; returns rows touched"""
+        with self._lock:
+            if self._conn is None or not (self._staged or self._removed):
+                return 0
+            rows = [
+                (network, ip, device.mac, device.hostname, device.vendor,
+                 device.interface, device.last_seen, int(device.stale))
+                for (network, ip), device in self._staged.items()
+            ]
+            removed = list(self._removed)
+            with self._conn:
+                self._conn.executemany(
+                    f"INSERT OR REPLACE INTO devices ({', '.join(_COLUMNS)}) "
+                    f"VALUES ({', '.join('?' * len(_COLUMNS))})",
+                    rows
+                )
+                self._conn.executemany("DELETE FROM devices WHERE network = ? AND ip = ?", removed)
+            self._staged.clear()
+            self._removed.clear()
+            return len(rows) + len(removed)
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+def open_default_store():
+    """Open the per-user inventory, or an in-memory one if that fails"""
+    try:
+        return InventoryStore()
+    except (OSError, sqlite3.Error) as e:
+        print(f"Inventory unavailable, devices will not persist: {e}", file=sys.stderr)
+        return InventoryStore(":memory:")
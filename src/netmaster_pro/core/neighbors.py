@@ -0,0 +1,188 @@
+"""
+Kernel neighbor (ARP) table snapshots for NetMaster Pro.
+
+Rather than running ``arp -n <ip>`` once per discovered host, the whole
+neighbor table is read in one go into an IP -> entry map. On Linux the
+``ip -j neigh`` output is preferred because it carries the kernel's NUD
+state (REACHABLE, STALE, ...); ``/proc/net/arp`` is used when iproute2 is
+not installed. Windows falls back to a single ``arp -a`` call.
+"""
+
+import json
+import platform
+import re
+import shutil
+import subprocess
+import threading
+import time
+from collections import namedtuple
+
+from netmaster_pro.core.interfaces import interface_name
+from netmaster_pro.core.scan_engine import ProbeStage
+
+NeighborEntry = namedtuple("NeighborEntry", ["ip", "mac", "state", "interface"])
+
+# States in which the kernel has recently confirmed the neighbor is alive
+ALIVE_STATES = frozenset({"REACHABLE", "PERMANENT"})
+
+# /proc/net/arp flag bits (include/uapi/linux/if_arp.h)
+ATF_COM = 0x02
+ATF_PERM = 0x04
+
+_WINDOWS_ARP_RE = re.compile(
+    r'^\s*(\d+\.\d+\.\d+\.\d+)\s+((?:[0-9a-fA-F]{2}-){5}[0-9a-fA-F]{2})\s+(\w+)',
+    re.MULTILINE
+)
+
+
+def normalize_mac(mac):
+    """Return ``mac`` as lowercase colon-separated hex"""
+    return mac.replace('-', ':').lower()
+
+
+def parse_proc_arp(text):
+    """Parse the contents of ``/proc/net/arp``.
+
+    The file carries no NUD state, so complete entries are reported as
+    ``STALE``: the MAC is known but liveness still has to be probed.
+    """
+    entries = {}
+    for line in text.splitlines()[1:]:
+        fields = line.split()
+        if len(fields) < 6:
+            continue
+        ip, _hw_type, flags, mac, _mask, interface = fields[:6]
+        flags = int(flags, 16)
+        if not flags & ATF_COM or mac == "00:00:00:00:00:00":
+            continue
+        state = "PERMANENT" if flags & ATF_PERM else "STALE"
+        entries[ip] = NeighborEntry(ip, normalize_mac(mac), state, interface)
+    return entries
+
+
+def parse_ip_neigh_json(text):
+    """Parse the output of ``ip -j -4 neigh show``"""
+    entries = {}
+    for item in json.loads(text or "[]"):
+        mac = item.get("lladdr")
+        if not mac:
+            continue
+        states = item.get("state") or ["NONE"]
+        ip = item["dst"]
+        entries[ip] = NeighborEntry(ip, normalize_mac(mac), states[0], item.get("dev"))
+    return entries
+
+
+def parse_arp_a(text):
+    """Parse Windows ``arp -a`` output"""
+    entries = {}
+    for ip, mac, kind in _WINDOWS_ARP_RE.findall(text):
+        state = "PERMANENT" if kind.lower() == "static" else "STALE"
+        entries[ip] = NeighborEntry(ip, normalize_mac(mac), state, None)
+    return entries
+
+
+def read_neighbor_table():
+    """Read the system neighbor table once and return ``{ip: NeighborEntry}``"""
+    if platform.system() == "Windows":
+        result = subprocess.run(['arp', '-a'], capture_output=True, text=True, timeout=5)
+        return parse_arp_a(result.stdout)
+
+    if shutil.which('ip'):
+        try:
+            result = subprocess.run(
+                ['ip', '-j', '-4', 'neigh', 'show'],
+                capture_output=True, text=True, timeout=5
+            )
+            if result.returncode == 0:
+                return parse_ip_neigh_json(result.stdout)
+        except (OSError, ValueError, subprocess.TimeoutExpired):
+            pass
+
+    try:
+        with open('/proc/net/arp') as f:
+            return parse_proc_arp(f.read())
+    except OSError:
+        return {}
+
+
+class NeighborTable:
+    """Cached snapshot of the kernel neighbor table.
+
+    ``refresh`` reads the table once. Lookups that miss re-read it at most
+    once every ``min_refresh_interval`` seconds, because the kernel learns
+    new neighbors while a sweep is probing them.
+    """
+
+    def __init__(self, reader=read_neighbor_table, min_refresh_interval=0.5):
+        self.reader = reader
+        self.min_refresh_interval = min_refresh_interval
+        self.entries = {}
+        self.updated = 0.0
+        self._lock = threading.Lock()
+
+    def refresh(self):
+        try:
+            entries = self.reader()
+        except Exception:
+            entries = {}
+        with self._lock:
+            self.entries = entries
+            self.updated = time.monotonic()
+        return entries
+
+    def apply(self, event):
+        """Update the snapshot from a netlink neighbor event"""
+        if event.action == "del" or event.mac is None:
+            with self._lock:
+                entries = dict(self.entries)
+                entries.pop(event.ip, None)
+                self.entries = entries
+        else:
+            self.learn(event.ip, event.mac, event.state, interface_name(event.ifindex))
+
+    def learn(self, ip, mac, state="REACHABLE", interface=None):
+        """Record a neighbor learned outside a table read (e.g. an ARP reply)"""
+        with self._lock:
+            entries = dict(self.entries)
+            entries[ip] = NeighborEntry(ip, mac, state, interface)
+            self.entries = entries
+
+    def get(self, ip, refresh_on_miss=True):
+        entry = self.entries.get(ip)
+        if entry is None and refresh_on_miss:
+            # Only one caller per interval re-reads the table
+            with self._lock:
+                now = time.monotonic()
+                due = now - self.updated >= self.min_refresh_interval
+                if due:
+                    self.updated = now
+            if due:
+                entry = self.refresh().get(ip)
+        return entry
+
+    def mac(self, ip):
+        """Return the MAC address for ``ip`` or ``None``"""
+        entry = self.get(ip)
+        return entry.mac if entry else None
+
+    def is_known_alive(self, ip):
+        """Whether the kernel has recently confirmed ``ip`` is reachable"""
+        entry = self.entries.get(ip)
+        return entry is not None and entry.state in ALIVE_STATES
+
+
+class NeighborCacheStage(ProbeStage):
+    """Probe stage that trusts REACHABLE neighbors and probes everything else"""
+
+    def __init__(self, inner, table):
+        self.inner = inner
+        self.table = table
+
+    async def probe(self, ip):
+        if self.table.is_known_alive(ip):
+            return 0.0
+        return await self.inner.probe(ip)
+
+    def close(self):
+        self.inner.close()
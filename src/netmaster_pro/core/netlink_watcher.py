@@ -0,0 +1,160 @@
+"""
+Event-driven neighbor discovery over rtnetlink for NetMaster Pro.
+
+The kernel multicasts an RTM_NEWNEIGH/RTM_DELNEIGH message on the
+RTNLGRP_NEIGH group whenever it learns, refreshes or forgets a neighbor.
+Subscribing to that group lets the device list follow LAN membership
+without continuous active sweeps. Parsing is kept separate from the socket
+so recorded messages can be fed through :meth:`NeighborWatcher.feed`.
+"""
+
+import select
+import socket
+import struct
+import sys
+import threading
+from collections import namedtuple
+
+NETLINK_ROUTE = 0
+
+RTM_NEWNEIGH = 28
+RTM_DELNEIGH = 29
+NLMSG_ERROR = 2
+NLMSG_DONE = 3
+
+# Multicast group bitmask for RTNLGRP_NEIGH (group 3)
+RTMGRP_NEIGH = 0x4
+
+NDA_DST = 1
+NDA_LLADDR = 2
+
+NUD_STATES = {
+    0x01: "INCOMPLETE",
+    0x02: "REACHABLE",
+    0x04: "STALE",
+    0x08: "DELAY",
+    0x10: "PROBE",
+    0x20: "FAILED",
+    0x40: "NOARP",
+    0x80: "PERMANENT",
+}
+
+_NLMSGHDR = struct.Struct("=IHHII")
+_NDMSG = struct.Struct("=BBHiHBB")
+_RTATTR = struct.Struct("=HH")
+
+NeighborEvent = namedtuple("NeighborEvent", ["action", "ip", "mac", "state", "ifindex"])
+
+
+def _align(length):
+    return (length + 3) & ~3
+
+
+def parse_rtattrs(data, offset, end):
+    """Return ``{attr_type: payload}`` for the rtattrs in ``data[offset:end]``"""
+    attrs = {}
+    while offset + _RTATTR.size <= end:
+        length, attr_type = _RTATTR.unpack_from(data, offset)
+        if length < _RTATTR.size:
+            break
+        attrs[attr_type] = data[offset + _RTATTR.size:offset + length]
+        offset += _align(length)
+    return attrs
+
+
+def parse_neighbor_messages(data):
+    """Parse a netlink datagram into a list of IPv4 :class:`NeighborEvent`"""
+    events = []
+    offset = 0
+    while offset + _NLMSGHDR.size <= len(data):
+        length, msg_type, _flags, _seq, _pid = _NLMSGHDR.unpack_from(data, offset)
+        if length < _NLMSGHDR.size or offset + length > len(data):
+            break
+        end = offset + length
+        body = offset + _NLMSGHDR.size
+
+        if msg_type in (RTM_NEWNEIGH, RTM_DELNEIGH) and body + _NDMSG.size <= end:
+            family, _pad1, _pad2, ifindex, state, _flags, _type = _NDMSG.unpack_from(data, body)
+            attrs = parse_rtattrs(data, body + _NDMSG.size, end)
+            dst = attrs.get(NDA_DST)
+            if family == socket.AF_INET and dst is not None and len(dst) == 4:
+                lladdr = attrs.get(NDA_LLADDR)
+                mac = ":".join(f"{b:02x}" for b in lladdr) if lladdr and len(lladdr) == 6 else None
+                events.append(NeighborEvent(
+                    "new" if msg_type == RTM_NEWNEIGH else "del",
+                    socket.inet_ntoa(dst),
+                    mac,
+                    NUD_STATES.get(state, "NONE"),
+                    ifindex
+                ))
+        elif msg_type in (NLMSG_DONE, NLMSG_ERROR):
+            break
+
+        offset += _align(length)
+    return events
+
+
+class NeighborWatcher:
+    """Background listener that reports kernel neighbor changes to ``callback``"""
+
+    def __init__(self, callback, groups=RTMGRP_NEIGH, parser=parse_neighbor_messages):
+        self.callback = callback
+        self.groups = groups
+        self.parser = parser
+        self.sock = None
+        self.thread = None
+        self._stop = threading.Event()
+        self._wakeup = None
+
+    @property
+    def running(self):
+        return self.thread is not None and self.thread.is_alive()
+
+    def start(self):
+        """Subscribe to rtnetlink notifications; raises ``OSError`` if unsupported"""
+        if self.running:
+            return
+        if not hasattr(socket, "AF_NETLINK"):
+            raise OSError("rtnetlink is only available on Linux")
+        self.sock = socket.socket(socket.AF_NETLINK, socket.SOCK_RAW, NETLINK_ROUTE)
+        self.sock.bind((0, self.groups))
+        # Written to by stop() so the listener leaves select() immediately
+        self._wakeup = socket.socketpair()
+        self._stop.clear()
+        self.thread = threading.Thread(target=self._run, daemon=True, name="netmaster-netlink")
+        self.thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._wakeup is not None:
+            try:
+                self._wakeup[1].send(b"\0")
+            except OSError:
+                pass
+        if self.thread is not None:
+            self.thread.join(timeout=1.0)
+            self.thread = None
+        if self.sock is not None:
+            self.sock.close()
+            self.sock = None
+        if self._wakeup is not None:
+            for sock in self._wakeup:
+                sock.close()
+            self._wakeup = None
+
+    def feed(self, data):
+        """Dispatch the events contained in one netlink datagram"""
+        for event in self.parser(data):
+            try:
+                self.callback(event)
+            except Exception as e:
+                print(f"Neighbor event handler error: {e}", file=sys.stderr)
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                readable, _, _ = select.select([self.sock, self._wakeup[0]], [], [])
+                if self.sock in readable and not self._stop.is_set():
+                    self.feed(self.sock.recv(65536))
+            except OSError:
+                break
@@ -2,73 +2,62 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 import threading
 import subprocess
-import socket
-import struct
 import time
-import ipaddress
 import platform
-import re
 from datetime import datetime
-import psutil
+
+from netmaster_pro.core.discovery import MultiInterfaceDiscovery
+from netmaster_pro.core.device import ip_to_int, int_to_ip, format_mac, format_hostname, format_vendor, format_bandwidth
+from netmaster_pro.core.inventory import open_default_store
+from netmaster_pro.core.registry import STATUS_ACTIVE, STATUS_STALE, device_status
+from netmaster_pro.core.virtual_list import VirtualList
+from netmaster_pro.core.ui_dispatch import UiDispatcher
 
 
 class NetworkDeviceManager:
     def __init__(self, parent, return_callback):
         self.parent = parent
         self.return_callback = return_callback
-        self.devices = {}
         self.blocked_devices = set()
         self.scanning = False
         self.monitoring = False
-        self.scan_thread = None
         self.monitor_thread = None
-        
-        # Get network info
-        self.get_network_info()
+        self.shown_version = None
+        self.redraw_requested = False
+        
+        # Scan, event and monitor threads only post here; the main loop
+        # applies the updates at most once per frame
+        self.dispatcher = UiDispatcher(parent)
+        self.dispatcher.start()
+        
+        # Discovery runs headless, one scanner per attached interface; this
+        # screen only renders the merged results. Only the default-route
+        # interface is scanned until others are ticked in the Interfaces menu
+        self.discovery = MultiInterfaceDiscovery(
+            inventory=open_default_store(),
+            on_events=self.on_device_events,
+            on_status=self.update_status
+        )
+        self.devices = self.discovery.devices
+        self.network = self.discovery.network
+        self.gateway = self.discovery.gateway
+        self.local_ip = self.discovery.local_ip
+        self.local_ips = self.discovery.local_ips
         
         # Create interface
         self.create_interface()
+        if self.devices:
+            self.update_device_list()
+        
+        # Follow kernel neighbor changes
+        self.discovery.start_neighbor_watch()
         
         # Start initial scan
         self.start_scan()
     
-    def get_network_info(self):
-        """Get current network information"""
-        try:
-            # Get default gateway and network
-            if platform.system() == "Windows":
-                result = subprocess.run(['ipconfig'], capture_output=True, text=True)
-                output = result.stdout
-                
-                # Extract gateway
-                gateway_match = re.search(r'Default Gateway.*?(\d+\.\d+\.\d+\.\d+)', output)
-                if gateway_match:
-                    self.gateway = gateway_match.group(1)
-                else:
-                    self.gateway = "192.168.1.1"  # Default fallback
-                
-                # Extract local IP
-                ip_match = re.search(r'IPv4 Address.*?(\d+\.\d+\.\d+\.\d+)', output)
-                if ip_match:
-                    self.local_ip = ip_match.group(1)
-                else:
-                    self.local_ip = socket.gethostbyname(socket.gethostname())
-            else:
-                # Linux/Mac
-                self.local_ip = socket.gethostbyname(socket.gethostname())
-                result = subprocess.run(['ip', 'route', 'show', 'default'], capture_output=True, text=True)
-                gateway_match = re.search(r'default via (\d+\.\d+\.\d+\.\d+)', result.stdout)
-                self.gateway = gateway_match.group(1) if gateway_match else "192.168.1.1"
-            
-            # Calculate network range
-            network = ipaddress.IPv4Network(f"{self.local_ip}/24", strict=False)
-            self.network_range = str(network.network_address)[:-1]  # Remove last octet
-            
-        except Exception as e:
-            print(f"Error getting network info: {e}")
-            self.gateway = "192.168.1.1"
-            self.local_ip = "192.168.1.100"
-            self.network_range = "192.168.1."
+    def on_device_events(self, events):
+        """Refresh the view when discovery reports a change"""
+        self.update_device_list()
     
     def create_interface(self):
         """Create the network manager interface"""
@@ -127,14 +116,18 @@ class NetworkDeviceManager:
         info_frame = tk.Frame(header_frame, bg="#1a1a1a")
         info_frame.pack(side=tk.RIGHT)
         
-        network_info = tk.Label(
+        self.network_info = tk.Label(
             info_frame,
-            text=f"Gateway: {self.gateway} | Your IP: {self.local_ip}",
+            text=self.network_summary(),
             font=("Segoe UI", 10),
             fg="#888888",
             bg="#1a1a1a"
         )
-        network_info.pack()
+        self.network_info.pack()
+    
+    def network_summary(self):
+        return (f"Gateway: {self.gateway} | Your IP: {self.local_ip} | "
+                f"Network: {', '.join(str(network) for network in self.discovery.networks)}")
     
     def create_control_panel(self, parent):
         """Create control panel with scan and monitor buttons"""
@@ -176,6 +169,25 @@ class NetworkDeviceManager:
         )
         self.monitor_btn.pack(side=tk.LEFT, padx=(0, 10))
         
+        # Extra interfaces are opt-in
+        interfaces_btn = tk.Menubutton(
+            inner_frame,
+            text="🔌 Interfaces",
+            font=("Segoe UI", 12),
+            fg="#ffffff",
+            bg="#6c757d",
+            activebackground="#5a6268",
+            activeforeground="#ffffff",
+            relief=tk.FLAT,
+            padx=20,
+            pady=8
+        )
+        self.interface_menu = tk.Menu(interfaces_btn, tearoff=0, bg="#2d2d2d", fg="#ffffff",
+                                      postcommand=self.fill_interface_menu)
+        interfaces_btn.configure(menu=self.interface_menu)
+        interfaces_btn.pack(side=tk.LEFT, padx=(0, 10))
+        self.interface_vars = {}
+        
         # Status label
         self.status_label = tk.Label(
             inner_frame,
@@ -195,6 +207,63 @@ class NetworkDeviceManager:
             bg="#262626"
         )
         self.device_count_label.pack(side=tk.RIGHT)
+        
+        # Filter by status or interface, answered from the registry indexes
+        self.filter_var = tk.StringVar(value="All")
+        self.filter_box = ttk.Combobox(
+            inner_frame,
+            textvariable=self.filter_var,
+            values=self.filter_choices(),
+            state="readonly",
+            width=14,
+            postcommand=lambda: self.filter_box.configure(values=self.filter_choices())
+        )
+        self.filter_box.pack(side=tk.RIGHT, padx=(0, 15))
+        self.filter_box.bind("<<ComboboxSelected>>", lambda e: self.update_device_list(force=True))
+        tk.Label(inner_frame, text="Show:", font=("Segoe UI", 11), fg="#888888", bg="#262626").pack(side=tk.RIGHT)
+    
+    def fill_interface_menu(self):
+        """List every up interface, ticking the ones being scanned"""
+        self.interface_menu.delete(0, tk.END)
+        attached = self.discovery.attached
+        for name in self.discovery.available_interfaces():
+            var = self.interface_vars.setdefault(name, tk.BooleanVar())
+            var.set(name in attached)
+            self.interface_menu.add_checkbutton(label=name, variable=var,
+                                                command=lambda name=name: self.toggle_interface(name))
+    
+    def toggle_interface(self, name):
+        """Attach or detach the scanner of interface ``name``"""
+        if self.interface_vars[name].get():
+            self.discovery.attach(name)
+            self.update_status(f"Scanning {name} as well")
+        elif self.discovery.attached == [name]:
+            self.interface_vars[name].set(True)
+            messagebox.showinfo("Interfaces", "At least one interface must be scanned.")
+            return
+        else:
+            self.discovery.detach(name)
+            self.update_status(f"Stopped scanning {name}")
+        self.local_ips = self.discovery.local_ips
+        self.network_info.configure(text=self.network_summary())
+        self.update_device_list()
+    
+    def filter_choices(self):
+        """Return the device list filters: every status, then every interface"""
+        return ["All", STATUS_ACTIVE, STATUS_STALE, "Blocked"] + self.devices.values_of('interface')
+    
+    def visible_devices(self):
+        """Return the devices matching the selected filter"""
+        choice = self.filter_var.get()
+        if choice == "Blocked":
+            devices = (self.devices.get(ip_to_int(ip)) for ip in sorted(self.blocked_devices, key=ip_to_int))
+            return [device for device in devices if device is not None]
+        if choice in (STATUS_ACTIVE, STATUS_STALE):
+            return [d for d in self.devices.find(status=choice) if d.ip not in self.blocked_devices]
+        if choice != "All":
+            return self.devices.find(interface=choice)
+        devices = self.devices.snapshot().devices
+        return [devices[address] for address in sorted(devices)]
     
     def create_device_list(self, parent):
         """Create device list with treeview"""
@@ -209,7 +278,8 @@ class NetworkDeviceManager:
                        foreground="#ffffff",
                        fieldbackground="#2d2d2d",
                        borderwidth=0,
-                       font=("Segoe UI", 10))
+                       font=("Segoe UI", 10),
+                       rowheight=22)
         style.configure("Custom.Treeview.Heading",
                        background="#404040",
                        foreground="#ffffff",
@@ -217,7 +287,7 @@ class NetworkDeviceManager:
                        font=("Segoe UI", 11, "bold"))
         
         # Create treeview
-        columns = ("IP", "MAC", "Hostname", "Vendor", "Status", "Bandwidth")
+        columns = ("IP", "MAC", "Hostname", "Vendor", "Interface", "Status", "Bandwidth")
         self.tree = ttk.Treeview(list_frame, columns=columns, show="headings", style="Custom.Treeview")
         
         # Configure columns
@@ -225,6 +295,7 @@ class NetworkDeviceManager:
         self.tree.heading("MAC", text="MAC Address")
         self.tree.heading("Hostname", text="Hostname")
         self.tree.heading("Vendor", text="Vendor")
+        self.tree.heading("Interface", text="Interface")
         self.tree.heading("Status", text="Status")
         self.tree.heading("Bandwidth", text="Bandwidth Usage")
         
@@ -232,12 +303,15 @@ class NetworkDeviceManager:
         self.tree.column("MAC", width=140, minwidth=120)
         self.tree.column("Hostname", width=150, minwidth=120)
         self.tree.column("Vendor", width=120, minwidth=100)
+        self.tree.column("Interface", width=90, minwidth=70)
         self.tree.column("Status", width=80, minwidth=70)
         self.tree.column("Bandwidth", width=120, minwidth=100)
         
-        # Scrollbar
-        scrollbar = ttk.Scrollbar(list_frame, orient=tk.VERTICAL, command=self.tree.yview)
-        self.tree.configure(yscrollcommand=scrollbar.set)
+        # Only the rows in view exist in the Treeview; the scrollbar spans
+        # the whole device list
+        scrollbar = ttk.Scrollbar(list_frame, orient=tk.VERTICAL)
+        self.device_list = VirtualList(self.tree, scrollbar, row_height=22)
+        scrollbar.configure(command=self.device_list.yview)
         
         # Pack treeview and scrollbar
         self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
@@ -327,152 +401,70 @@ class NetworkDeviceManager:
             self.scan_btn.configure(text="⏹ Stop Scan", bg="#dc3545", activebackground="#c82333")
             self.status_label.configure(text="Scanning network...", fg="#28a745")
             
-            self.scan_thread = threading.Thread(target=self.scan_network, daemon=True)
-            self.scan_thread.start()
+            self.discovery.start()
     
     def stop_scan(self):
         """Stop network scanning"""
         self.scanning = False
+        self.discovery.stop()
         self.scan_btn.configure(text="🔍 Scan Network", bg="#28a745", activebackground="#218838")
         self.status_label.configure(text="Scan stopped", fg="#888888")
     
-    def scan_network(self):
-        """Scan network for devices"""
-        try:
-            while self.scanning:
-                self.update_status("Scanning network...")
-                
-                # Ping sweep
-                for i in range(1, 255):
-                    if not self.scanning:
-                        break
-                    
-                    ip = f"{self.network_range}{i}"
-                    
-                    # Skip if already processed recently
-                    if ip in self.devices and (time.time() - self.devices[ip].get('last_seen', 0)) < 30:
-                        continue
-                    
-                    # Ping device
-                    if self.ping_device(ip):
-                        device_info = self.get_device_info(ip)
-                        if device_info:
-                            self.devices[ip] = device_info
-                            self.update_device_list()
-                    
-                    time.sleep(0.1)  # Small delay to prevent overwhelming the network
-                
-                if self.scanning:
-                    self.update_status(f"Scan complete. Found {len(self.devices)} devices.")
-                    time.sleep(5)  # Wait before next scan cycle
-                
-        except Exception as e:
-            self.update_status(f"Scan error: {str(e)}")
-    
-    def ping_device(self, ip):
-        """Ping a device to check if it's alive"""
-        try:
-            if platform.system() == "Windows":
-                result = subprocess.run(['ping', '-n', '1', '-w', '1000', ip], 
-                                      capture_output=True, text=True)
-            else:
-                result = subprocess.run(['ping', '-c', '1', '-W', '1', ip], 
-                                      capture_output=True, text=True)
-            return result.returncode == 0
-        except:
-            return False
-    
-    def get_device_info(self, ip):
-        """Get detailed device information"""
-        try:
-            device_info = {
-                'ip': ip,
-                'mac': self.get_mac_address(ip),
-                'hostname': self.get_hostname(ip),
-                'vendor': 'Unknown',
-                'status': 'Blocked' if ip in self.blocked_devices else 'Active',
-                'bandwidth': '0 KB/s',
-                'last_seen': time.time()
-            }
-            
-            # Get vendor from MAC address (simplified)
-            if device_info['mac']:
-                device_info['vendor'] = self.get_vendor_from_mac(device_info['mac'])
-            
-            return device_info
-        except:
-            return None
+    def update_device_list(self, force=False):
+        """Update the device list display.
+
+        Safe from any thread: requests within one dispatcher frame collapse
+        into a single render of the latest registry snapshot. Nothing is
+        redrawn when the registry has not changed since the last render,
+        unless ``force`` is set (block state lives outside the registry).
+        """
+        if force:
+            self.redraw_requested = True
+        self.dispatcher.post(self.render_device_list, key="device_list")
+    
+    def render_device_list(self):
+        """Bring the device list up to date; runs on the main thread.
+
+        Only the rows in view are formatted and materialized; they keep their
+        item ids, so the selection and scroll position survive.
+        """
+        snapshot = self.devices.snapshot()
+        if snapshot.version == self.shown_version and not self.redraw_requested:
+            return
+        self.shown_version = snapshot.version
+        self.redraw_requested = False
+        
+        self.device_list.set_rows(self.visible_devices(), self.device_item)
+        
+        # Update device count
+        self.device_count_label.configure(text=f"Devices: {len(snapshot.devices)}")
+    
+    def device_item(self, device):
+        """Return the Treeview ``(iid, values)`` of a device"""
+        return str(device.address), self.device_row(device)
+    
+    def device_row(self, device):
+        """Format a device record for the device list"""
+        return (
+            device.ip,
+            format_mac(device),
+            format_hostname(device),
+            format_vendor(device),
+            device.interface or "",
+            self.device_status(device),
+            format_bandwidth(device)
+        )
     
-    def get_mac_address(self, ip):
-        """Get MAC address for an IP"""
-        try:
-            if platform.system() == "Windows":
-                result = subprocess.run(['arp', '-a', ip], capture_output=True, text=True)
-                if result.returncode == 0:
-                    mac_match = re.search(r'([0-9a-fA-F]{2}[:-]){5}[0-9a-fA-F]{2}', result.stdout)
-                    return mac_match.group(0) if mac_match else "Unknown"
-            else:
-                result = subprocess.run(['arp', '-n', ip], capture_output=True, text=True)
-                if result.returncode == 0:
-                    mac_match = re.search(r'([0-9a-fA-F]{2}[:-]){5}[0-9a-fA-F]{2}', result.stdout)
-                    return mac_match.group(0) if mac_match else "Unknown"
-        except:
-            pass
-        return "Unknown"
-    
-    def get_hostname(self, ip):
-        """Get hostname for an IP"""
-        try:
-            hostname = socket.gethostbyaddr(ip)[0]
-            return hostname
-        except:
-            return "Unknown"
-    
-    def get_vendor_from_mac(self, mac):
-        """Get vendor from MAC address (simplified OUI lookup)"""
-        # This is a simplified version. In a real implementation, 
-        # you would use an OUI database
-        oui = mac[:8].upper().replace(':', '').replace('-', '')
-        
-        vendor_map = {
-            '001122': 'Apple',
-            'AABBCC': 'Samsung',
-            '000000': 'Unknown'
-        }
-        
-        return vendor_map.get(oui[:6], 'Unknown')
-    
-    def update_device_list(self):
-        """Update the device list display"""
-        def update_ui():
-            # Clear existing items
-            for item in self.tree.get_children():
-                self.tree.delete(item)
-            
-            # Add devices
-            for ip, device in self.devices.items():
-                status = "Blocked" if ip in self.blocked_devices else "Active"
-                self.tree.insert("", "end", values=(
-                    device['ip'],
-                    device['mac'],
-                    device['hostname'],
-                    device['vendor'],
-                    status,
-                    device['bandwidth']
-                ))
-            
-            # Update device count
-            self.device_count_label.configure(text=f"Devices: {len(self.devices)}")
-        
-        # Schedule UI update on main thread
-        self.parent.after(0, update_ui)
+    def device_status(self, device):
+        """Return the display status for a device"""
+        if device.ip in self.blocked_devices:
+            return "Blocked"
+        return device_status(device)
     
     def update_status(self, message):
         """Update status label"""
-        def update_ui():
-            self.status_label.configure(text=message)
-        
-        self.parent.after(0, update_ui)
+        # Only the latest message of a frame is shown
+        self.dispatcher.post(lambda: self.status_label.configure(text=message), key="status")
     
     def toggle_monitoring(self):
         """Toggle bandwidth monitoring"""
@@ -501,12 +493,10 @@ class NetworkDeviceManager:
             while self.monitoring:
                 # This is a simplified bandwidth monitoring
                 # In a real implementation, you would use more sophisticated methods
-                for ip in self.devices:
-                    if self.devices[ip]:
-                        # Simulate bandwidth data
-                        import random
-                        bandwidth = random.randint(0, 1000)
-                        self.devices[ip]['bandwidth'] = f"{bandwidth} KB/s"
+                for device in self.devices.snapshot().devices.values():
+                    # Simulate bandwidth data (bytes per second)
+                    import random
+                    self.devices.update(device.address, bandwidth=random.randint(0, 1000) * 1024)
                 
                 self.update_device_list()
                 time.sleep(2)
@@ -523,11 +513,10 @@ class NetworkDeviceManager:
     
     def get_selected_device(self):
         """Get currently selected device"""
-        selection = self.tree.selection()
+        selection = self.device_list.selection()
         if selection:
-            item = selection[0]
-            values = self.tree.item(item)['values']
-            return values[0] if values else None
+            # Item ids are the integer device addresses
+            return int_to_ip(int(selection[0]))
         return None
     
     def monitor_selected_device(self):
@@ -539,13 +528,13 @@ class NetworkDeviceManager:
     def block_selected_device(self):
         """Block selected device"""
         device_ip = self.get_selected_device()
-        if device_ip and device_ip != self.local_ip:
+        if device_ip and device_ip not in self.local_ips:
             if messagebox.askyesno("Block Device", f"Block device {device_ip}?"):
                 self.blocked_devices.add(device_ip)
                 self.apply_device_block(device_ip)
-                self.update_device_list()
+                self.update_device_list(force=True)
                 messagebox.showinfo("Success", f"Device {device_ip} has been blocked.")
-        elif device_ip == self.local_ip:
+        elif device_ip in self.local_ips:
             messagebox.showwarning("Warning", "Cannot block your own device!")
     
     def unblock_selected_device(self):
@@ -554,7 +543,7 @@ class NetworkDeviceManager:
         if device_ip and device_ip in self.blocked_devices:
             self.blocked_devices.remove(device_ip)
             self.remove_device_block(device_ip)
-            self.update_device_list()
+            self.update_device_list(force=True)
             messagebox.showinfo("Success", f"Device {device_ip} has been unblocked.")
     
     def apply_device_block(self, ip):
@@ -673,9 +662,8 @@ class NetworkDeviceManager:
         """Refresh selected device information"""
         device_ip = self.get_selected_device()
         if device_ip:
-            device_info = self.get_device_info(device_ip)
+            device_info = self.discovery.refresh_device(device_ip)
             if device_info:
-                self.devices[device_ip] = device_info
                 self.update_device_list()
                 messagebox.showinfo("Success", f"Device {device_ip} information refreshed.")
     
@@ -684,12 +672,12 @@ class NetworkDeviceManager:
         if messagebox.askyesno("Block All Devices", 
                               "Are you sure you want to block all devices?\n"
                               "This will disconnect all other devices from the internet."):
-            for ip in self.devices:
-                if ip != self.local_ip:
-                    self.blocked_devices.add(ip)
-                    self.apply_device_block(ip)
+            for device in self.devices.snapshot().devices.values():
+                if device.ip not in self.local_ips:
+                    self.blocked_devices.add(device.ip)
+                    self.apply_device_block(device.ip)
             
-            self.update_device_list()
+            self.update_device_list(force=True)
             messagebox.showinfo("Success", "All devices have been blocked.")
     
     def unblock_all_devices(self):
@@ -699,7 +687,7 @@ class NetworkDeviceManager:
                 self.remove_device_block(ip)
             
             self.blocked_devices.clear()
-            self.update_device_list()
+            self.update_device_list(force=True)
             messagebox.showinfo("Success", "All devices have been unblocked.")
     
     def export_device_list(self):
@@ -721,13 +709,12 @@ class NetworkDeviceManager:
                     f.write(f"Gateway: {self.gateway}\n")
                     f.write(f"Your IP: {self.local_ip}\n\n")
                     
-                    f.write("IP Address\tMAC Address\tHostname\tVendor\tStatus\tBandwidth\n")
+                    f.write("IP Address\tMAC Address\tHostname\tVendor\tInterface\tStatus\tBandwidth\n")
                     f.write("-" * 80 + "\n")
                     
-                    for ip, device in self.devices.items():
-                        status = "Blocked" if ip in self.blocked_devices else "Active"
-                        f.write(f"{device['ip']}\t{device['mac']}\t{device['hostname']}\t"
-                               f"{device['vendor']}\t{status}\t{device['bandwidth']}\n")
+                    devices = self.devices.snapshot().devices
+                    for address in sorted(devices):
+                        f.write("\t".join(self.device_row(devices[address])) + "\n")
                 
                 messagebox.showinfo("Success", f"Device list exported to {filename}")
         except Exception as e:
@@ -738,6 +725,9 @@ class NetworkDeviceManager:
         # Stop scanning and monitoring
         self.scanning = False
         self.monitoring = False
+        self.discovery.close()
+        self.discovery.inventory.close()
+        self.dispatcher.stop()
         
         # Call the return callback
         self.return_callback()
@@ -0,0 +1,258 @@
+"""
+IEEE OUI vendor database for NetMaster Pro.
+
+The IEEE MA-L (24-bit), MA-M (28-bit) and MA-S/IAB (36-bit) registries are
+compiled once into a compact binary index: a header, a table of fixed-width
+records sorted by ``(prefix length, prefix)`` and a table of vendor names.
+At runtime the file is memory-mapped and binary-searched, so no dict of tens
+of thousands of entries is built and lookups cost a few microseconds.
+
+The index lives in the per-user data directory, never in the installed
+package. It is built on first use from the IEEE CSV files (``oui.csv``,
+``mam.csv``, ``oui36.csv``) found in that directory, and rebuilt when they
+are newer than it. Download them there and build with::
+
+    python -m netmaster_pro.core.oui_db fetch
+
+or build from files elsewhere with ``build oui.csv mam.csv oui36.csv``. An
+index shipped in the package's assets by a distributor is used when there
+is no per-user one.
+"""
+
+import argparse
+import csv
+import mmap
+import os
+import struct
+import sys
+
+from netmaster_pro.utils.paths import data_dir
+
+MAGIC = b"NMOUI\x00\x00\x01"
+_HEADER = struct.Struct("<8sII")      # magic, record count, names offset
+_RECORD = struct.Struct("<QI")        # key, name offset
+
+PREFIX_LENGTHS = (36, 28, 24)         # Longest match first
+
+BUNDLED_INDEX = os.path.join(os.path.dirname(__file__), "..", "assets", "oui.idx")
+
+# IEEE registry CSV files, by the name they are saved under
+REGISTRIES = {
+    "oui.csv": "https://standards-oui.ieee.org/oui/oui.csv",
+    "mam.csv": "https://standards-oui.ieee.org/oui28/mam.csv",
+    "oui36.csv": "https://standards-oui.ieee.org/oui36/oui36.csv",
+}
+
+LOCALLY_ADMINISTERED = "Private (randomized)"
+
+
+def mac_to_int(mac):
+    """Convert ``aa:bb:cc:dd:ee:ff`` (or ``-``/``.`` separated) to an integer"""
+    digits = "".join(c for c in mac if c not in ":-.")
+    if len(digits) != 12:
+        raise ValueError(f"Invalid MAC address: {mac}")
+    return int(digits, 16)
+
+
+def is_locally_administered(mac):
+    """Whether the MAC has the U/L bit set, as randomized private MACs do"""
+    return bool((mac_to_int(mac) >> 40) & 0x02)
+
+
+def make_key(prefix_length, prefix):
+    return (prefix_length << 40) | prefix
+
+
+def build_index(csv_paths, output_path):
+    """Compile IEEE registry CSV files into a binary index; returns record count"""
+    entries = {}
+    for path in csv_paths:
+        with open(path, newline="", encoding="utf-8", errors="replace") as f:
+            for row in csv.DictReader(f):
+                assignment = (row.get("Assignment") or "").strip()
+                name = (row.get("Organization Name") or "").strip()
+                if not assignment or not name or row.get("Registry", "").strip() == "CID":
+                    continue
+                prefix_length = len(assignment) * 4
+                if prefix_length not in PREFIX_LENGTHS:
+                    continue
+                entries[make_key(prefix_length, int(assignment, 16))] = name
+
+    names = bytearray()
+    name_offsets = {}
+    records = bytearray()
+    for key in sorted(entries):
+        name = entries[key]
+        if name not in name_offsets:
+            name_offsets[name] = len(names)
+            names += name.encode("utf-8") + b"\x00"
+        records += _RECORD.pack(key, name_offsets[name])
+
+    count = len(entries)
+    os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+    tmp_path = output_path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, count, _HEADER.size + len(records)))
+        f.write(records)
+        f.write(names)
+    os.replace(tmp_path, output_path)
+    return count
+
+
+class OuiDatabase:
+    """Memory-mapped, binary-searched view of a compiled OUI index"""
+
+    def __init__(self, path):
+        self.path = path
+        self.count = 0
+        self._names_offset = 0
+        self._mm = None
+        try:
+            with open(path, "rb") as f:
+                self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return  # Missing or empty index: every lookup is unknown
+
+        magic, count, names_offset = _HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not an OUI index")
+        self.count = count
+        self._names_offset = names_offset
+
+    def __len__(self):
+        return self.count
+
+    def _find(self, key):
+        low, high = 0, self.count - 1
+        while low <= high:
+            mid = (low + high) // 2
+            record_key, name_offset = _RECORD.unpack_from(self._mm, _HEADER.size + mid * _RECORD.size)
+            if record_key < key:
+                low = mid + 1
+            elif record_key > key:
+                high = mid - 1
+            else:
+                return name_offset
+        return None
+
+    def _name(self, offset):
+        start = self._names_offset + offset
+        end = self._mm.find(b"\x00", start)
+        return self._mm[start:end].decode("utf-8", "replace")
+
+    def lookup(self, mac):
+        """Return the registered vendor for ``mac`` or ``None``"""
+        if not self.count:
+            return None
+        value = mac_to_int(mac)
+        for prefix_length in PREFIX_LENGTHS:
+            offset = self._find(make_key(prefix_length, value >> (48 - prefix_length)))
+            if offset is not None:
+                return self._name(offset)
+        return None
+
+    def vendor(self, mac, default="Unknown"):
+        """Return a display vendor, flagging locally-administered MACs"""
+        try:
+            if is_locally_administered(mac):
+                return LOCALLY_ADMINISTERED
+            return self.lookup(mac) or default
+        except ValueError:
+            return default
+
+    def close(self):
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+        self.count = 0
+
+
+def default_path():
+    """Per-user location of the OUI index"""
+    return os.path.join(data_dir(), "oui.idx")
+
+
+def registry_files(directory):
+    """Paths of the IEEE registry CSV files saved in ``directory``"""
+    return [os.path.join(directory, name) for name in REGISTRIES if os.path.isfile(os.path.join(directory, name))]
+
+
+def ensure_index(path=None):
+    """Build the index at ``path`` from the registry files beside it if it is missing or older.
+
+    Returns the index to open: ``path`` if it exists, else the bundled one.
+    """
+    path = path or default_path()
+    sources = registry_files(os.path.dirname(path))
+    try:
+        built = os.path.getmtime(path)
+    except OSError:
+        built = None
+    if sources and (built is None or any(os.path.getmtime(source) > built for source in sources)):
+        try:
+            build_index(sources, path)
+        except (OSError, ValueError, csv.Error) as e:
+            print(f"OUI index not built, vendors will be unknown: {e}", file=sys.stderr)
+    return path if os.path.exists(path) else BUNDLED_INDEX
+
+
+def fetch_registries(directory):
+    """Download the IEEE registry CSV files into ``directory``; returns their paths"""
+    import urllib.request  # Only needed here; keeps it off the scan startup path
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    for name, url in REGISTRIES.items():
+        path = os.path.join(directory, name)
+        request = urllib.request.Request(url, headers={"User-Agent": "netmaster-pro"})
+        with urllib.request.urlopen(request, timeout=60) as response, open(path + ".tmp", "wb") as f:
+            f.write(response.read())
+        os.replace(path + ".tmp", path)
+        paths.append(path)
+    return paths
+
+
+_default_database = None
+
+
+def default_database():
+    """Return the shared database, building the per-user index on first use"""
+    global _default_database
+    if _default_database is None:
+        try:
+            _default_database = OuiDatabase(ensure_index())
+        except ValueError:
+            _default_database = OuiDatabase(os.devnull)
+    return _default_database
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Manage the NetMaster Pro OUI vendor index")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    build = subparsers.add_parser("build", help="compile IEEE registry CSV files into an index")
+    build.add_argument("csv", nargs="+", help="IEEE MA-L/MA-M/MA-S CSV files")
+    build.add_argument("-o", "--output", default=None, help="index file to write (default: per-user index)")
+
+    fetch = subparsers.add_parser("fetch", help="download the IEEE registry CSV files and build the per-user index")
+    fetch.add_argument("-o", "--output", default=None, help="index file to write; the CSV files are saved beside it")
+
+    lookup = subparsers.add_parser("lookup", help="look up MAC addresses in an index")
+    lookup.add_argument("mac", nargs="+")
+    lookup.add_argument("-i", "--index", default=None, help="index file (default: per-user index)")
+
+    args = parser.parse_args(argv)
+    if args.command in ("build", "fetch"):
+        output = args.output or default_path()
+        sources = args.csv if args.command == "build" else fetch_registries(os.path.dirname(os.path.abspath(output)))
+        count = build_index(sources, output)
+        print(f"Wrote {count} prefixes to {os.path.abspath(output)}")
+    else:
+        database = OuiDatabase(args.index or ensure_index())
+        for mac in args.mac:
+            print(f"{mac}\t{database.vendor(mac)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
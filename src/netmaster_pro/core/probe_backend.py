@@ -0,0 +1,72 @@
+"""
+Probe backends for NetMaster Pro.
+
+A backend is everything the scanner learns from the outside world: liveness
+probes, the neighbor table (IP to MAC) and reverse DNS. The discovery
+service only talks to its backend, so the whole pipeline can run against
+the real network (:class:`SystemBackend`) or a deterministic stand-in such
+as :class:`netmaster_pro.core.simulated_lan.SimulatedLan`.
+"""
+
+import platform
+
+from netmaster_pro.core.scan_engine import FallbackStage
+from netmaster_pro.core.arp_sweep import ArpProbeStage
+from netmaster_pro.core.icmp_prober import create_probe_stage
+from netmaster_pro.core.tcp_probe import TcpConnectStage
+from netmaster_pro.core.neighbors import read_neighbor_table
+from netmaster_pro.core.dns_resolver import lookup_ptr
+
+
+class ProbeBackend:
+    """Source of probe answers, neighbor entries and hostnames.
+
+    ``shardable`` backends can be swept by scanner processes, which build
+    their own probe stages; other backends always sweep in-process.
+    """
+
+    shardable = False
+
+    def create_probe_stage(self, interface=None, source_ip=None, on_arp_reply=None, on_link=True):
+        """Return the liveness ``ProbeStage`` for one interface.
+
+        ``on_link`` says whether every target is directly attached to
+        ``interface``; link-layer probes cannot reach the others.
+        """
+        raise NotImplementedError
+
+    def read_neighbors(self):
+        """Return the neighbor table as ``{ip: NeighborEntry}``"""
+        return {}
+
+    def lookup_hostname(self, ip):
+        """Blocking reverse lookup; returns the hostname or ``None``"""
+        return None
+
+
+class SystemBackend(ProbeBackend):
+    """The host's own network stack"""
+
+    shardable = True
+
+    def create_probe_stage(self, interface=None, source_ip=None, on_arp_reply=None, on_link=True):
+        # On the local segment an ARP sweep finds every host and its MAC at
+        # once; it needs CAP_NET_RAW. Routed targets never answer ARP
+        if interface and on_link and platform.system() == "Linux":
+            try:
+                return ArpProbeStage(interface, on_reply=on_arp_reply, source_ip=source_ip)
+            except (OSError, ValueError):
+                pass
+        # ICMP first; hosts that drop echo requests get TCP connect probes.
+        # Sockets are pinned to the interface so multi-homed hosts probe
+        # each segment through its own NIC
+        return FallbackStage(
+            create_probe_stage(timeout=1.0, interface=interface),
+            TcpConnectStage(interface=interface)
+        )
+
+    def read_neighbors(self):
+        return read_neighbor_table()
+
+    def lookup_hostname(self, ip):
+        return lookup_ptr(ip)
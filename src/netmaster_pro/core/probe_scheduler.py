@@ -0,0 +1,133 @@
+"""
+Adaptive per-host probe scheduling for NetMaster Pro.
+
+Every probed address keeps a small liveness history: consecutive misses,
+last RTT, how often it flapped and when it is next due. Addresses that never
+answer back off exponentially, stable live hosts are re-checked at the base
+interval and flapping devices are checked more often. A heap keyed on the
+next-due time drives the scan loop instead of a fixed sleep.
+"""
+
+import heapq
+import threading
+import time
+
+
+class HostState:
+    """Liveness history for one address"""
+
+    __slots__ = ("alive", "misses", "flaps", "last_rtt", "interval", "next_due")
+
+    def __init__(self):
+        self.alive = None
+        self.misses = 0
+        self.flaps = 0
+        self.last_rtt = None
+        self.interval = 0.0
+        self.next_due = 0.0
+
+
+class ProbeScheduler:
+    """Due-queue of addresses ordered by when they should next be probed"""
+
+    def __init__(self, base_interval=30.0, min_interval=5.0, max_interval=3600.0,
+                 backoff=2.0, max_flaps=4):
+        self.base_interval = base_interval
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.max_flaps = max_flaps
+        self.states = {}
+        self._heap = []
+        # Outcomes arrive from the scan thread and from neighbor events
+        self._lock = threading.Lock()
+
+    def __contains__(self, ip):
+        return ip in self.states
+
+    def __len__(self):
+        return len(self.states)
+
+    def interval_for(self, state):
+        """Compute the probe interval for a host from its history"""
+        if state.alive:
+            # Flapping devices are checked more often than stable ones
+            interval = self.base_interval / (1 + state.flaps)
+        else:
+            interval = self.base_interval * self.backoff ** min(state.misses, 32)
+            if state.flaps:
+                interval = min(interval, self.base_interval / state.flaps)
+        return max(self.min_interval, min(self.max_interval, interval))
+
+    def _schedule(self, ip, state, due):
+        state.next_due = due
+        heapq.heappush(self._heap, (due, ip))
+
+    def record(self, ip, alive, rtt=None, now=None):
+        """Record a probe outcome and reschedule the address"""
+        now = time.time() if now is None else now
+        with self._lock:
+            return self._record(ip, alive, rtt, now)
+
+    def _record(self, ip, alive, rtt, now):
+        state = self.states.get(ip)
+        if state is None:
+            state = self.states[ip] = HostState()
+
+        if state.alive is not None and state.alive != alive:
+            state.flaps = min(self.max_flaps, state.flaps + 1)
+        elif state.flaps and alive:
+            # Decay the flap count while the host stays up
+            state.flaps -= 1
+
+        state.alive = alive
+        if alive:
+            state.misses = 0
+            state.last_rtt = rtt
+        else:
+            state.misses += 1
+
+        state.interval = self.interval_for(state)
+        self._schedule(ip, state, now + state.interval)
+        return state
+
+    def iter_due(self, now=None):
+        """Lazily yield addresses whose probe is due, earliest first.
+
+        Each yielded address is provisionally rescheduled one interval ahead,
+        so an address whose probe is cut short is not lost from the queue.
+        """
+        now = time.time() if now is None else now
+        while True:
+            with self._lock:
+                if not self._heap or self._heap[0][0] > now:
+                    return
+                due, ip = heapq.heappop(self._heap)
+                state = self.states.get(ip)
+                if state is None or state.next_due != due:
+                    continue  # Superseded entry
+                self._schedule(ip, state, now + max(state.interval, self.min_interval))
+            yield ip
+
+    def next_due_time(self):
+        """Return the earliest pending due time, or ``None`` if nothing is queued"""
+        with self._lock:
+            while self._heap:
+                due, ip = self._heap[0]
+                state = self.states.get(ip)
+                if state is not None and state.next_due == due:
+                    return due
+                heapq.heappop(self._heap)
+        return None
+
+    def time_until_due(self, now=None, default=None):
+        """Seconds until the next address is due (never negative)"""
+        now = time.time() if now is None else now
+        due = self.next_due_time()
+        if due is None:
+            return self.base_interval if default is None else default
+        return max(0.0, due - now)
+
+    def forget(self, ip):
+        with self._lock:
+            self.states.pop(ip, None)
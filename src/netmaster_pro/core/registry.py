@@ -0,0 +1,198 @@
+"""
+Thread-safe device registry for NetMaster Pro.
+
+Scan, neighbor-event and monitor threads write devices while the GUI, the
+CLI and exporters read them. Writes are serialized by a lock and never
+modify a stored :class:`Device` in place: an update stores a changed copy.
+Readers take a :class:`Snapshot`, an immutable view published once per
+version and reused until the next write, so they can iterate it for as long
+as they like without locking and without seeing a half-applied change.
+
+The registry also keeps secondary indexes by MAC, vendor, status and
+interface, updated with every write, so filters and bulk actions cost the
+size of their result rather than a pass over every device. A MAC may be
+held by several addresses (multi-homed hosts, proxy ARP), so the MAC index
+maps to a set like the others; moves are reported by the scan diff and
+applied by removing the old address.
+"""
+
+import threading
+from collections import namedtuple
+from types import MappingProxyType
+
+from netmaster_pro.core.device import mac_to_int
+
+Snapshot = namedtuple("Snapshot", ["version", "devices"])
+
+STATUS_ACTIVE = "Active"
+STATUS_STALE = "Stale"
+
+_EMPTY = Snapshot(0, MappingProxyType({}))
+
+# Indexed fields and how to read each one off a record
+_INDEXED = {
+    'mac': lambda device: device.mac_address,
+    'vendor': lambda device: device.vendor,
+    'status': lambda device: device_status(device),
+    'interface': lambda device: device.interface,
+}
+
+
+def device_status(device):
+    return STATUS_STALE if device.stale else STATUS_ACTIVE
+
+
+class DeviceRegistry:
+    """Devices keyed by integer address, with versioned snapshots.
+
+    ``version`` increases with every write; a reader that remembers the
+    version it last rendered can skip work when nothing changed. Point
+    lookups (``get``, ``in``, ``len``) read the live table and are safe
+    from any thread because stored records are never mutated.
+    """
+
+    def __init__(self, devices=None):
+        self._lock = threading.Lock()
+        self._devices = {}
+        self._indexes = {name: {} for name in _INDEXED}
+        for device in (devices or {}).values():
+            self._store(device)
+        self._version = 1 if self._devices else 0
+        self._snapshot = _EMPTY
+
+    @property
+    def version(self):
+        return self._version
+
+    def snapshot(self):
+        """Return an immutable view of every device at the current version"""
+        snapshot = self._snapshot
+        if snapshot.version == self._version:
+            return snapshot
+        with self._lock:
+            if self._snapshot.version != self._version:
+                self._snapshot = Snapshot(self._version, MappingProxyType(dict(self._devices)))
+            return self._snapshot
+
+    def get(self, address, default=None):
+        return self._devices.get(address, default)
+
+    def __contains__(self, address):
+        return address in self._devices
+
+    def __len__(self):
+        return len(self._devices)
+
+    def __bool__(self):
+        return bool(self._devices)
+
+    def __iter__(self):
+        return iter(self.snapshot().devices)
+
+    def __getitem__(self, address):
+        return self._devices[address]
+
+    def values(self):
+        return self.snapshot().devices.values()
+
+    def items(self):
+        return self.snapshot().devices.items()
+
+    def by_mac(self, mac):
+        """Return the devices holding ``mac`` (text or integer), in address order"""
+        return self.find(mac=mac_to_int(mac) if isinstance(mac, str) else mac)
+
+    def addresses(self, **criteria):
+        """Return the set of addresses matching every ``field=value`` given.
+
+        Fields are ``mac`` (an integer), ``vendor``, ``status`` and
+        ``interface``; with no criteria every address is returned.
+        """
+        with self._lock:
+            return self._match(criteria)
+
+    def find(self, **criteria):
+        """Return the devices matching ``criteria`` in address order; see ``addresses``"""
+        with self._lock:
+            return [self._devices[address] for address in sorted(self._match(criteria))]
+
+    def values_of(self, field):
+        """Return the distinct indexed values of ``field``, e.g. every vendor"""
+        with self._lock:
+            return sorted(value for value, addresses in self._indexes[field].items()
+                          if addresses and value is not None)
+
+    def put(self, device):
+        """Store ``device`` under its address, replacing any previous record"""
+        with self._lock:
+            device = self._store(device)
+            self._version += 1
+        return device
+
+    def update(self, address, **changes):
+        """Store a copy of the device at ``address`` with ``changes`` applied.
+
+        Returns the new record, or ``None`` if there is no such device.
+        """
+        with self._lock:
+            device = self._devices.get(address)
+            if device is None:
+                return None
+            device = self._store(device.replace(**changes))
+            self._version += 1
+        return device
+
+    def remove(self, address):
+        """Remove and return the device at ``address``, if any"""
+        with self._lock:
+            device = self._discard(address)
+            if device is not None:
+                self._version += 1
+        return device
+
+    def merge(self, devices):
+        """Store every record of the ``{address: Device}`` mapping in one write"""
+        with self._lock:
+            for device in devices.values():
+                self._store(device)
+            self._version += 1
+
+    def reset(self, devices=()):
+        """Replace the whole table with the ``{address: Device}`` mapping"""
+        with self._lock:
+            self._devices = {}
+            self._indexes = {name: {} for name in _INDEXED}
+            for device in dict(devices).values():
+                self._store(device)
+            self._version += 1
+
+    def _match(self, criteria):
+        """Addresses matching every ``field=value`` in ``criteria``; lock held"""
+        if not criteria:
+            return set(self._devices)
+        matches = sorted((self._indexes[name].get(value, ()) for name, value in criteria.items()), key=len)
+        # Intersect starting from the smallest set
+        return set(matches[0]).intersection(*matches[1:])
+
+    def _store(self, device):
+        """Insert or replace ``device`` and update the indexes; lock held"""
+        self._discard(device.address)
+        self._devices[device.address] = device
+        for name, key in _INDEXED.items():
+            self._indexes[name].setdefault(key(device), set()).add(device.address)
+        return device
+
+    def _discard(self, address):
+        """Remove the device at ``address`` from the table and indexes; lock held"""
+        device = self._devices.pop(address, None)
+        if device is None:
+            return None
+        for name, key in _INDEXED.items():
+            index = self._indexes[name]
+            value = key(device)
+            addresses = index.get(value)
+            if addresses is not None:
+                addresses.discard(address)
+                if not addresses:
+                    del index[value]
+        return device
@@ -0,0 +1,264 @@
+"""
+Incremental scan diffing for NetMaster Pro.
+
+Presence is tracked in a bitmap with one bit per host of the planned range.
+Each sweep records which addresses it probed and which answered; when it
+ends, only hosts that were present, probed and silent are reported as gone.
+Observations are turned into typed events (joined, left, IP changed, MAC
+changed, hostname resolved) so consumers handle the delta instead of the
+whole inventory, and a sweep over a stable network yields no events.
+
+A MAC may legitimately answer on several addresses (multi-homed hosts,
+proxy ARP, MAC-NAT repeaters), so a MAC seen at a new address is only
+reported as a move once its old address has gone silent; while both
+answer, both are kept. When an address leaves while another present
+address holds its MAC, that is reported as the move (IP_CHANGED) rather
+than a departure, however the new address was learned.
+"""
+
+import ipaddress
+import threading
+from collections import namedtuple
+
+JOINED = "joined"
+LEFT = "left"
+IP_CHANGED = "ip_changed"
+MAC_CHANGED = "mac_changed"
+HOSTNAME_RESOLVED = "hostname_resolved"
+
+# ``previous`` and ``current`` depend on the kind:
+#   joined            None          -> MAC (or None)
+#   left              MAC (or None) -> None
+#   ip_changed        old IP        -> MAC
+#   mac_changed       old MAC       -> new MAC
+#   hostname_resolved old hostname  -> new hostname
+DeviceEvent = namedtuple("DeviceEvent", ["kind", "ip", "previous", "current"])
+
+
+class PresenceBitmap:
+    """One bit per address of a contiguous IPv4 range"""
+
+    def __init__(self, first_host, size):
+        self.first_host = first_host
+        self.size = size
+        self.bits = bytearray((size + 7) // 8)
+
+    def _index(self, ip):
+        index = int(ipaddress.IPv4Address(ip)) - self.first_host
+        if not 0 <= index < self.size:
+            raise ValueError(f"{ip} is outside the bitmap range")
+        return index
+
+    def add(self, ip):
+        index = self._index(ip)
+        self.bits[index >> 3] |= 1 << (index & 7)
+
+    def discard(self, ip):
+        index = self._index(ip)
+        self.bits[index >> 3] &= ~(1 << (index & 7)) & 0xFF
+
+    def __contains__(self, ip):
+        try:
+            index = self._index(ip)
+        except ValueError:
+            return False
+        return bool(self.bits[index >> 3] & (1 << (index & 7)))
+
+    def __len__(self):
+        return bin(self.to_int()).count("1")
+
+    def __iter__(self):
+        return self.iter_bits(self.to_int())
+
+    def to_int(self):
+        return int.from_bytes(self.bits, "little")
+
+    def fill(self):
+        """Mark every address of the range"""
+        self.bits = bytearray(b"\xff" * len(self.bits))
+        if self.size % 8:
+            self.bits[-1] = (1 << (self.size % 8)) - 1
+
+    def iter_bits(self, value):
+        """Yield the dotted-quad address of every bit set in ``value``"""
+        data = value.to_bytes(len(self.bits), "little")
+        for byte_index, byte in enumerate(data):
+            if not byte:
+                continue
+            for bit in range(8):
+                if byte & (1 << bit):
+                    yield str(ipaddress.IPv4Address(self.first_host + (byte_index << 3) + bit))
+
+
+class ScanDiff:
+    """Turn probe results into join/leave/change events between sweeps.
+
+    ``observe`` may be called from any thread, including outside a sweep
+    (e.g. for neighbor notifications); ``end_sweep`` only reports as gone the
+    addresses probed since ``begin_sweep``, so partial sweeps are safe.
+    """
+
+    def __init__(self, planner):
+        self.first_host = planner.first_host
+        self.size = planner.size
+        self.present = PresenceBitmap(self.first_host, self.size)
+        self._probed = None
+        self._seen = None
+        self._macs = {}
+        self._hostnames = {}
+        self._ips_by_mac = {}
+        self._pending_moves = {}
+        self._lock = threading.Lock()
+
+    def __contains__(self, ip):
+        return ip in self.present
+
+    def __len__(self):
+        return len(self.present)
+
+    def begin_sweep(self, full=False):
+        """Start tracking a sweep; ``full`` marks the whole range as probed"""
+        with self._lock:
+            self._probed = PresenceBitmap(self.first_host, self.size)
+            self._seen = PresenceBitmap(self.first_host, self.size)
+            self._pending_moves = {}
+            if full:
+                self._probed.fill()
+
+    def probed(self, ip):
+        """Record that ``ip`` was probed in the current sweep"""
+        with self._lock:
+            if self._probed is not None and ip in self.present:
+                self._probed.add(ip)  # Only present hosts can leave
+
+    def answered(self, ip):
+        """Record that ``ip`` answered in the current sweep, before it is observed"""
+        with self._lock:
+            if self._seen is not None and ip in self.present:
+                self._seen.add(ip)
+                self._probed.add(ip)
+
+    def observe(self, ip, mac=None):
+        """Record that ``ip`` answered, optionally with its MAC; returns events"""
+        events = []
+        with self._lock:
+            try:
+                was_present = ip in self.present
+                self.present.add(ip)
+            except ValueError:
+                return events
+            if self._seen is not None:
+                self._seen.add(ip)
+                self._probed.add(ip)
+
+            known_mac = self._macs.get(ip)
+            if mac:
+                if not was_present:
+                    moved_from = self._moved_from(ip, mac)
+                    if moved_from is not None:
+                        # The device moved: report the move instead of a leave and a join
+                        self._forget(moved_from)
+                        events.append(DeviceEvent(IP_CHANGED, ip, moved_from, mac))
+                        was_present = True
+                    elif self._pending_move(ip, mac):
+                        # Decided by end_sweep once the old address was probed
+                        was_present = True
+                if known_mac and known_mac != mac:
+                    self._ips_by_mac.get(known_mac, set()).discard(ip)
+                    events.append(DeviceEvent(MAC_CHANGED, ip, known_mac, mac))
+                self._macs[ip] = mac
+                self._ips_by_mac.setdefault(mac, set()).add(ip)
+
+            if not was_present:
+                events.insert(0, DeviceEvent(JOINED, ip, None, self._macs.get(ip)))
+        return events
+
+    def _moved_from(self, ip, mac):
+        """An address that held ``mac`` and has since gone silent; lock held"""
+        for other in sorted(self._ips_by_mac.get(mac, ())):
+            if other != ip and other not in self.present:
+                return other
+        return None
+
+    def _pending_move(self, ip, mac):
+        """Defer judging a MAC that answers on another present address; lock held"""
+        if self._seen is None:
+            return False
+        for other in sorted(self._ips_by_mac.get(mac, ())):
+            if other != ip and other not in self._seen:
+                self._pending_moves[other] = ip
+                return True
+        return False
+
+    def resolved(self, ip, hostname):
+        """Record a hostname for ``ip``; returns events.
+
+        A failed lookup (``None`` or ``""``) only produces an event when it
+        removes a name the host had, with ``""`` as the current value.
+        """
+        hostname = hostname or ""
+        with self._lock:
+            previous = self._hostnames.get(ip)
+            self._hostnames[ip] = hostname
+            if hostname == (previous or ""):
+                return []
+            return [DeviceEvent(HOSTNAME_RESOLVED, ip, previous, hostname)]
+
+    def lost(self, ip):
+        """Record that ``ip`` is known to be gone; returns events"""
+        with self._lock:
+            if ip not in self.present:
+                return []
+            return [self._departure(ip)]
+
+    def end_sweep(self, complete=True):
+        """Finish the sweep and return a LEFT event per silent present host.
+
+        Pass ``complete=False`` for a sweep that was cancelled or cut short
+        by its deadline: it reports nobody as gone, since the hosts it never
+        reached (or never finished) say nothing about who left.
+        """
+        with self._lock:
+            if self._probed is None:
+                return []
+            gone = self.present.to_int() & self._probed.to_int() & ~self._seen.to_int()
+            self._probed = self._seen = None
+            pending, self._pending_moves = self._pending_moves, {}
+            events = []
+            if complete:
+                for ip in self.present.iter_bits(gone):
+                    events.append(self._departure(ip, pending.pop(ip, None)))
+            # The old address still answers (or was never reached): both stay
+            for current in pending.values():
+                if current in self.present:
+                    events.append(DeviceEvent(JOINED, current, None, self._macs.get(current)))
+            return events
+
+    def _departure(self, ip, successor=None):
+        """Report ``ip`` as gone; lock held.
+
+        If another present address holds its MAC (preferably ``successor``)
+        the device moved there: the old address is forgotten and IP_CHANGED
+        is returned instead of LEFT, so IP churn keeps one record.
+        """
+        mac = self._macs.get(ip)
+        holders = sorted(self._ips_by_mac.get(mac, ())) if mac else []
+        if successor in holders:
+            holders.insert(0, successor)
+        for other in holders:
+            if other != ip and other in self.present:
+                self._forget(ip)
+                return DeviceEvent(IP_CHANGED, other, ip, mac)
+        self.present.discard(ip)
+        return DeviceEvent(LEFT, ip, mac, None)
+
+    def _forget(self, ip):
+        if ip in self.present:
+            self.present.discard(ip)
+        mac = self._macs.pop(ip, None)
+        if mac is not None:
+            ips = self._ips_by_mac.get(mac, set())
+            ips.discard(ip)
+            if not ips:
+                self._ips_by_mac.pop(mac, None)
+        self._hostnames.pop(ip, None)
@@ -0,0 +1,276 @@
+"""
+Concurrent ping-sweep engine for NetMaster Pro.
+
+The engine probes many hosts at once on an asyncio event loop, bounded by a
+concurrency cap, a global per-sweep deadline and a hard deadline per probe,
+and reports every live host as soon as it answers. Cancelling the sweep's
+token cancels every in-flight probe, so a stop takes effect immediately.
+Liveness probing and device enrichment are separate, pluggable stages so
+that alternative probers can be swapped in without touching the sweep
+logic.
+"""
+
+import asyncio
+import platform
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from netmaster_pro.core.cancellation import CancellationToken
+
+
+class ProbeStage:
+    """Base class for liveness probes.
+
+    Subclasses implement :meth:`probe`, which returns the round-trip time in
+    seconds for a host that answered, or ``None`` if it did not.
+    """
+
+    async def probe(self, ip):
+        raise NotImplementedError
+
+    def probe_sync(self, ip):
+        """Probe a single host from synchronous code"""
+        return asyncio.run(self.probe(ip))
+
+    def close(self):
+        """Release resources held by the stage"""
+
+
+class SubprocessPingStage(ProbeStage):
+    """Probe hosts with the system ``ping`` command without blocking the loop"""
+
+    def __init__(self, timeout=1.0, interface=None):
+        self.timeout = timeout
+        self.interface = interface
+
+    def command(self, ip):
+        """Build the ping command line for the current platform"""
+        if platform.system() == "Windows":
+            return ['ping', '-n', '1', '-w', str(int(self.timeout * 1000)), ip]
+        command = ['ping', '-c', '1', '-W', str(max(1, round(self.timeout)))]
+        if self.interface and platform.system() == "Linux":
+            command += ['-I', self.interface]
+        return command + [ip]
+
+    async def probe(self, ip):
+        start = time.monotonic()
+        try:
+            proc = await asyncio.create_subprocess_exec(
+                *self.command(ip),
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL
+            )
+        except OSError:
+            return None
+
+        try:
+            returncode = await asyncio.wait_for(proc.wait(), self.timeout + 1.0)
+        except asyncio.TimeoutError:
+            returncode = None
+        finally:
+            # Never leave a ping process behind when the sweep is cancelled
+            if proc.returncode is None:
+                try:
+                    proc.kill()
+                except ProcessLookupError:
+                    pass
+                await proc.wait()
+
+        if returncode == 0:
+            return time.monotonic() - start
+        return None
+
+
+class RateLimitedStage(ProbeStage):
+    """Wrap a probe stage so it starts at most ``rate`` probes per second"""
+
+    def __init__(self, inner, rate):
+        self.inner = inner
+        self.interval = 1.0 / rate
+        self._next_slot = 0.0
+
+    async def probe(self, ip):
+        now = time.monotonic()
+        slot = max(now, self._next_slot)
+        self._next_slot = slot + self.interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+        return await self.inner.probe(ip)
+
+    def close(self):
+        self.inner.close()
+
+
+class FallbackStage(ProbeStage):
+    """Run ``secondary`` only for hosts that ``primary`` did not confirm"""
+
+    def __init__(self, primary, secondary):
+        self.primary = primary
+        self.secondary = secondary
+
+    async def probe(self, ip):
+        rtt = await self.primary.probe(ip)
+        if rtt is None:
+            rtt = await self.secondary.probe(ip)
+        return rtt
+
+    def close(self):
+        self.primary.close()
+        self.secondary.close()
+
+
+class ExecutorStage:
+    """Run a blocking per-host callable on a bounded thread pool.
+
+    A call that outlives ``timeout`` yields ``None``. Python threads cannot
+    be interrupted, so a call already running keeps its worker until it
+    returns; one still queued is dropped. Abandoned work is therefore
+    bounded by ``max_workers`` threads, and while all of them are held by
+    abandoned calls new calls yield ``None`` at once instead of queueing.
+    """
+
+    def __init__(self, func, max_workers=8, timeout=5.0):
+        self.func = func
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.abandoned = 0
+        self._executor = None
+        self._lock = threading.Lock()
+
+    async def run(self, ip):
+        if self.abandoned >= self.max_workers:
+            return None
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix="netmaster-enrich"
+            )
+        future = self._executor.submit(self.func, ip)
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), self.timeout)
+        except asyncio.TimeoutError:
+            if not future.cancel():
+                # Already running: its worker stays busy until it returns
+                with self._lock:
+                    self.abandoned += 1
+                future.add_done_callback(self._release)
+            return None
+
+    def _release(self, _future):
+        with self._lock:
+            self.abandoned -= 1
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+
+class ScanEngine:
+    """Sweep a set of targets concurrently through the probe and enrich stages.
+
+    ``targets`` may be any iterable, including a lazy generator; it is
+    consumed incrementally so large ranges are never materialized. Each live
+    host is passed to ``on_result(ip, rtt, info)`` as soon as it has been
+    probed and enriched; ``on_probe(ip, rtt)`` sees every probe outcome,
+    including misses (``rtt`` is ``None``). A probe that outlives
+    ``probe_timeout`` counts as a miss.
+    """
+
+    def __init__(self, probe_stage, enrich_stage=None, concurrency=64, deadline=30.0, probe_timeout=5.0):
+        self.probe_stage = probe_stage
+        self.enrich_stage = enrich_stage
+        self.concurrency = max(1, int(concurrency))
+        self.deadline = deadline
+        self.probe_timeout = probe_timeout
+        self._token = None
+
+    def cancel(self):
+        """Cancel the running sweep, including its in-flight probes"""
+        if self._token is not None:
+            self._token.cancel()
+
+    async def probe(self, ip):
+        try:
+            return await asyncio.wait_for(self.probe_stage.probe(ip), self.probe_timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    async def sweep(self, targets, on_result=None, on_probe=None, token=None):
+        """Probe ``targets`` and return a statistics dict for the sweep.
+
+        Cancelling ``token`` (from any thread) ends the sweep at once.
+        """
+        token = self._token = token if token is not None else CancellationToken()
+        stats = {'probed': 0, 'alive': 0, 'elapsed': 0.0, 'timed_out': False, 'cancelled': False}
+        # The iterator is shared; next() is synchronous so workers never
+        # receive the same target twice.
+        iterator = iter(targets)
+        start = time.monotonic()
+        workers = [asyncio.ensure_future(self._worker(iterator, token, stats, on_result, on_probe))
+                   for _ in range(self.concurrency)]
+        await self._wait(workers, token, stats)
+        stats['cancelled'] = stats['cancelled'] or token.cancelled
+        stats['elapsed'] = time.monotonic() - start
+        return stats
+
+    async def _worker(self, iterator, token, stats, on_result, on_probe):
+        for ip in iterator:
+            if token.cancelled:
+                return
+            rtt = await self.probe(ip)
+            stats['probed'] += 1
+            if on_probe is not None:
+                on_probe(ip, rtt)
+            if rtt is None:
+                continue
+            stats['alive'] += 1
+            info = None
+            if self.enrich_stage is not None:
+                info = await self.enrich_stage.run(ip)
+            if on_result is not None:
+                on_result(ip, rtt, info)
+
+    async def _wait(self, workers, token, stats):
+        """Wait until the workers finish, the deadline passes or ``token`` is cancelled"""
+        loop = asyncio.get_running_loop()
+        stopped = asyncio.Event()
+
+        def on_cancel():
+            try:
+                loop.call_soon_threadsafe(stopped.set)
+            except RuntimeError:
+                pass  # The sweep already finished and its loop is closed
+
+        all_done = asyncio.ensure_future(asyncio.gather(*workers))
+        stop_wait = asyncio.ensure_future(stopped.wait())
+        token.add_callback(on_cancel)
+        try:
+            done, _ = await asyncio.wait(
+                [all_done, stop_wait], timeout=self.deadline, return_when=asyncio.FIRST_COMPLETED
+            )
+            if all_done in done:
+                all_done.result()
+            elif stop_wait in done:
+                stats['cancelled'] = True
+            else:
+                stats['timed_out'] = True
+        finally:
+            token.remove_callback(on_cancel)
+            # Cancelling the workers cancels their in-flight probes, whose
+            # cleanup (killing ping processes, dropping waiters) runs here
+            for task in workers:
+                task.cancel()
+            stop_wait.cancel()
+            await asyncio.gather(all_done, stop_wait, return_exceptions=True)
+
+    def run(self, targets, on_result=None, on_probe=None, token=None):
+        """Run a sweep to completion from synchronous code (e.g. a scan thread)"""
+        return asyncio.run(self.sweep(targets, on_result, on_probe, token))
+
+    def close(self):
+        self.probe_stage.close()
+        if self.enrich_stage is not None:
+            self.enrich_stage.close()
@@ -0,0 +1,117 @@
+"""
+CIDR-aware scan planning for NetMaster Pro.
+
+The planner works on the real interface prefix instead of assuming a /24.
+It splits the host range into fixed-size chunks and streams targets lazily
+in priority order: recently seen hosts first, then the addresses around the
+gateway, then the remaining chunks. Only integers are kept for the range, so
+planning a /16 never materializes 65k address strings up front.
+"""
+
+import ipaddress
+
+
+class ScanPlanner:
+    """Plan the order in which the addresses of a network are probed"""
+
+    def __init__(self, network, gateway=None, chunk_size=256, neighborhood=16):
+        self.network = ipaddress.IPv4Network(network, strict=False)
+        self.gateway = gateway
+        self.chunk_size = max(1, int(chunk_size))
+        self.neighborhood = neighborhood
+        # Index of the chunk where the next sweep resumes the bulk pass, so a
+        # sweep cut short by its deadline continues where it stopped.
+        self.cursor = 0
+
+    @property
+    def first_host(self):
+        start = int(self.network.network_address)
+        return start if self.network.prefixlen >= 31 else start + 1
+
+    @property
+    def last_host(self):
+        end = int(self.network.broadcast_address)
+        return end if self.network.prefixlen >= 31 else end - 1
+
+    @property
+    def size(self):
+        """Number of probe targets in the network"""
+        return self.last_host - self.first_host + 1
+
+    @property
+    def chunk_count(self):
+        return -(-self.size // self.chunk_size)
+
+    def __contains__(self, ip):
+        try:
+            value = int(ipaddress.IPv4Address(ip))
+        except ValueError:
+            return False
+        return self.first_host <= value <= self.last_host
+
+    def chunk(self, index):
+        """Return the inclusive ``(start, end)`` integer bounds of a chunk"""
+        start = self.first_host + index * self.chunk_size
+        return start, min(start + self.chunk_size - 1, self.last_host)
+
+    def shards(self, count):
+        """Split the host range into ``count`` contiguous ``(start, end)`` shards"""
+        count = max(1, min(count, self.size))
+        base, extra = divmod(self.size, count)
+        start = self.first_host
+        for i in range(count):
+            end = start + base + (1 if i < extra else 0) - 1
+            yield start, end
+            start = end + 1
+
+    def gateway_neighborhood(self):
+        """Yield addresses around the gateway, nearest first"""
+        if not self.gateway or self.gateway not in self:
+            return
+        center = int(ipaddress.IPv4Address(self.gateway))
+        yield center
+        for distance in range(1, self.neighborhood + 1):
+            for value in (center - distance, center + distance):
+                if self.first_host <= value <= self.last_host:
+                    yield value
+
+    def iter_targets(self, recent=(), skip=None):
+        """Lazily yield dotted-quad targets in priority order.
+
+        ``recent`` is an iterable of addresses ordered most recent first;
+        ``skip`` is an optional predicate for addresses not worth probing.
+        """
+        seen = set()
+        for value in self._priority_values(recent):
+            if value in seen:
+                continue
+            seen.add(value)
+            ip = str(ipaddress.IPv4Address(value))
+            if skip is None or not skip(ip):
+                yield ip
+        yield from self._bulk_targets(seen, skip)
+
+    def _priority_values(self, recent):
+        """Recently seen addresses inside the range, then the gateway's neighbourhood"""
+        for ip in recent:
+            if ip in self:
+                yield int(ipaddress.IPv4Address(ip))
+        yield from self.gateway_neighborhood()
+
+    def _bulk_targets(self, seen, skip):
+        # Bulk pass over every chunk, starting at the saved cursor and
+        # wrapping around. Priority addresses are never probed twice.
+        chunks = self.chunk_count
+        first_chunk = self.cursor
+        for step in range(chunks):
+            index = (first_chunk + step) % chunks
+            self.cursor = index
+            start, end = self.chunk(index)
+            for value in range(start, end + 1):
+                if value in seen:
+                    continue
+                ip = str(ipaddress.IPv4Address(value))
+                if skip is not None and skip(ip):
+                    continue
+                yield ip
+        self.cursor = 0
@@ -0,0 +1,199 @@
+"""
+Multi-process sharded scanning for very large address spaces.
+
+For /16 and larger ranges a single process spends most of its time on
+probe bookkeeping and result handling. The sharded scanner splits the
+planned range into contiguous shards, runs an independent scan engine and
+prober per worker process and streams compact ``(ip_int, rtt_us)`` records
+back to the parent in batches, where they are merged into the inventory.
+"""
+
+import multiprocessing
+import os
+import queue
+import threading
+import time
+
+from netmaster_pro.core.cancellation import CancellationToken
+from netmaster_pro.core.device import ip_to_int, int_to_ip
+from netmaster_pro.core.icmp_prober import create_probe_stage
+from netmaster_pro.core.scan_engine import ScanEngine, RateLimitedStage
+
+BATCH_SIZE = 256
+BATCH_INTERVAL = 0.1
+
+# A full sweep that has not finished after this long is cut short and its
+# remaining workers are terminated, so one stuck worker cannot hang it
+SWEEP_DEADLINE = 600.0
+
+
+def _shard_targets(start, end, stop_event):
+    for value in range(start, end + 1):
+        if stop_event.is_set():
+            return
+        yield int_to_ip(value)
+
+
+def _mirror_stop(stop_event):
+    """Return a token cancelled once ``stop_event`` is set, and an event that ends the watch"""
+    # Mirror the parent's stop event into a token so in-flight probes are
+    # cancelled too, not just the start of new ones. The event is polled:
+    # a process that exits while blocked in Event.wait() leaves a stale
+    # waiter behind and deadlocks the parent's Event.set().
+    token = CancellationToken()
+    finished = threading.Event()
+
+    def watch_stop():
+        while not finished.wait(0.01):
+            if stop_event.is_set():
+                token.cancel()
+                return
+
+    threading.Thread(target=watch_stop, daemon=True).start()
+    return token, finished
+
+
+def _scan_shard(shard_id, start, end, probe_factory, concurrency, rate, deadline, results, stop_event):
+    """Worker process entry point: sweep one shard and stream results"""
+    stats = {'probed': 0, 'alive': 0, 'elapsed': 0.0, 'timed_out': False}
+    batch = []
+    last_flush = time.monotonic()
+
+    def flush():
+        nonlocal batch, last_flush
+        if batch:
+            results.put(("results", shard_id, batch))
+            batch = []
+        last_flush = time.monotonic()
+
+    def on_result(ip, rtt, info):
+        batch.append((ip_to_int(ip), int(rtt * 1000000)))
+        if len(batch) >= BATCH_SIZE or time.monotonic() - last_flush >= BATCH_INTERVAL:
+            flush()
+
+    token, finished = _mirror_stop(stop_event)
+    engine = None
+    try:
+        stage = probe_factory()
+        if rate:
+            stage = RateLimitedStage(stage, rate)
+        engine = ScanEngine(stage, concurrency=concurrency, deadline=deadline)
+        stats = engine.run(_shard_targets(start, end, stop_event), on_result=on_result, token=token)
+    except Exception as e:
+        stats['error'] = str(e)
+    finally:
+        finished.set()
+        flush()
+        results.put(("done", shard_id, stats))
+        if engine is not None:
+            engine.close()
+
+
+class ShardedScanner:
+    """Split a planned range across a pool of scanner processes.
+
+    ``probe_factory`` must be picklable (a module-level callable) because it
+    is invoked inside each worker to build that worker's own prober. The
+    ``spawn`` start method is used by default since the GUI process runs
+    threads, which ``fork`` does not copy safely. A sweep still running
+    after ``deadline`` seconds is cut short: its workers are terminated and
+    the stats report ``timed_out``.
+    """
+
+    def __init__(self, workers=None, rate=None, concurrency=256, deadline=SWEEP_DEADLINE,
+                 probe_factory=create_probe_stage, start_method="spawn"):
+        self.workers = workers or os.cpu_count() or 1
+        self.rate = rate
+        self.concurrency = concurrency
+        self.deadline = deadline
+        self.probe_factory = probe_factory
+        self.context = multiprocessing.get_context(start_method)
+        self._stop = None
+
+    def cancel(self):
+        """Ask all workers to stop"""
+        if self._stop is not None:
+            self._stop.set()
+
+    def scan(self, planner, on_result=None, token=None):
+        """Sweep every host of ``planner`` and call ``on_result(ip, rtt)`` per live host.
+
+        Cancelling ``token`` stops every worker and returns promptly.
+        """
+        token = token if token is not None else CancellationToken()
+        results = self.context.Queue()
+        self._stop = self.context.Event()
+        start = time.monotonic()
+        processes = self._start_workers(planner, results)
+
+        stats = {'probed': 0, 'alive': 0, 'elapsed': 0.0, 'timed_out': False,
+                 'cancelled': False, 'workers': len(processes), 'errors': []}
+        stop = self._stop
+        token.add_callback(stop.set)
+        try:
+            self._collect(results, processes, stats, on_result, token, start + self.deadline)
+        finally:
+            token.remove_callback(stop.set)
+            stop.set()
+            self._stop_workers(processes)
+            results.cancel_join_thread()
+            results.close()
+
+        stats['elapsed'] = time.monotonic() - start
+        return stats
+
+    def _start_workers(self, planner, results):
+        processes = []
+        for shard_id, (first, last) in enumerate(planner.shards(self.workers)):
+            process = self.context.Process(
+                target=_scan_shard,
+                args=(shard_id, first, last, self.probe_factory, self.concurrency,
+                      self.rate, self.deadline, results, self._stop),
+                daemon=True,
+                name=f"netmaster-shard-{shard_id}"
+            )
+            process.start()
+            processes.append(process)
+        return processes
+
+    def _collect(self, results, processes, stats, on_result, token, deadline):
+        """Merge worker messages into ``stats`` until every worker reported, or the sweep ends early"""
+        remaining = len(processes)
+        while remaining:
+            if token.cancelled:
+                stats['cancelled'] = True
+                return
+            if time.monotonic() >= deadline:
+                stats['timed_out'] = True
+                return
+            try:
+                kind, _shard_id, payload = results.get(timeout=0.02)
+            except queue.Empty:
+                if not any(process.is_alive() for process in processes):
+                    return  # A worker died without reporting
+                continue
+
+            if kind == "results":
+                if on_result is not None:
+                    for value, rtt_us in payload:
+                        on_result(int_to_ip(value), rtt_us / 1000000)
+            else:
+                remaining -= 1
+                self._merge_stats(stats, payload)
+
+    def _merge_stats(self, stats, shard_stats):
+        stats['probed'] += shard_stats['probed']
+        stats['alive'] += shard_stats['alive']
+        stats['timed_out'] |= shard_stats['timed_out']
+        if 'error' in shard_stats:
+            stats['errors'].append(shard_stats['error'])
+
+    def _stop_workers(self, processes):
+        # Workers stop within a few milliseconds of the stop event;
+        # stragglers, e.g. one stuck in a blocking call, are terminated
+        grace = time.monotonic() + 1.0
+        for process in processes:
+            process.join(timeout=max(0.0, grace - time.monotonic()))
+            if process.is_alive():
+                process.terminate()
+                process.join()
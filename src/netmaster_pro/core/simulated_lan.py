@@ -0,0 +1,147 @@
+"""
+Simulated LAN probe backend for NetMaster Pro.
+
+A deterministic, in-memory network for tests and benchmarks: a configurable
+number of hosts placed in any prefix (up to a /16), each with its own
+latency drawn from a log-normal distribution, per-probe jitter and loss,
+hosts that ignore ICMP and only answer TCP, reverse names for a share of
+them and churn between sweeps. Every outcome is derived from the seed, the
+address and how often that address was probed, so the same sweeps produce
+the same results regardless of how probes interleave.
+"""
+
+import asyncio
+import ipaddress
+import math
+import random
+from collections import namedtuple
+
+from netmaster_pro.core.scan_engine import ProbeStage, FallbackStage
+from netmaster_pro.core.neighbors import NeighborEntry
+from netmaster_pro.core.probe_backend import ProbeBackend
+
+SimulatedHost = namedtuple("SimulatedHost", ["ip", "mac", "hostname", "latency", "icmp_silent"])
+
+# Real OUIs so vendor lookups are exercised too
+SIMULATED_OUIS = ("3c:22:fb", "b8:27:eb", "00:50:56", "f4:f5:d8", "00:1b:63", "dc:a6:32")
+
+
+class SimulatedProbeStage(ProbeStage):
+    """ICMP or TCP probe answered by a :class:`SimulatedLan`.
+
+    ``on_arp_reply(ip, mac)`` is told the MAC of every host that answers,
+    the way an ARP sweep reports it.
+    """
+
+    def __init__(self, lan, kind, on_arp_reply=None):
+        self.lan = lan
+        self.kind = kind
+        self.on_arp_reply = on_arp_reply
+
+    async def probe(self, ip):
+        rtt = self.lan.answer(ip, self.kind)
+        if rtt is not None and self.on_arp_reply is not None:
+            self.on_arp_reply(ip, self.lan.hosts[ip].mac)
+        # Silence costs the full probe timeout, as it does on a real network
+        await asyncio.sleep((self.lan.timeout if rtt is None else rtt) * self.lan.time_scale)
+        return rtt
+
+
+class SimulatedLan(ProbeBackend):
+    """Deterministic stand-in for a local network.
+
+    ``latency`` is the median host RTT and ``latency_spread`` the sigma of
+    its log-normal distribution; each probe varies by up to ``jitter``
+    (a fraction of the host's RTT) and is lost with probability ``loss``.
+    ``icmp_silent`` and ``named`` are the shares of hosts that drop echo
+    requests and that have a reverse name. Each :meth:`advance` toggles
+    every host's presence with probability ``churn``. Simulated waits are
+    multiplied by ``time_scale``; 0 runs as fast as the pipeline allows.
+    """
+
+    def __init__(self, network, hosts=64, latency=0.002, latency_spread=0.5, jitter=0.2,
+                 loss=0.0, icmp_silent=0.0, named=0.75, churn=0.0, timeout=1.0,
+                 time_scale=1.0, seed=0):
+        self.network = ipaddress.IPv4Network(network, strict=False)
+        self.jitter = jitter
+        self.loss = loss
+        self.churn = churn
+        self.timeout = timeout
+        self.time_scale = time_scale
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.probes = 0
+
+        first = int(self.network.network_address)
+        last = int(self.network.broadcast_address)
+        if self.network.prefixlen < 31:
+            first, last = first + 1, last - 1
+        chosen = sorted(self.rng.sample(range(first, last + 1), min(hosts, last - first + 1)))
+
+        self.hosts = {}
+        for value in chosen:
+            ip = str(ipaddress.IPv4Address(value))
+            mac = self.rng.choice(SIMULATED_OUIS) + "".join(f":{self.rng.randrange(256):02x}" for _ in range(3))
+            self.hosts[ip] = SimulatedHost(
+                ip,
+                mac,
+                f"host-{value & 0xFFFF:05d}.lan" if self.rng.random() < named else None,
+                self.rng.lognormvariate(math.log(latency), latency_spread),
+                self.rng.random() < icmp_silent
+            )
+        self.present = set(self.hosts)
+        self._attempts = {}
+        self._neighbors = {}
+
+    def answer(self, ip, kind):
+        """Outcome of one ``kind`` ("icmp" or "tcp") probe: the RTT or ``None``"""
+        self.probes += 1
+        host = self.hosts.get(ip)
+        if host is None or ip not in self.present or (kind == "icmp" and host.icmp_silent):
+            return None
+        key = (ip, kind)
+        attempt = self._attempts.get(key, 0)
+        self._attempts[key] = attempt + 1
+        draw = random.Random(f"{self.seed}:{ip}:{kind}:{attempt}")
+        if draw.random() < self.loss:
+            return None
+        # Answering resolves the host's MAC, as ARP would
+        self._neighbors[ip] = NeighborEntry(ip, host.mac, "REACHABLE", None)
+        return host.latency * draw.uniform(1 - self.jitter, 1 + self.jitter)
+
+    def advance(self):
+        """Move on to the next sweep; returns the ``(joined, left)`` addresses"""
+        joined, left = [], []
+        if self.churn:
+            for ip in self.hosts:
+                if self.rng.random() < self.churn:
+                    if ip in self.present:
+                        self.present.discard(ip)
+                        left.append(ip)
+                    else:
+                        self.present.add(ip)
+                        joined.append(ip)
+        # Confirmed entries age to STALE; departed hosts stop answering ARP
+        self._neighbors = {
+            ip: entry._replace(state="STALE" if ip in self.present else "FAILED")
+            for ip, entry in self._neighbors.items()
+        }
+        return joined, left
+
+    def alive(self):
+        """Addresses currently present, in address order"""
+        return [ip for ip in self.hosts if ip in self.present]
+
+    def create_probe_stage(self, interface=None, source_ip=None, on_arp_reply=None, on_link=True):
+        # Mirrors the system backend: ICMP backed by TCP connect probes
+        return FallbackStage(
+            SimulatedProbeStage(self, "icmp", on_arp_reply),
+            SimulatedProbeStage(self, "tcp", on_arp_reply)
+        )
+
+    def read_neighbors(self):
+        return dict(self._neighbors)
+
+    def lookup_hostname(self, ip):
+        host = self.hosts.get(ip)
+        return host.hostname if host is not None else None
@@ -0,0 +1,145 @@
+"""
+TCP/UDP fallback probes for hosts that drop ICMP.
+
+Many phones and Windows hosts silently discard echo requests. For addresses
+the ICMP stage did not confirm, this stage tries a non-blocking TCP connect
+to a small set of ports (a RST still proves the host is up) and, optionally,
+UDP datagrams whose ICMP port-unreachable answer does the same. All
+attempts share a bounded in-flight window so the fallback cannot flood the
+network or exhaust file descriptors.
+"""
+
+import asyncio
+import socket
+import time
+
+from netmaster_pro.core.scan_engine import ProbeStage, FallbackStage
+from netmaster_pro.core.icmp_prober import create_probe_stage
+from netmaster_pro.core.interfaces import bind_to_device
+
+# HTTP, HTTPS, SSH, SMB, NetBIOS session and the iOS lockdown service
+DEFAULT_TCP_PORTS = (80, 443, 22, 445, 139, 62078)
+
+# NetBIOS name service and mDNS
+DEFAULT_UDP_PORTS = (137, 5353)
+
+
+class _UdpProbeProtocol(asyncio.DatagramProtocol):
+    def __init__(self, future):
+        self.future = future
+
+    def datagram_received(self, data, addr):
+        if not self.future.done():
+            self.future.set_result(True)
+
+    def error_received(self, exc):
+        # ICMP port unreachable surfaces as ConnectionRefusedError
+        if not self.future.done():
+            self.future.set_result(isinstance(exc, ConnectionRefusedError))
+
+
+class TcpConnectStage(ProbeStage):
+    """Probe liveness with TCP connects and optional UDP datagrams.
+
+    With ``interface`` every probe socket is pinned to that interface.
+    """
+
+    def __init__(self, ports=DEFAULT_TCP_PORTS, udp_ports=(), timeout=0.5, max_in_flight=256, interface=None):
+        self.ports = tuple(ports)
+        self.udp_ports = tuple(udp_ports)
+        self.timeout = timeout
+        self.max_in_flight = max_in_flight
+        self.interface = interface
+        self._window = None
+        self._loop = None
+
+    def _socket(self, kind):
+        # None lets asyncio create an unbound socket itself
+        if not self.interface:
+            return None
+        sock = socket.socket(socket.AF_INET, kind)
+        sock.setblocking(False)
+        bind_to_device(sock, self.interface)
+        return sock
+
+    def _get_window(self):
+        # Semaphores belong to one event loop and each sweep runs a new one
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._window = asyncio.Semaphore(self.max_in_flight)
+        return self._window
+
+    async def probe_tcp(self, ip, port):
+        """Return the connect RTT if the host answered with SYN-ACK or RST"""
+        async with self._get_window():
+            start = time.monotonic()
+            sock = self._socket(socket.SOCK_STREAM)
+            try:
+                if sock is None:
+                    _reader, writer = await asyncio.wait_for(
+                        asyncio.open_connection(ip, port), self.timeout
+                    )
+                    writer.close()
+                else:
+                    loop = asyncio.get_running_loop()
+                    await asyncio.wait_for(loop.sock_connect(sock, (ip, port)), self.timeout)
+            except ConnectionRefusedError:
+                return time.monotonic() - start
+            except (asyncio.TimeoutError, OSError):
+                return None
+            finally:
+                if sock is not None:
+                    sock.close()
+            return time.monotonic() - start
+
+    async def probe_udp(self, ip, port):
+        """Return the RTT if the host answered or rejected a UDP datagram"""
+        async with self._get_window():
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            start = time.monotonic()
+            sock = self._socket(socket.SOCK_DGRAM)
+            try:
+                if sock is None:
+                    endpoint = {'remote_addr': (ip, port)}
+                else:
+                    sock.connect((ip, port))
+                    endpoint = {'sock': sock}
+                transport, _protocol = await loop.create_datagram_endpoint(
+                    lambda: _UdpProbeProtocol(future), **endpoint
+                )
+            except OSError:
+                if sock is not None:
+                    sock.close()
+                return None
+            try:
+                transport.sendto(b"\x00")
+                answered = await asyncio.wait_for(future, self.timeout)
+            except (asyncio.TimeoutError, OSError):
+                answered = False
+            finally:
+                transport.close()
+            return time.monotonic() - start if answered else None
+
+    async def probe(self, ip):
+        attempts = [asyncio.ensure_future(self.probe_tcp(ip, port)) for port in self.ports]
+        attempts += [asyncio.ensure_future(self.probe_udp(ip, port)) for port in self.udp_ports]
+        try:
+            for attempt in asyncio.as_completed(attempts):
+                rtt = await attempt
+                if rtt is not None:
+                    return rtt
+            return None
+        finally:
+            for attempt in attempts:
+                attempt.cancel()
+            await asyncio.gather(*attempts, return_exceptions=True)
+
+
+def create_probe_stage_with_fallback(timeout=1.0, interface=None):
+    """ICMP (or subprocess ping) backed by TCP connect probes.
+
+    Module-level so it can be handed to scanner worker processes.
+    """
+    return FallbackStage(create_probe_stage(timeout, interface), TcpConnectStage(interface=interface))
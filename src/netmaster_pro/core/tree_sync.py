@@ -0,0 +1,91 @@
+"""
+Incremental Treeview updates for NetMaster Pro.
+
+Redrawing a ``ttk.Treeview`` by deleting and re-inserting every row costs
+one Tcl call per row, freezes the main loop on large lists and loses the
+selection and scroll position. :class:`TreeviewSync` gives every row a
+stable item id and, on each render, applies only the rows that were
+inserted, deleted, changed or moved.
+"""
+
+from collections import namedtuple
+
+SyncStats = namedtuple("SyncStats", ["inserted", "deleted", "updated", "moved"])
+
+
+class TreeviewSync:
+    """Keep a Treeview's rows in step with a list of ``(iid, values)``.
+
+    ``tree`` needs the ``insert``, ``delete``, ``item`` and ``move`` methods
+    of ``ttk.Treeview``. Rows must only be changed through :meth:`apply`.
+    Each apply still compares every row in Python; what it saves is the
+    Treeview calls for rows that did not change.
+    """
+
+    def __init__(self, tree):
+        self.tree = tree
+        self.rows = {}
+        self.order = []
+
+    def __len__(self):
+        return len(self.order)
+
+    def __contains__(self, iid):
+        return iid in self.rows
+
+    def apply(self, rows):
+        """Show ``rows`` (``(iid, values)`` in display order); returns :class:`SyncStats`"""
+        rows = dict(rows)
+        order = list(rows)
+
+        removed = [iid for iid in self.order if iid not in rows]
+        if removed:
+            self.tree.delete(*removed)
+        kept = [iid for iid in self.order if iid in rows] if removed else self.order
+
+        updated = self._update(rows)
+        inserted, moved = self._place(rows, order, kept)
+
+        self.rows = rows
+        self.order = order
+        return SyncStats(inserted, len(removed), updated, moved)
+
+    def _update(self, rows):
+        """Push new values for rows already shown; returns how many changed"""
+        updated = 0
+        for iid, values in rows.items():
+            previous = self.rows.get(iid)
+            if previous is not None and previous != values:
+                self.tree.item(iid, values=values)
+                updated += 1
+        return updated
+
+    def _place(self, rows, order, kept):
+        """Insert new rows and reorder the ``kept`` ones; returns ``(inserted, moved)``"""
+        inserted = moved = 0
+        if len(kept) != len(order):
+            existing = [iid for iid in order if iid in self.rows]
+        else:
+            existing = order
+        if existing == kept:
+            # Relative order unchanged: new rows slot in at their positions
+            if len(kept) != len(order):
+                for index, iid in enumerate(order):
+                    if iid not in self.rows:
+                        self.tree.insert("", index, iid=iid, values=rows[iid])
+                        inserted += 1
+        else:
+            for index, iid in enumerate(order):
+                if iid not in self.rows:
+                    self.tree.insert("", index, iid=iid, values=rows[iid])
+                    inserted += 1
+                else:
+                    self.tree.move(iid, "", index)
+                    moved += 1
+        return inserted, moved
+
+    def clear(self):
+        if self.order:
+            self.tree.delete(*self.order)
+        self.rows = {}
+        self.order = []
@@ -0,0 +1,94 @@
+"""
+Frame-rate-limited UI dispatch for NetMaster Pro.
+
+Tk is not thread-safe, and scheduling one ``after(0, ...)`` per scanner or
+monitor event floods the main loop when events arrive faster than the
+screen can redraw. Worker threads instead post callbacks to a
+:class:`UiDispatcher`; the Tk main loop drains it on a fixed cadence.
+Posts that share a ``key`` replace each other until the next drain, so a
+burst of status messages or list refreshes costs one update per frame and
+the time to show the latest state stays bounded by the interval.
+"""
+
+import itertools
+import sys
+import threading
+
+
+class UiDispatcher:
+    """Thread-safe queue of UI callbacks run by the Tk main loop.
+
+    ``widget`` is the widget whose screen the updates belong to; draining
+    stops once it is destroyed. ``interval`` is the drain period in
+    milliseconds.
+    """
+
+    def __init__(self, widget, interval=50):
+        self.widget = widget
+        self.interval = interval
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._unique = itertools.count()
+        self._after_id = None
+        self.running = False
+
+    def post(self, callback, *args, key=None):
+        """Queue ``callback(*args)`` for the main loop; safe from any thread.
+
+        A pending callback posted with the same ``key`` is replaced, keeping
+        its place in the queue.
+        """
+        with self._lock:
+            self._pending[key if key is not None else ("unique", next(self._unique))] = (callback, args)
+
+    def __len__(self):
+        return len(self._pending)
+
+    def start(self):
+        """Start draining every ``interval`` ms; call from the main thread"""
+        if not self.running:
+            self.running = True
+            self._schedule()
+
+    def stop(self):
+        """Stop draining; callbacks still queued are dropped"""
+        self.running = False
+        if self._after_id is not None:
+            try:
+                self.widget.after_cancel(self._after_id)
+            except Exception:
+                pass  # The widget is already gone
+            self._after_id = None
+        with self._lock:
+            self._pending.clear()
+
+    def drain(self):
+        """Run every queued callback; returns how many ran"""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        for callback, args in pending.values():
+            try:
+                callback(*args)
+            except Exception as e:
+                print(f"UI update error: {e}", file=sys.stderr)
+        return len(pending)
+
+    def _schedule(self):
+        try:
+            self._after_id = self.widget.after(self.interval, self._tick)
+        except Exception:
+            self.running = False  # The widget was destroyed
+
+    def _tick(self):
+        self._after_id = None
+        if not self.running:
+            return
+        try:
+            alive = self.widget.winfo_exists()
+        except Exception:
+            alive = False
+        if not alive:
+            self.stop()
+            return
+        self.drain()
+        self._schedule()
@@ -0,0 +1,179 @@
+"""
+Virtualized Treeview rows for NetMaster Pro.
+
+A ``ttk.Treeview`` keeps a Tcl item for every row it holds, so tens of
+thousands of devices make scrolling slow and memory grow with the list.
+:class:`VirtualList` keeps the rows as a plain Python sequence and only
+materializes the visible window plus a small overscan in the Treeview; the
+scrollbar is driven from the full sequence. Moving the window is an
+incremental :class:`TreeviewSync` update, so scrolling by one row costs one
+insert and one delete however long the list is.
+"""
+
+from netmaster_pro.core.tree_sync import TreeviewSync
+
+
+class VirtualList:
+    """Show a long sequence of rows in a Treeview, a window at a time.
+
+    ``render(row)`` turns an element of the sequence given to
+    :meth:`set_rows` into ``(iid, values)``; it is only called for rows in
+    the window. ``scrollbar``'s command should be :meth:`yview`. The number
+    of visible rows follows the tree's height divided by ``row_height``.
+    Selection is remembered by item id, so it survives rows scrolling out
+    of the window and back. The arrow and page keys move through the whole
+    sequence, and when the Treeview scrolls itself (e.g. to show a row
+    selected by dragging) the window follows.
+    """
+
+    def __init__(self, tree, scrollbar=None, row_height=20, overscan=10, visible=20):
+        self.tree = tree
+        self.scrollbar = scrollbar
+        self.row_height = row_height
+        self.overscan = overscan
+        self.visible = visible
+        self.sync = TreeviewSync(tree)
+        self.rows = []
+        self.render = None
+        self.first = 0
+        self.selected = set()
+
+        if hasattr(tree, "bind"):
+            tree.bind("<Configure>", self.on_resize, add="+")
+            tree.bind("<<TreeviewSelect>>", self.on_select, add="+")
+            # Take over wheel scrolling; the Treeview only holds the window
+            tree.bind("<MouseWheel>", self.on_wheel)
+            tree.bind("<Button-4>", self.on_wheel)
+            tree.bind("<Button-5>", self.on_wheel)
+            for key in ("<Up>", "<Down>", "<Prior>", "<Next>"):
+                tree.bind(key, self.on_key)
+            tree.configure(yscrollcommand=self.on_tree_scroll)
+
+    def __len__(self):
+        return len(self.rows)
+
+    def set_rows(self, rows, render):
+        """Replace the row sequence, keeping the scroll position where possible"""
+        self.rows = rows
+        self.render = render
+        self.first = self.clamp(self.first)
+        self.refresh()
+
+    def window(self):
+        """``(start, end)`` indexes of the rows materialized in the tree"""
+        start = max(0, self.first - self.overscan)
+        end = min(len(self.rows), self.first + self.visible + self.overscan)
+        return start, end
+
+    def refresh(self):
+        """Materialize the current window and update the scrollbar"""
+        start, end = self.window()
+        stats = self.sync.apply([self.render(row) for row in self.rows[start:end]] if self.render else [])
+        if end > start:
+            # Show the window's first visible row at the top of the tree
+            self.tree.yview_moveto((self.first - start) / (end - start))
+        self.restore_selection()
+        if self.scrollbar is not None:
+            self.scrollbar.set(*self.fractions())
+        return stats
+
+    def fractions(self):
+        """The visible part of the whole sequence, as scrollbar fractions"""
+        total = len(self.rows)
+        if not total:
+            return 0.0, 1.0
+        return self.first / total, min(1.0, (self.first + self.visible) / total)
+
+    def clamp(self, index):
+        return max(0, min(index, len(self.rows) - self.visible))
+
+    def scroll_to(self, index):
+        """Make row ``index`` the first visible one"""
+        index = self.clamp(index)
+        if index != self.first:
+            self.first = index
+            self.refresh()
+
+    def see(self, index):
+        """Scroll as little as needed to make row ``index`` visible"""
+        if index < self.first:
+            self.scroll_to(index)
+        elif index >= self.first + self.visible:
+            self.scroll_to(index - self.visible + 1)
+
+    def yview(self, *args):
+        """Scrollbar command: ``moveto fraction`` or ``scroll n units|pages``"""
+        if not args:
+            return self.fractions()
+        if args[0] == "moveto":
+            self.scroll_to(int(float(args[1]) * len(self.rows)))
+        elif args[0] == "scroll":
+            step = self.visible if args[2] == "pages" else 1
+            self.scroll_to(self.first + int(args[1]) * step)
+
+    def on_wheel(self, event):
+        if getattr(event, "num", None) == 4:
+            units = -3
+        elif getattr(event, "num", None) == 5:
+            units = 3
+        else:
+            # Windows reports multiples of 120, macOS small deltas
+            units = -event.delta // 120 * 3 if abs(event.delta) >= 120 else -event.delta
+        self.scroll_to(self.first + units)
+        return "break"
+
+    def on_key(self, event):
+        """Move the focus and selection by a row or a page"""
+        step = {"Up": -1, "Down": 1, "Prior": -self.visible, "Next": self.visible}.get(event.keysym)
+        if step is None or not self.rows:
+            return None
+        focus = self.tree.focus()
+        if focus in self.sync:
+            index = self.window()[0] + self.sync.order.index(focus) + step
+        else:
+            index = self.first
+        index = max(0, min(len(self.rows) - 1, index))
+        self.see(index)
+        iid = self.render(self.rows[index])[0]
+        self.selected = {iid}
+        self.tree.focus(iid)
+        self.tree.selection_set([iid])
+        return "break"
+
+    def on_tree_scroll(self, top, _bottom):
+        """``yscrollcommand`` of the tree: follow scrolling the tree did on its own"""
+        start, end = self.window()
+        if end <= start:
+            return
+        first = self.clamp(start + round(float(top) * (end - start)))
+        if first != self.first:
+            self.first = first
+            self.refresh()
+
+    def on_resize(self, event):
+        visible = max(1, event.height // self.row_height)
+        if visible != self.visible:
+            self.visible = visible
+            self.first = self.clamp(self.first)
+            self.refresh()
+
+    def on_select(self, event=None):
+        current = set(self.tree.selection())
+        if current - self.selected:
+            # The user picked something new
+            self.selected = current
+        else:
+            # Rows left the window; the tree only knows the materialized ones
+            self.selected = {iid for iid in self.selected if iid not in self.sync} | current
+
+    def restore_selection(self):
+        shown = [iid for iid in self.selected if iid in self.sync]
+        if hasattr(self.tree, "selection_set") and set(self.tree.selection()) != set(shown):
+            self.tree.selection_set(shown)
+
+    def selection(self):
+        """Item ids of the selected rows, including ones scrolled out of the window.
+
+        Numeric ids (device addresses) are sorted as numbers.
+        """
+        return sorted(self.selected, key=lambda iid: (0, int(iid), "") if iid.isdigit() else (1, 0, iid))
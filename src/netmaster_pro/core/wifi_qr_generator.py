@@ -8,12 +8,17 @@ import threading
 import sys
 import os
 
+from netmaster_pro.core.ui_dispatch import UiDispatcher
+from netmaster_pro.core.wifi_search import NetworkListFilter
+
 class WiFiQRGenerator:
     def __init__(self, root, on_back=None):
         self.root = root
         self.on_back = on_back
         self.loader = None
         self.qr_photo = None
+        self.search_after = None
+        self.search_delay = 150
         
         # Clear existing widgets
         for widget in root.winfo_children():
@@ -35,6 +40,12 @@ class WiFiQRGenerator:
         self.selected_network = None
         self.all_networks = []
         
+        # Worker threads hand their results to the main loop through here
+        self.dispatcher = UiDispatcher(self.main_container)
+        self.dispatcher.start()
+        # Leaving the screen any way, not only through Back, ends pending work
+        self.main_container.bind("<Destroy>", self.on_destroy, add="+")
+        
         # Initial network refresh
         self.refresh_networks_threaded()
         
@@ -91,7 +102,7 @@ class WiFiQRGenerator:
         )
     
     def create_layout(self):
-        main_container = tk.Frame(self.root, bg='#1a1a1a')
+        main_container = self.main_container = tk.Frame(self.root, bg='#1a1a1a')
         main_container.pack(fill=tk.BOTH, expand=True, padx=20, pady=20)
         
         self.create_header(main_container)
@@ -112,7 +123,7 @@ class WiFiQRGenerator:
                 header_frame,
                 text="← Back to Menu",
                 style="Modern.TButton",
-                command=self.on_back
+                command=self.go_back
             )
             back_btn.pack(side=tk.LEFT, pady=15)
         
@@ -277,6 +288,8 @@ class WiFiQRGenerator:
         self.tree.column('Signal', width=80, minwidth=60)
         self.tree.column('Status', width=120, minwidth=100)
         
+        self.network_filter = NetworkListFilter(self.tree, self.network_row)
+        
         self.tree.bind('<<TreeviewSelect>>', self.on_network_select)
         self.tree.bind('<Double-1>', self.on_double_click)
     
@@ -458,10 +471,11 @@ class WiFiQRGenerator:
             return networks
             
         except subprocess.TimeoutExpired:
-            messagebox.showerror("Timeout", "Network scan timed out. Please try again.")
+            # Runs on a worker thread; dialogs belong to the main loop
+            self.dispatcher.post(messagebox.showerror, "Timeout", "Network scan timed out. Please try again.")
             return []
         except Exception as e:
-            messagebox.showerror("Error", f"Failed to get WiFi networks: {str(e)}")
+            self.dispatcher.post(messagebox.showerror, "Error", f"Failed to get WiFi networks: {str(e)}")
             return []
     
     def show_loader(self):
@@ -498,14 +512,12 @@ class WiFiQRGenerator:
             self.loader.destroy()
             self.loader = None
     
-    def refresh_networks(self):
-        """Refresh the list of WiFi networks"""
-        self.status_label.config(text="Scanning...", fg='#ffc107')
-        
-        # Get networks (Windows only)
-        networks = self.get_wifi_networks_windows()
-        
+    def refresh_networks(self, networks):
+        """Show a freshly read list of WiFi networks; runs on the main thread"""
+        self.hide_loader()
         self.all_networks = networks
+        # Rows and search keys are built once per refresh
+        self.network_filter.load(networks)
         self.apply_filters()
         
         count = len(networks)
@@ -515,63 +527,66 @@ class WiFiQRGenerator:
         )
     
     def refresh_networks_threaded(self):
-        """Refresh networks in a separate thread"""
+        """Read networks on a worker thread and show them from the main loop"""
+        self.show_loader()
+        self.status_label.config(text="Scanning...", fg='#ffc107')
+        
         def refresh():
+            networks = []
             try:
-                self.show_loader()
-                self.refresh_networks()
+                # Get networks (Windows only)
+                networks = self.get_wifi_networks_windows()
             finally:
-                self.hide_loader()
+                self.dispatcher.post(self.refresh_networks, networks, key="networks")
         
         thread = threading.Thread(target=refresh, daemon=True)
         thread.start()
     
     def apply_filters(self):
         """Apply search and filter criteria to network list"""
-        # Clear existing items
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-        
-        if not hasattr(self, 'all_networks') or not self.all_networks:
-            return
-        
-        search_term = self.search_var.get().lower() if hasattr(self, 'search_var') else ""
+        self.search_after = None
+        search_term = self.search_var.get() if hasattr(self, 'search_var') else ""
         show_connected = self.show_connected_var.get() if hasattr(self, 'show_connected_var') else True
         show_saved = self.show_saved_var.get() if hasattr(self, 'show_saved_var') else True
         
-        # Filter networks
-        filtered_networks = []
-        for network in self.all_networks:
-            # Search filter
-            if search_term and search_term not in network['ssid'].lower():
-                continue
-            
-            # Type filters
-            if network['is_connected'] and not show_connected:
-                continue
-            if not network['is_connected'] and network['is_saved'] and not show_saved:
-                continue
-            
-            filtered_networks.append(network)
+        # Only rows whose visibility changes are detached or moved back
+        self.network_filter.filter(search_term, show_connected, show_saved)
+    
+    def network_row(self, network):
+        """Return the Treeview ``(text, values)`` of a network"""
+        status_icon = "🔗" if network['is_connected'] else "💾"
+        display_status = f"{status_icon} {network['status']}"
         
-        # Sort: connected first, then alphabetically
-        filtered_networks.sort(key=lambda x: (not x['is_connected'], x['ssid'].lower()))
+        security_icon = "🔒" if network['security'] != "Open" else "🔓"
+        display_security = f"{security_icon} {network['security']}"
         
-        # Add to tree
-        for network in filtered_networks:
-            status_icon = "🔗" if network['is_connected'] else "💾"
-            display_status = f"{status_icon} {network['status']}"
-            
-            security_icon = "🔒" if network['security'] != "Open" else "🔓"
-            display_security = f"{security_icon} {network['security']}"
-            
-            self.tree.insert('', tk.END,
-                           text=network['ssid'],
-                           values=(display_security, network['signal'], display_status))
+        return network['ssid'], (display_security, network['signal'], display_status)
     
     def on_search_change(self, *args):
-        """Handle search input changes"""
-        self.apply_filters()
+        """Handle search input changes, once typing pauses"""
+        if self.search_after is not None:
+            self.root.after_cancel(self.search_after)
+        self.search_after = self.root.after(self.search_delay, self.apply_filters)
+    
+    def cancel_search(self):
+        """Drop a debounced search that has not run yet"""
+        if self.search_after is not None:
+            try:
+                self.root.after_cancel(self.search_after)
+            except tk.TclError:
+                pass  # The root is already gone
+            self.search_after = None
+    
+    def on_destroy(self, event):
+        if event.widget is self.main_container:
+            self.cancel_search()
+            self.dispatcher.stop()
+    
+    def go_back(self):
+        """Stop pending UI work and return to the main menu"""
+        self.cancel_search()
+        self.dispatcher.stop()
+        self.on_back()
     
     def clear_search(self):
         """Clear search input"""
@@ -583,15 +598,8 @@ class WiFiQRGenerator:
         if not selection:
             return
         
-        item = self.tree.item(selection[0])
-        ssid = item['text']
-        
-        # Find the network data
-        network_data = None
-        for network in self.all_networks:
-            if network['ssid'] == ssid:
-                network_data = network
-                break
+        network_data = self.network_filter.network(selection[0])
+        ssid = network_data['ssid']
         
         if network_data:
             self.selected_network = network_data
@@ -0,0 +1,94 @@
+"""
+Indexed search over the saved WiFi network list.
+
+Each refresh inserts every network into the Treeview once, in display
+order, with its lowercase search key computed alongside. Filtering then
+only detaches the rows that stop matching and moves back the ones that
+match again, so a keystroke touches the rows whose visibility changed
+rather than rebuilding the list. A query that contains the previous one
+can only narrow the result, so it is matched against the previous matches
+instead of every network.
+"""
+
+
+class NetworkListFilter:
+    """Filter the rows of a WiFi network Treeview by SSID and type.
+
+    ``tree`` needs the ``insert``, ``delete``, ``detach`` and ``move``
+    methods of ``ttk.Treeview``; ``render(network)`` returns the row's
+    ``(text, values)``. Item ids are positions in display order.
+    """
+
+    def __init__(self, tree, render):
+        self.tree = tree
+        self.render = render
+        self.networks = []
+        self.keys = []
+        self.visible = []
+        self.query = ""
+        self.types = (True, True)
+
+    def load(self, networks):
+        """Replace the rows with ``networks``: connected first, then by SSID"""
+        if self.networks:
+            self.tree.delete(*[str(i) for i in range(len(self.networks))])
+        keyed = sorted(((network['ssid'].lower(), network) for network in networks),
+                       key=lambda entry: (not entry[1]['is_connected'], entry[0]))
+        self.keys = [key for key, _network in keyed]
+        self.networks = [network for _key, network in keyed]
+        for index, network in enumerate(self.networks):
+            text, values = self.render(network)
+            self.tree.insert('', 'end', iid=str(index), text=text, values=values)
+        self.visible = list(range(len(self.networks)))
+        self.query = ""
+        self.types = (True, True)
+
+    def network(self, iid):
+        """Return the network shown by item ``iid``"""
+        return self.networks[int(iid)]
+
+    def matches(self, query, show_connected=True, show_saved=True):
+        """Return the display positions of the networks that pass the filters"""
+        query = query.lower()
+        types = (show_connected, show_saved)
+        if types == self.types and self.query in query:
+            # A longer query only removes matches
+            candidates = self.visible
+        else:
+            candidates = range(len(self.networks))
+
+        keys = self.keys
+        networks = self.networks
+        result = []
+        for index in candidates:
+            if query and query not in keys[index]:
+                continue
+            connected = networks[index]['is_connected']
+            if connected and not show_connected:
+                continue
+            if not connected and networks[index]['is_saved'] and not show_saved:
+                continue
+            result.append(index)
+        return result
+
+    def filter(self, query, show_connected=True, show_saved=True):
+        """Show only matching rows; returns ``(shown, hidden)`` row counts changed"""
+        visible = self.matches(query, show_connected, show_saved)
+        before = set(self.visible)
+        after = set(visible)
+
+        hidden = [str(index) for index in self.visible if index not in after]
+        if hidden:
+            self.tree.detach(*hidden)
+        shown = 0
+        if len(after) != len(before) - len(hidden):
+            # Reattach in display order; earlier rows are already in place
+            for position, index in enumerate(visible):
+                if index not in before:
+                    self.tree.move(str(index), '', position)
+                    shown += 1
+
+        self.visible = visible
+        self.query = query.lower()
+        self.types = (show_connected, show_saved)
+        return shown, len(hidden)
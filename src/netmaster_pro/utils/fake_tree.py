@@ -0,0 +1,95 @@
+"""
+Stand-in for the parts of ttk.Treeview and ttk.Scrollbar the list helpers use.
+
+Lets the tests and benchmarks drive the list helpers without a display.
+:class:`FakeTree` keeps the attached rows in display order, the text and
+values of every item (attached or detached), the selection and the focus,
+and counts the calls that change rows.
+"""
+
+import itertools
+
+
+class FakeTree:
+    """The slice of ttk.Treeview used by TreeviewSync, VirtualList and NetworkListFilter"""
+
+    def __init__(self):
+        self.children = []
+        self.items = {}
+        self.selected = ()
+        self.focused = ""
+        self.top = 0.0
+        self.calls = 0
+        self.peak = 0
+        self._ids = itertools.count(1)
+
+    def insert(self, parent, index, iid=None, text="", values=()):
+        self.calls += 1
+        if iid is None:
+            iid = f"I{next(self._ids):03X}"
+        self.items[iid] = (text, tuple(values))
+        self.children.insert(len(self.children) if index == "end" else index, iid)
+        self.peak = max(self.peak, len(self.items))
+        return iid
+
+    def delete(self, *iids):
+        self.calls += 1
+        for iid in iids:
+            del self.items[iid]
+        self._drop(iids)
+        gone = set(iids)
+        self.selected = tuple(iid for iid in self.selected if iid not in gone)
+
+    def detach(self, *iids):
+        self.calls += 1
+        self._drop(iids)
+
+    def move(self, iid, parent, index):
+        self.calls += 1
+        if iid in self.children:
+            self.children.remove(iid)
+        self.children.insert(index, iid)
+
+    def item(self, iid, values=()):
+        self.calls += 1
+        self.items[iid] = (self.items[iid][0], tuple(values))
+
+    def get_children(self):
+        return tuple(self.children)
+
+    def values(self, iid):
+        return self.items[iid][1]
+
+    def shown(self):
+        """Text of the attached rows, in display order"""
+        return [self.items[iid][0] for iid in self.children]
+
+    def yview_moveto(self, fraction):
+        self.top = fraction
+
+    def selection(self):
+        return self.selected
+
+    def selection_set(self, iids):
+        self.selected = tuple(iids)
+
+    def focus(self, iid=None):
+        if iid is None:
+            return self.focused
+        self.focused = iid
+
+    def _drop(self, iids):
+        if len(iids) == 1:
+            if iids[0] in self.children:
+                self.children.remove(iids[0])
+        else:
+            gone = set(iids)
+            self.children = [iid for iid in self.children if iid not in gone]
+
+
+class FakeScrollbar:
+    def __init__(self):
+        self.view = (0.0, 1.0)
+
+    def set(self, first, last):
+        self.view = (first, last)
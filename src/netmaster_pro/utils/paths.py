@@ -0,0 +1,15 @@
+"""
+Per-user file locations for NetMaster Pro.
+"""
+
+import os
+import sys
+
+
+def data_dir():
+    """Per-user directory for NetMaster Pro's data files"""
+    if sys.platform == "win32":
+        base = os.environ.get("APPDATA") or os.path.expanduser("~")
+        return os.path.join(base, "NetMaster Pro")
+    base = os.environ.get("XDG_DATA_HOME") or os.path.join(os.path.expanduser("~"), ".local", "share")
+    return os.path.join(base, "netmaster-pro")
@@ -0,0 +1,186 @@
+"""
+Tests for the AF_PACKET ARP sweep engine
+"""
+import sys
+import os
+import shutil
+import subprocess
+import asyncio
+import socket
+import struct
+import threading
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from netmaster_pro.core import arp_sweep
+from netmaster_pro.core.arp_sweep import (
+    ARP_REPLY, ArpProbeStage, ArpSocket, build_arp_request, mac_to_bytes, mac_to_str,
+    parse_arp_reply
+)
+
+OWN_MAC = mac_to_bytes("02:00:00:00:00:01")
+PEER_MAC = mac_to_bytes("aa:bb:cc:dd:ee:ff")
+
+
+def make_reply(sender_mac, sender_ip, target_mac, target_ip):
+    frame = bytearray(build_arp_request(sender_mac, sender_ip, target_ip))
+    frame[0:6] = target_mac
+    struct.pack_into("!H", frame, 20, ARP_REPLY)
+    frame[32:38] = target_mac
+    return bytes(frame)
+
+
+def test_build_arp_request_layout():
+    frame = build_arp_request(OWN_MAC, "10.0.0.1", "10.0.0.7")
+    assert len(frame) == 42
+    assert frame[0:6] == b"\xff" * 6
+    assert frame[6:12] == OWN_MAC
+    assert frame[12:14] == b"\x08\x06"
+    assert frame[38:42] == bytes([10, 0, 0, 7])
+
+
+def test_parse_arp_reply():
+    frame = make_reply(PEER_MAC, "10.0.0.7", OWN_MAC, "10.0.0.1")
+    assert parse_arp_reply(frame, OWN_MAC) == ("10.0.0.7", "aa:bb:cc:dd:ee:ff")
+    assert parse_arp_reply(frame + b"\x00" * 18, OWN_MAC) == ("10.0.0.7", "aa:bb:cc:dd:ee:ff")
+
+
+def test_parse_arp_reply_rejects_requests_and_foreign_replies():
+    assert parse_arp_reply(build_arp_request(PEER_MAC, "10.0.0.7", "10.0.0.1"), OWN_MAC) is None
+    other = make_reply(PEER_MAC, "10.0.0.7", mac_to_bytes("02:00:00:00:00:02"), "10.0.0.2")
+    assert parse_arp_reply(other, OWN_MAC) is None
+    assert parse_arp_reply(other) == ("10.0.0.7", "aa:bb:cc:dd:ee:ff")
+    assert parse_arp_reply(b"\x00" * 20) is None
+
+
+def test_mac_round_trip():
+    assert mac_to_str(mac_to_bytes("AA-BB-CC-00-11-22")) == "aa:bb:cc:00:11:22"
+
+
+class LoopbackSocket(socket.socket):
+    """Datagram socket that answers the who-has frames sent on it for ``alive``.
+
+    The first ``full`` sends fail as if the transmit queue were full.
+    """
+
+    def __init__(self, alive, full=0):
+        ours, self.peer = socket.socketpair(socket.AF_UNIX, socket.SOCK_DGRAM)
+        super().__init__(fileno=ours.detach())
+        self.setblocking(False)
+        self.alive = alive
+        self.full = full
+        self.sent = []
+
+    def send(self, frame):
+        if self.full:
+            self.full -= 1
+            raise BlockingIOError
+        target = socket.inet_ntoa(frame[38:42])
+        self.sent.append((time.monotonic(), target))
+        if target in self.alive:
+            self.peer.send(make_reply(self.alive[target], target, OWN_MAC, "10.0.0.1"))
+        return len(frame)
+
+    def close(self):
+        self.peer.close()
+        super().close()
+
+
+def make_stage(monkeypatch, sock, **kwargs):
+    def fake_init(arp, interface, source_ip=None):
+        arp.interface, arp.mac, arp.source_ip, arp.sock = interface, OWN_MAC, "10.0.0.1", sock
+    monkeypatch.setattr(ArpSocket, "__init__", fake_init)
+    return ArpProbeStage("eth0", **kwargs)
+
+
+def test_probe_stage_paces_requests_and_retries_a_full_queue(monkeypatch):
+    sock = LoopbackSocket({"10.0.0.7": PEER_MAC}, full=3)
+    replies = []
+    stage = make_stage(monkeypatch, sock, timeout=0.5, rate=200,
+                       on_reply=lambda ip, mac: replies.append((ip, mac)))
+
+    async def sweep():
+        return await asyncio.gather(*[stage.probe(f"10.0.0.{host}") for host in range(2, 12)])
+
+    results = asyncio.run(sweep())
+    stage.close()
+    assert [host for host, rtt in zip(range(2, 12), results) if rtt is not None] == [7]
+    assert replies == [("10.0.0.7", "aa:bb:cc:dd:ee:ff")]
+    # Every request went out despite the full queue, no faster than the rate
+    assert sorted(target for _sent, target in sock.sent) == sorted(f"10.0.0.{host}" for host in range(2, 12))
+    assert sock.sent[-1][0] - sock.sent[0][0] >= 9 / 200 * 0.9
+
+
+def test_probe_stage_gives_up_when_the_queue_stays_full(monkeypatch):
+    sock = LoopbackSocket({"10.0.0.7": PEER_MAC}, full=10 ** 6)
+    stage = make_stage(monkeypatch, sock, timeout=0.1)
+    assert asyncio.run(stage.probe("10.0.0.7")) is None
+    stage.close()
+
+
+def test_probe_stage_refuses_a_loop_running_in_another_thread(monkeypatch):
+    sock = LoopbackSocket({"10.0.0.7": PEER_MAC})
+    stage = make_stage(monkeypatch, sock, timeout=0.2)
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever)
+    thread.start()
+    try:
+        assert asyncio.run_coroutine_threadsafe(stage.probe("10.0.0.7"), loop).result() is not None
+        with pytest.raises(RuntimeError):
+            stage.probe_sync("10.0.0.7")
+    finally:
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
+    assert stage.probe_sync("10.0.0.7") is not None
+    stage.close()
+
+
+def test_receive_stops_on_socket_errors(monkeypatch):
+    class DownSocket:
+        def recv(self, size):
+            raise OSError(100, "Network is down")
+
+    arp = ArpSocket.__new__(ArpSocket)
+    arp.sock, arp.mac = DownSocket(), OWN_MAC
+    assert list(arp.receive()) == []
+
+
+def _ip(*args):
+    subprocess.run(["ip", *args], check=True, capture_output=True)
+
+
+@pytest.mark.integration
+@pytest.mark.skipif(not hasattr(os, "geteuid") or os.geteuid() != 0 or not shutil.which("ip"),
+                    reason="needs root and iproute2")
+def test_probe_stage_finds_host_in_network_namespace():
+    namespace, host_if, peer_if = "nmtest-arps", "nmarps0", "nmarps1"
+    try:
+        _ip("netns", "add", namespace)
+        _ip("link", "add", host_if, "type", "veth", "peer", "name", peer_if)
+        _ip("link", "set", peer_if, "netns", namespace)
+        _ip("addr", "add", "10.98.0.1/24", "dev", host_if)
+        _ip("link", "set", host_if, "up")
+        _ip("-n", namespace, "addr", "add", "10.98.0.2/24", "dev", peer_if)
+        _ip("-n", namespace, "link", "set", peer_if, "up")
+    except (subprocess.CalledProcessError, OSError) as e:
+        _ip_cleanup(namespace, host_if)
+        pytest.skip(f"cannot create veth/netns: {e}")
+
+    try:
+        stage = ArpProbeStage(host_if, timeout=1.0, rate=100)
+        try:
+            assert stage.probe_sync("10.98.0.2") is not None
+            assert stage.probe_sync("10.98.0.3") is None
+        finally:
+            stage.close()
+    finally:
+        _ip_cleanup(namespace, host_if)
+
+
+def _ip_cleanup(namespace, host_if):
+    subprocess.run(["ip", "link", "del", host_if], capture_output=True)
+    subprocess.run(["ip", "netns", "del", namespace], capture_output=True)
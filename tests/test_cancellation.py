@@ -0,0 +1,141 @@
+"""
+Tests for cooperative cancellation and stop latency under load
+"""
+import asyncio
+import sys
+import os
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from netmaster_pro.core.cancellation import CancellationToken
+from netmaster_pro.core.discovery import DiscoveryService
+from netmaster_pro.core.scan_engine import ScanEngine, ProbeStage, SubprocessPingStage
+
+# Stop must take effect within ~50 ms; stops measure a few milliseconds
+STOP_BUDGET = 0.05
+
+
+class SlowNetworkProbe(ProbeStage):
+    """Simulated network where every host takes seconds to answer"""
+
+    def __init__(self, delay=2.0):
+        self.delay = delay
+        self.started = threading.Event()
+        self.in_flight = 0
+
+    async def probe(self, ip):
+        self.in_flight += 1
+        self.started.set()
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.in_flight -= 1
+        return None
+
+
+class SleepCommandStage(SubprocessPingStage):
+    """Subprocess probe whose command never finishes on its own"""
+
+    def command(self, ip):
+        return ['sleep', '5']
+
+
+def child_pids():
+    """PIDs of this process's children, read from /proc"""
+    pids = []
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/stat') as f:
+                fields = f.read().rsplit(')', 1)[1].split()
+        except OSError:
+            continue
+        if int(fields[1]) == os.getpid():
+            pids.append(int(entry))
+    return pids
+
+
+def cancel_after(token, delay):
+    """Cancel ``token`` from another thread and return the cancel time holder"""
+    cancelled_at = []
+
+    def cancel():
+        time.sleep(delay)
+        cancelled_at.append(time.monotonic())
+        token.cancel()
+
+    threading.Thread(target=cancel, daemon=True).start()
+    return cancelled_at
+
+
+def test_token_runs_callbacks_once_and_wakes_waiters():
+    token = CancellationToken()
+    calls = []
+    token.add_callback(lambda: calls.append("a"))
+    removed = token.add_callback(lambda: calls.append("b"))
+    token.remove_callback(removed)
+    assert token.wait(0.01) is False
+
+    cancel_after(token, 0.05)
+    assert token.wait(2.0) is True
+    token.cancel()
+    assert token.cancelled
+    assert calls == ["a"]
+
+    # Late registrations run immediately
+    token.add_callback(lambda: calls.append("late"))
+    assert calls == ["a", "late"]
+
+
+def test_engine_stops_within_budget_under_load():
+    probe = SlowNetworkProbe(delay=2.0)
+    engine = ScanEngine(probe, concurrency=64, deadline=30.0)
+    token = CancellationToken()
+    cancelled_at = cancel_after(token, 0.2)
+
+    stats = engine.run((f"10.{i // 65536}.{i // 256 % 256}.{i % 256}" for i in range(100000)), token=token)
+    latency = time.monotonic() - cancelled_at[0]
+
+    assert stats['cancelled']
+    assert not stats['timed_out']
+    assert stats['probed'] == 0
+    assert probe.in_flight == 0
+    assert latency < STOP_BUDGET
+
+
+def test_cancel_kills_probe_subprocesses():
+    engine = ScanEngine(SleepCommandStage(timeout=5.0), concurrency=8, deadline=30.0)
+    token = CancellationToken()
+    cancelled_at = cancel_after(token, 0.3)
+    # Earlier tests may leave helpers running (e.g. multiprocessing's resource tracker)
+    before = set(child_pids())
+    children = set()
+    token.add_callback(lambda: children.update(set(child_pids()) - before))
+
+    stats = engine.run([f"10.0.0.{i}" for i in range(1, 9)], token=token)
+    latency = time.monotonic() - cancelled_at[0]
+
+    assert stats['cancelled']
+    assert latency < STOP_BUDGET
+    assert len(children) == 8
+    assert not children & set(child_pids())
+
+
+def test_service_close_leaves_no_scan_threads():
+    probe = SlowNetworkProbe(delay=2.0)
+    service = DiscoveryService(network="10.20.0.0/20", probe_stage=probe, concurrency=64)
+    service.shard_workers = 1  # keep the sweep in this process
+    service.start()
+    assert probe.started.wait(5.0)
+    assert service.running
+
+    start = time.monotonic()
+    service.close()
+    elapsed = time.monotonic() - start
+
+    assert not service.running
+    assert elapsed < STOP_BUDGET
+    assert not any(t.name == "netmaster-scan" and t.is_alive() for t in threading.enumerate())
@@ -0,0 +1,67 @@
+"""
+Tests for the headless command line interface
+"""
+import sys
+import os
+import json
+import subprocess
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from netmaster_pro import cli
+
+SRC = os.path.join(os.path.dirname(__file__), '..', 'src')
+
+
+def test_headless_modules_do_not_import_gui_dependencies():
+    code = (
+        "import sys, netmaster_pro.cli, netmaster_pro.core.discovery; "
+        "print(','.join(m for m in ('tkinter', 'PIL', 'qrcode') if m in sys.modules))"
+    )
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True,
+                            env=dict(os.environ, PYTHONPATH=SRC), check=True)
+    assert result.stdout.strip() == ""
+
+
+def test_scan_streams_json_lines(tmp_path):
+    output = tmp_path / "scan.jsonl"
+    assert cli.main(["scan", "-n", "127.0.0.1/32", "--deadline", "5", "-o", str(output)]) == 0
+
+    records = [json.loads(line) for line in output.read_text().splitlines()]
+    types = [record["type"] for record in records]
+    assert types[0] == "start"
+    assert records[0]["network"] == "127.0.0.1/32"
+    assert "sweep" in types
+
+    joined = [r for r in records if r["type"] == "event" and r["event"] == "joined"]
+    assert [r["ip"] for r in joined] == ["127.0.0.1"]
+    # Lookup misses are not reported as hostname changes
+    resolved = [r for r in records if r["type"] == "event" and r["event"] == "hostname_resolved"]
+    assert all(r["current"] for r in resolved)
+    devices = [r for r in records if r["type"] == "device"]
+    assert [d["ip"] for d in devices] == ["127.0.0.1"]
+    assert set(devices[0]) == {"type", "ts"} | set(cli.DEVICE_FIELDS)
+
+
+def test_scan_warm_starts_from_inventory(tmp_path):
+    inventory = str(tmp_path / "inventory.db")
+    first = tmp_path / "first.jsonl"
+    second = tmp_path / "second.jsonl"
+    cli.main(["scan", "-n", "127.0.0.1/32", "--inventory", inventory, "-o", str(first)])
+    cli.main(["scan", "-n", "127.0.0.1/32", "--inventory", inventory, "-o", str(second)])
+
+    records = [json.loads(line) for line in second.read_text().splitlines()]
+    # The device is already known, so the second sweep reports no join
+    assert not [r for r in records if r["type"] == "event" and r["event"] == "joined"]
+    assert [r["ip"] for r in records if r["type"] == "device"] == ["127.0.0.1"]
+
+
+def test_network_and_gateway_are_rejected_for_several_interfaces(capsys):
+    for argv in (["scan", "-a", "-n", "10.0.0.0/24"],
+                 ["daemon", "-i", "eth0", "-i", "wlan0", "-g", "10.0.0.1"]):
+        with pytest.raises(SystemExit) as exit_info:
+            cli.main(argv)
+        assert exit_info.value.code == 2
+        assert "cannot be combined" in capsys.readouterr().err
@@ -0,0 +1,66 @@
+"""
+Tests for compact device records
+"""
+import sys
+import os
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from netmaster_pro.core.device import (
+    Device, ip_to_int, int_to_ip, mac_to_int, int_to_mac,
+    format_mac, format_hostname, format_vendor, format_bandwidth
+)
+
+
+def test_address_and_mac_round_trip():
+    assert ip_to_int("192.168.1.10") == 0xC0A8010A
+    assert int_to_ip(0xC0A8010A) == "192.168.1.10"
+    assert mac_to_int("AA-BB-CC-00-00-01") == 0xAABBCC000001
+    assert int_to_mac(0xAABBCC000001) == "aa:bb:cc:00:00:01"
+
+    device = Device("10.0.0.2", mac="AA:BB:CC:00:00:01")
+    assert device.address == ip_to_int("10.0.0.2")
+    assert device.ip == "10.0.0.2"
+    assert device.mac == "aa:bb:cc:00:00:01"
+    assert Device(device.address) == Device("10.0.0.2")
+
+
+def test_integer_keys_sort_numerically():
+    ips = ["10.0.0.10", "10.0.0.9", "10.0.1.1", "9.255.255.255"]
+    assert [int_to_ip(a) for a in sorted(map(ip_to_int, ips))] == [
+        "9.255.255.255", "10.0.0.9", "10.0.0.10", "10.0.1.1"
+    ]
+
+
+def test_formatting_is_left_to_the_view():
+    device = Device("10.0.0.2")
+    assert (format_mac(device), format_hostname(device), format_vendor(device)) == (
+        "Unknown", "Resolving...", "Unknown"
+    )
+    device.hostname = ""
+    assert format_hostname(device) == "Unknown"
+    device.bandwidth = 5 * 1024 + 100
+    assert format_bandwidth(device) == "5 KB/s"
+
+
+def test_records_use_far_less_memory_than_dicts():
+    def measure(build):
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        records = [build(i) for i in range(2000)]
+        used = tracemalloc.get_traced_memory()[0] - before
+        tracemalloc.stop()
+        assert len(records) == 2000
+        return used
+
+    def legacy(i):
+        return {'ip': f"10.0.{i >> 8}.{i & 255}", 'mac': f"aa:bb:cc:00:{i >> 8:02x}:{i & 255:02x}",
+                'hostname': "Unknown", 'vendor': "Unknown", 'status': "Active",
+                'bandwidth': "0 KB/s", 'last_seen': float(i), 'stale': False, 'interface': "eth0"}
+
+    def compact(i):
+        return Device(0x0A000000 + i, mac=0xAABBCC000000 + i, hostname="", interface="eth0",
+                      last_seen=float(i))
+
+    assert measure(compact) * 2 < measure(legacy)
@@ -0,0 +1,78 @@
+"""
+Tests for the asynchronous reverse-DNS resolver
+"""
+import sys
+import os
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from netmaster_pro.core.dns_resolver import ReverseResolver, TTLCache
+
+
+def test_ttl_cache_expiry_and_lru():
+    cache = TTLCache(max_entries=2)
+    cache.put("a", 1, ttl=10, now=0)
+    cache.put("b", 2, ttl=1, now=0)
+    assert cache.get("a", now=5) == (True, 1)
+    assert cache.get("b", now=5) == (False, None)
+
+    cache.put("c", 3, ttl=10, now=5)
+    cache.put("d", 4, ttl=10, now=5)
+    assert cache.get("a", now=6) == (False, None)
+    assert len(cache) == 2
+
+
+def test_resolve_is_non_blocking_and_cached():
+    names = {"10.0.0.1": "router.lan"}
+    calls = []
+
+    def lookup(ip):
+        calls.append(ip)
+        time.sleep(0.05)
+        return names.get(ip)
+
+    resolver = ReverseResolver(lookup=lookup, timeout=1.0)
+    done = threading.Event()
+    results = {}
+
+    def callback(ip, hostname):
+        results[ip] = hostname
+        if len(results) == 2:
+            done.set()
+
+    start = time.monotonic()
+    assert resolver.resolve("10.0.0.1", callback) is None
+    assert resolver.resolve("10.0.0.2", callback) is None
+    assert time.monotonic() - start < 0.05
+    assert done.wait(2)
+
+    assert results == {"10.0.0.1": "router.lan", "10.0.0.2": None}
+    assert resolver.resolve("10.0.0.1") == "router.lan"
+    assert resolver.cached("10.0.0.2") == (True, None)
+    assert sorted(calls) == ["10.0.0.1", "10.0.0.2"]
+    resolver.close()
+
+
+def test_slow_lookup_times_out_and_late_answer_is_cached():
+    release = threading.Event()
+
+    def lookup(ip):
+        release.wait(2)
+        return "late.lan"
+
+    resolver = ReverseResolver(lookup=lookup, timeout=0.1)
+    done = threading.Event()
+    results = []
+    resolver.resolve("10.0.0.5", lambda ip, hostname: (results.append(hostname), done.set()))
+
+    assert done.wait(1)
+    assert results == [None]
+
+    release.set()
+    deadline = time.monotonic() + 1
+    while resolver.cached("10.0.0.5") != (True, "late.lan") and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert resolver.cached("10.0.0.5") == (True, "late.lan")
+    resolver.close()
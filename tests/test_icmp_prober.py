@@ -0,0 +1,122 @@
+"""
+Tests for the in-process ICMP prober
+"""
+import asyncio
+import sys
+import os
+import threading
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from netmaster_pro.core.icmp_prober import (
+    IcmpProber, IcmpProbeStage, build_echo_request, checksum, parse_echo_reply
+)
+from netmaster_pro.core.scan_engine import ScanEngine
+
+
+def test_echo_request_checksum_verifies():
+    packet = build_echo_request(0x1234, 7)
+    assert checksum(packet) == 0
+
+
+def test_parse_echo_reply_matches_identifier_and_sequence():
+    request = bytearray(build_echo_request(0xBEEF, 42))
+    request[0] = 0  # turn it into an echo reply
+    assert parse_echo_reply(bytes(request)) == (0xBEEF, 42)
+
+    ip_header = bytes([0x45]) + bytes(19)
+    assert parse_echo_reply(ip_header + bytes(request), has_ip_header=True) == (0xBEEF, 42)
+
+
+def test_parse_echo_reply_ignores_requests():
+    assert parse_echo_reply(build_echo_request(1, 1)) is None
+
+
+def open_prober():
+    try:
+        return IcmpProber(timeout=1.0)
+    except OSError as e:
+        pytest.skip(f"ICMP sockets not permitted here: {e}")
+
+
+def test_ping_many_loopback():
+    prober = open_prober()
+    try:
+        results = prober.ping_many(["127.0.0.1", "127.0.0.1"])
+    finally:
+        prober.close()
+    assert "127.0.0.1" in results
+    assert results["127.0.0.1"] >= 0
+
+
+def test_probe_stage_in_engine():
+    open_prober().close()
+    stage = IcmpProbeStage(timeout=0.5)
+    found = []
+    engine = ScanEngine(stage, concurrency=8)
+    engine.run(["127.0.0.1", "127.0.0.2"], on_result=lambda ip, rtt, info: found.append(ip))
+    engine.run(["127.0.0.1"], on_result=lambda ip, rtt, info: found.append(ip))
+    engine.close()
+    assert found.count("127.0.0.1") == 2
+
+
+def test_probe_stage_refuses_a_loop_running_in_another_thread():
+    open_prober().close()
+    stage = IcmpProbeStage(timeout=0.5)
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever)
+    thread.start()
+    try:
+        assert asyncio.run_coroutine_threadsafe(stage.probe("127.0.0.1"), loop).result() is not None
+        with pytest.raises(RuntimeError):
+            stage.probe_sync("127.0.0.1")
+    finally:
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
+    # Once that loop has finished the next one takes the socket over
+    assert stage.probe_sync("127.0.0.1") is not None
+    stage.close()
+
+
+def test_full_socket_buffer_does_not_block_the_loop():
+    open_prober().close()
+    stage = IcmpProbeStage(timeout=0.3)
+    send_nowait = stage.prober.send_nowait
+    refusals = [5]
+
+    def full_then_send(ip, sequence):
+        if refusals[0] > 0:
+            refusals[0] -= 1
+            raise BlockingIOError
+        return send_nowait(ip, sequence)
+
+    stage.prober.send_nowait = full_then_send
+
+    async def probe_with_ticker():
+        gaps = []
+
+        async def ticker():
+            last = time.monotonic()
+            while True:
+                await asyncio.sleep(0.005)
+                now = time.monotonic()
+                gaps.append(now - last)
+                last = now
+
+        task = asyncio.ensure_future(ticker())
+        rtt = await stage.probe("127.0.0.1")
+        task.cancel()
+        return rtt, max(gaps)
+
+    rtt, gap = asyncio.run(probe_with_ticker())
+    assert rtt is not None and gap < 0.1
+
+    # A buffer that stays full gives up at the timeout, still without blocking
+    refusals[0] = float("inf")
+    rtt, gap = asyncio.run(probe_with_ticker())
+    assert rtt is None and gap < 0.1
+    stage.close()
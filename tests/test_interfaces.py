@@ -0,0 +1,134 @@
+"""
+Tests for interface and route discovery, using recorded routing tables
+"""
+import ipaddress
+import struct
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from netmaster_pro.core import discovery
+from netmaster_pro.core.interfaces import (
+    Interface, InterfaceMonitor, list_interfaces, parse_routes, parse_route_messages
+)
+from netmaster_pro.core.scan_engine import ProbeStage
+
+# Multi-homed host: default route via wlan0 (metric 600) and eth0 (metric 100)
+PROC_NET_ROUTE = """\
+Iface\tDestination\tGateway \tFlags\tRefCnt\tUse\tMetric\tMask\t\tMTU\tWindow\tIRTT
+wlan0\t00000000\t0102A8C0\t0003\t0\t0\t600\t00000000\t0\t0\t0
+eth0\t00000000\t0100000A\t0003\t0\t0\t100\t00000000\t0\t0\t0
+eth0\t0000000A\t00000000\t0001\t0\t0\t100\t0000FFFF\t0\t0\t0
+wlan0\t0002A8C0\t00000000\t0001\t0\t0\t600\t00FFFFFF\t0\t0\t0
+"""
+
+ADDRESSES = {
+    "wlan0": [("192.168.2.50", "255.255.255.0")],
+    "eth0": [("10.0.3.7", "255.255.0.0")],
+    "docker0": [("172.17.0.1", "255.255.0.0")],
+}
+
+
+def netlink_message(msg_type):
+    return struct.pack("=IHHII", 16, msg_type, 0, 0, 0)
+
+
+class SilentProbe(ProbeStage):
+    async def probe(self, ip):
+        return None
+
+
+def test_parse_routes():
+    routes = parse_routes(PROC_NET_ROUTE)
+    assert len(routes) == 4
+    default = routes[1]
+    assert default.interface == "eth0"
+    assert default.destination == "0.0.0.0"
+    assert default.gateway == "10.0.0.1"
+    assert default.metric == 100
+    assert routes[2].destination == "10.0.0.0"
+    assert routes[2].mask == "255.255.0.0"
+
+
+def test_interfaces_use_real_prefix_and_lowest_metric_default():
+    interfaces = list_interfaces(ADDRESSES, parse_routes(PROC_NET_ROUTE))
+    assert [i.name for i in interfaces] == ["eth0", "docker0", "wlan0"]
+
+    eth0, docker0, wlan0 = interfaces
+    assert eth0.default and not wlan0.default
+    assert eth0.network == ipaddress.IPv4Network("10.0.0.0/16")
+    assert eth0.gateway == "10.0.0.1"
+    assert wlan0.gateway == "192.168.2.1"
+    assert docker0.gateway is None
+
+
+def test_live_interfaces_exclude_loopback():
+    for interface in list_interfaces():
+        assert not interface.network.is_loopback
+
+
+def test_route_messages_collapse_to_one_refresh():
+    datagram = netlink_message(20) + netlink_message(24) + netlink_message(3)
+    assert parse_route_messages(datagram) == ["newaddr"]
+    assert parse_route_messages(netlink_message(28)) == []
+
+
+def test_monitor_caches_and_notifies_only_on_change():
+    snapshots = [[Interface("eth0", "10.0.3.7", ipaddress.IPv4Network("10.0.0.0/16"), None, True)]]
+    calls = []
+    monitor = InterfaceMonitor(on_change=calls.append, lister=lambda: list(snapshots[-1]))
+
+    assert monitor.interfaces() is monitor.interfaces()
+    monitor.watcher.feed(netlink_message(24))
+    assert calls == []
+
+    snapshots.append([Interface("eth0", "10.1.0.9", ipaddress.IPv4Network("10.1.0.0/24"), None, True)])
+    monitor.watcher.feed(netlink_message(20))
+    assert len(calls) == 1
+    assert calls[0][0].ip == "10.1.0.9"
+    assert monitor.find(network=ipaddress.IPv4Network("10.1.0.0/28")).name == "eth0"
+
+
+def test_service_targets_and_follows_the_default_interface(monkeypatch):
+    first = list_interfaces(ADDRESSES, parse_routes(PROC_NET_ROUTE))
+    monitor = InterfaceMonitor(lister=lambda: first)
+    monkeypatch.setattr(discovery, "default_monitor", lambda: monitor)
+
+    service = discovery.DiscoveryService(probe_stage=SilentProbe())
+    assert service.interface == "eth0"
+    assert service.local_ip == "10.0.3.7"
+    assert service.gateway == "10.0.0.1"
+    assert service.network == ipaddress.IPv4Network("10.0.0.0/16")
+
+    pinned = discovery.DiscoveryService(network="192.168.2.0/25", probe_stage=SilentProbe())
+    assert pinned.interface == "wlan0"
+    assert pinned.network == ipaddress.IPv4Network("192.168.2.0/25")
+
+    # eth0 is unplugged; the next sweep moves to wlan0
+    addresses = {name: entries for name, entries in ADDRESSES.items() if name != "eth0"}
+    routes = [route for route in parse_routes(PROC_NET_ROUTE) if route.interface != "eth0"]
+    service.on_interfaces_changed(list_interfaces(addresses, routes))
+    # The move only happens between sweeps
+    assert service.network == ipaddress.IPv4Network("10.0.0.0/16")
+    service.apply_pending_interface()
+    assert service.interface == "wlan0"
+    assert service.gateway == "192.168.2.1"
+    assert service.scan_planner.network == ipaddress.IPv4Network("192.168.2.0/24")
+
+    service.close()
+    pinned.close()
+
+
+def test_link_layer_probes_are_only_used_on_link(monkeypatch):
+    monitor = InterfaceMonitor(lister=lambda: list_interfaces(ADDRESSES, parse_routes(PROC_NET_ROUTE)))
+    monkeypatch.setattr(discovery, "default_monitor", lambda: monitor)
+
+    on_link = discovery.DiscoveryService(network="192.168.2.0/25", probe_stage=SilentProbe())
+    assert on_link.on_link()
+    # A routed range behind the default interface
+    routed = discovery.DiscoveryService(network="10.80.0.0/24", interface="eth0", probe_stage=SilentProbe())
+    assert routed.interface == "eth0"
+    assert not routed.on_link()
+    on_link.close()
+    routed.close()
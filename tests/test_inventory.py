@@ -0,0 +1,55 @@
+"""
+Tests for the persistent SQLite device inventory
+"""
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from netmaster_pro.core.device import Device, ip_to_int
+from netmaster_pro.core.inventory import InventoryStore
+
+
+def make_device(ip, mac="aa:bb:cc:00:00:01", last_seen=100.0):
+    return Device(ip, mac=mac, hostname="host", vendor="Vendor", last_seen=last_seen)
+
+
+def test_round_trip_survives_reopen(tmp_path):
+    path = str(tmp_path / "inventory.db")
+    store = InventoryStore(path)
+    assert store._conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+    store.stage("192.168.1.0/24", make_device("192.168.1.10"))
+    store.stage("192.168.1.0/24", make_device("192.168.1.11", mac="aa:bb:cc:00:00:02"))
+    store.stage("10.0.0.0/24", make_device("10.0.0.5"))
+    assert store.flush() == 3
+    assert store.flush() == 0
+    store.close()
+
+    reopened = InventoryStore(path)
+    devices = reopened.load("192.168.1.0/24")
+    assert sorted(devices) == [ip_to_int("192.168.1.10"), ip_to_int("192.168.1.11")]
+    assert devices[ip_to_int("192.168.1.11")].mac == "aa:bb:cc:00:00:02"
+    assert devices[ip_to_int("192.168.1.10")] == make_device("192.168.1.10")
+    reopened.close()
+
+
+def test_staged_changes_batch_into_one_write(tmp_path):
+    store = InventoryStore(str(tmp_path / "inventory.db"))
+    device = make_device("192.168.1.10")
+    store.stage("net", device)
+    device.stale = True
+    device.last_seen = 200.0
+    store.stage("net", device)
+    store.stage("net", make_device("192.168.1.20"))
+    store.stage_removal("net", "192.168.1.20")
+    assert store.flush() == 2
+
+    devices = store.load("net")
+    assert [d.ip for d in devices.values()] == ["192.168.1.10"]
+    assert devices[ip_to_int("192.168.1.10")].stale is True
+    assert devices[ip_to_int("192.168.1.10")].last_seen == 200.0
+
+    store.close()
+    assert store.flush() == 0
+    assert store.load("net") == {}
@@ -0,0 +1,127 @@
+"""
+Tests for parallel discovery across several interfaces
+"""
+import asyncio
+import ipaddress
+import sys
+import os
+import threading
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from netmaster_pro.core import discovery
+from netmaster_pro.core.device import Device, ip_to_int
+from netmaster_pro.core.interfaces import Interface, InterfaceMonitor
+from netmaster_pro.core.scan_engine import ProbeStage
+
+INTERFACES = [
+    Interface("eth0", "10.1.0.1", ipaddress.IPv4Network("10.1.0.0/29"), "10.1.0.6", True),
+    Interface("eth0.20", "10.2.0.1", ipaddress.IPv4Network("10.2.0.0/29"), None, False),
+    Interface("wlan0", "10.3.0.1", ipaddress.IPv4Network("10.3.0.0/29"), None, False),
+]
+
+
+class SegmentProbe(ProbeStage):
+    """Simulated segment answering for ``alive`` after ``delay`` seconds"""
+
+    def __init__(self, alive, delay):
+        self.alive = set(alive)
+        self.delay = delay
+
+    async def probe(self, ip):
+        await asyncio.sleep(self.delay)
+        return self.delay if ip in self.alive else None
+
+
+def make_discovery(monkeypatch, **kwargs):
+    monkeypatch.setattr(discovery, "default_monitor", lambda: InterfaceMonitor(lister=lambda: INTERFACES))
+    probes = {
+        "eth0": SegmentProbe({"10.1.0.2", "10.1.0.3"}, delay=0.01),
+        # A lossy segment whose probes take far longer than the others
+        "eth0.20": SegmentProbe(set(), delay=3.0),
+        "wlan0": SegmentProbe({"10.3.0.4"}, delay=0.01),
+    }
+    return discovery.MultiInterfaceDiscovery(
+        probe_stage_factory=lambda interface: probes[interface.name], **kwargs
+    )
+
+
+def test_slow_segment_does_not_stall_the_others(monkeypatch):
+    swept = {}
+    fast_done = threading.Event()
+
+    def on_sweep(stats):
+        swept[stats['interface']] = stats
+        if {"eth0", "wlan0"} <= set(swept):
+            fast_done.set()
+
+    multi = make_discovery(monkeypatch, interfaces=["eth0", "eth0.20", "wlan0"], on_sweep=on_sweep)
+    assert [service.interface for service in multi.services] == ["eth0", "eth0.20", "wlan0"]
+    assert multi.local_ips == {"10.1.0.1", "10.2.0.1", "10.3.0.1"}
+
+    multi.start(max_sweeps=1)
+    assert fast_done.wait(2.0)
+    assert "eth0.20" not in swept
+
+    assert [multi.devices[a].ip for a in sorted(multi.devices)] == ["10.1.0.2", "10.1.0.3", "10.3.0.4"]
+    assert multi.devices[ip_to_int("10.1.0.2")].interface == "eth0"
+    assert multi.devices[ip_to_int("10.3.0.4")].interface == "wlan0"
+    assert multi.service_for("10.2.0.3").interface == "eth0.20"
+    multi.close()
+
+
+def test_devices_from_every_interface_share_one_inventory(monkeypatch, tmp_path):
+    store = discovery.InventoryStore(str(tmp_path / "inventory.db"))
+    multi = make_discovery(monkeypatch, interfaces=["eth0", "wlan0"], inventory=store)
+    multi.run(max_sweeps=1)
+    multi.close()
+    # The caller's store stays open for the caller to close
+    store.stage("10.9.0.0/29", Device("10.9.0.5", last_seen=1.0))
+    assert store.flush() == 1
+    store.close()
+
+    reopened = discovery.InventoryStore(str(tmp_path / "inventory.db"))
+    assert sorted(d.ip for d in reopened.load("10.1.0.0/29").values()) == ["10.1.0.2", "10.1.0.3"]
+    assert reopened.load("10.3.0.0/29")[ip_to_int("10.3.0.4")].interface == "wlan0"
+    assert ip_to_int("10.9.0.5") in reopened.load("10.9.0.0/29")
+    reopened.close()
+
+
+def test_only_the_default_route_interface_is_scanned_unless_asked(monkeypatch):
+    multi = make_discovery(monkeypatch)
+    assert multi.attached == ["eth0"]
+    assert multi.available_interfaces() == ["eth0", "eth0.20", "wlan0"]
+
+    multi.attach("wlan0")
+    assert multi.attached == ["eth0", "wlan0"]
+    multi.run(max_sweeps=1)
+    assert multi.devices[ip_to_int("10.3.0.4")].interface == "wlan0"
+
+    multi.detach("wlan0")
+    assert multi.attached == ["eth0"]
+    assert [multi.devices[a].ip for a in sorted(multi.devices)] == ["10.1.0.2", "10.1.0.3"]
+    multi.close()
+
+
+def test_unnamed_interfaces_are_swept_no_wider_than_the_cap():
+    wide = Interface("docker0", "172.17.3.1", ipaddress.IPv4Network("172.17.0.0/16"), None, False)
+    assert discovery.auto_sweep_network(wide) == ipaddress.IPv4Network("172.17.3.0/24")
+    assert discovery.auto_sweep_network(wide, max_prefix=20) == ipaddress.IPv4Network("172.17.0.0/20")
+    assert discovery.auto_sweep_network(INTERFACES[0]) == INTERFACES[0].network
+
+
+def test_sweeps_refresh_last_seen_and_keep_merged_fields(monkeypatch):
+    multi = make_discovery(monkeypatch)
+    scheduler = multi.primary.probe_scheduler
+    # Re-probe known addresses on every sweep
+    scheduler.base_interval = scheduler.min_interval = 0.0
+    multi.run(max_sweeps=1)
+    address = ip_to_int("10.1.0.2")
+    first_seen = multi.devices[address].last_seen
+    multi.devices.update(address, bandwidth=4096)
+
+    # A second sweep finds nothing new, so it produces no diff events
+    multi.run(max_sweeps=1)
+    assert multi.devices[address].last_seen > first_seen
+    assert multi.devices[address].bandwidth == 4096
+    multi.close()
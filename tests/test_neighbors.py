@@ -0,0 +1,98 @@
+"""
+Tests for neighbor table snapshots
+"""
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from netmaster_pro.core.neighbors import (
+    NeighborTable, NeighborCacheStage, parse_proc_arp, parse_ip_neigh_json, parse_arp_a
+)
+from netmaster_pro.core.scan_engine import ProbeStage
+
+PROC_ARP = """IP address       HW type     Flags       HW address            Mask     Device
+192.168.1.1      0x1         0x2         AA:BB:CC:00:00:01     *        eth0
+192.168.1.20     0x1         0x0         00:00:00:00:00:00     *        eth0
+192.168.1.30     0x1         0x6         aa:bb:cc:00:00:1e     *        eth0
+"""
+
+IP_NEIGH_JSON = """[
+ {"dst":"192.168.1.1","dev":"eth0","lladdr":"aa:bb:cc:00:00:01","state":["REACHABLE"]},
+ {"dst":"192.168.1.7","dev":"eth0","lladdr":"aa:bb:cc:00:00:07","state":["STALE"]},
+ {"dst":"192.168.1.9","dev":"eth0","state":["FAILED"]}
+]"""
+
+ARP_A = """
+Interface: 192.168.1.100 --- 0x4
+  Internet Address      Physical Address      Type
+  192.168.1.1           aa-bb-cc-00-00-01     dynamic
+  192.168.1.255         ff-ff-ff-ff-ff-ff     static
+"""
+
+
+def test_parse_proc_arp():
+    entries = parse_proc_arp(PROC_ARP)
+    assert set(entries) == {"192.168.1.1", "192.168.1.30"}
+    assert entries["192.168.1.1"].mac == "aa:bb:cc:00:00:01"
+    assert entries["192.168.1.1"].state == "STALE"
+    assert entries["192.168.1.30"].state == "PERMANENT"
+
+
+def test_parse_ip_neigh_json():
+    entries = parse_ip_neigh_json(IP_NEIGH_JSON)
+    assert set(entries) == {"192.168.1.1", "192.168.1.7"}
+    assert entries["192.168.1.1"].state == "REACHABLE"
+    assert entries["192.168.1.7"].interface == "eth0"
+
+
+def test_parse_arp_a():
+    entries = parse_arp_a(ARP_A)
+    assert entries["192.168.1.1"].mac == "aa:bb:cc:00:00:01"
+    assert entries["192.168.1.255"].state == "PERMANENT"
+
+
+def test_table_reads_once_and_refreshes_on_miss():
+    reads = []
+
+    def reader():
+        reads.append(1)
+        return parse_ip_neigh_json(IP_NEIGH_JSON)
+
+    table = NeighborTable(reader=reader, min_refresh_interval=60)
+    table.refresh()
+    assert table.mac("192.168.1.1") == "aa:bb:cc:00:00:01"
+    assert table.mac("192.168.1.7") == "aa:bb:cc:00:00:07"
+    assert table.mac("192.168.1.99") is None
+    assert len(reads) == 1
+
+    table.min_refresh_interval = 0
+    assert table.mac("192.168.1.99") is None
+    assert len(reads) == 2
+
+
+def test_cache_stage_skips_reachable_hosts():
+    class CountingProbe(ProbeStage):
+        def __init__(self):
+            self.probed = []
+
+        async def probe(self, ip):
+            self.probed.append(ip)
+            return None
+
+    table = NeighborTable(reader=lambda: parse_ip_neigh_json(IP_NEIGH_JSON))
+    table.refresh()
+    inner = CountingProbe()
+    stage = NeighborCacheStage(inner, table)
+
+    assert stage.probe_sync("192.168.1.1") == 0.0
+    assert stage.probe_sync("192.168.1.7") is None
+    assert inner.probed == ["192.168.1.7"]
+
+
+def test_learned_entries_are_alive():
+    table = NeighborTable(reader=lambda: [], min_refresh_interval=60)
+    table.refresh()
+    table.learn("192.168.1.50", "aa:bb:cc:00:00:32")
+    assert table.mac("192.168.1.50") == "aa:bb:cc:00:00:32"
+    assert table.is_known_alive("192.168.1.50")
@@ -0,0 +1,114 @@
+"""
+Tests for rtnetlink neighbor notifications, using recorded messages
+"""
+import sys
+import os
+import socket
+import struct
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from netmaster_pro.core.discovery import DiscoveryService
+from netmaster_pro.core.netlink_watcher import (
+    NDA_DST, NDA_LLADDR, RTM_DELNEIGH, RTM_NEWNEIGH, NeighborWatcher, parse_neighbor_messages
+)
+from netmaster_pro.core.neighbors import NeighborTable
+from netmaster_pro.core.scan_diff import IP_CHANGED, JOINED
+from netmaster_pro.core.simulated_lan import SimulatedLan
+
+# RTM_NEWNEIGH 192.168.1.23 lladdr 3c:22:fb:12:34:56 REACHABLE on ifindex 2,
+# followed by RTM_DELNEIGH 192.168.1.40 FAILED, in one datagram
+RECORDED = bytes.fromhex(
+    "300000001c000000000000000000000002000000020000000200000108000100"
+    "c0a801170a0002003c22fb1234560000240000001d0000000000000000000000"
+    "02000000020000002000000108000100c0a80128"
+)
+
+# RTM_NEWNEIGH for an IPv6 neighbor (fe80::1), which is ignored
+RECORDED_IPV6 = bytes.fromhex(
+    "300000001c0000000000000000000000"
+    "0a000000020000000200000114000100"
+    "fe800000000000000000000000000001"
+)
+
+
+def test_parse_recorded_messages():
+    events = parse_neighbor_messages(RECORDED)
+    assert len(events) == 2
+
+    new, deleted = events
+    assert new.action == "new"
+    assert new.ip == "192.168.1.23"
+    assert new.mac == "3c:22:fb:12:34:56"
+    assert new.state == "REACHABLE"
+    assert new.ifindex == 2
+
+    assert deleted.action == "del"
+    assert deleted.ip == "192.168.1.40"
+    assert deleted.mac is None
+    assert deleted.state == "FAILED"
+
+
+def test_ipv6_and_truncated_messages_are_ignored():
+    assert parse_neighbor_messages(RECORDED_IPV6) == []
+    assert parse_neighbor_messages(RECORDED[:20]) == []
+
+
+def test_feed_updates_neighbor_table(monkeypatch):
+    def if_indextoname(index):
+        if index != 2:
+            raise OSError(6, "No such device or address")
+        return "eth0"
+
+    monkeypatch.setattr(socket, "if_indextoname", if_indextoname)
+    table = NeighborTable(reader=dict)
+    table.apply(parse_neighbor_messages(RECORDED)[0])
+    received = []
+    watcher = NeighborWatcher(lambda event: (received.append(event), table.apply(event)))
+
+    watcher.feed(RECORDED)
+
+    assert [event.action for event in received] == ["new", "del"]
+    assert table.is_known_alive("192.168.1.23")
+    assert table.mac("192.168.1.23") == "3c:22:fb:12:34:56"
+    # Events carry the interface index; the table keeps names like a table read
+    assert table.get("192.168.1.23").interface == "eth0"
+    table.apply(parse_neighbor_messages(RECORDED)[0]._replace(ifindex=9))
+    assert table.get("192.168.1.23").interface is None
+    assert table.get("192.168.1.40", refresh_on_miss=False) is None
+
+
+class InlineExecutor:
+    def submit(self, fn, *args):
+        fn(*args)
+
+    def shutdown(self, wait=True):
+        pass
+
+
+def neighbor_message(msg_type, ip, mac=None, state=0x02):
+    """One RTM_NEWNEIGH/RTM_DELNEIGH message, as the kernel sends it"""
+    attrs = struct.pack("=HH4s", 8, NDA_DST, socket.inet_aton(ip))
+    if mac is not None:
+        attrs += struct.pack("=HH6s2x", 10, NDA_LLADDR, bytes.fromhex(mac.replace(":", "")))
+    body = struct.pack("=BBHiHBB", socket.AF_INET, 0, 0, 2, state, 0, 0) + attrs
+    return struct.pack("=IHHII", 16 + len(body), msg_type, 0, 0, 0) + body
+
+
+def test_a_device_moving_address_keeps_one_record():
+    lan = SimulatedLan("10.90.0.0/24", hosts=0, time_scale=0.0)
+    events = []
+    service = DiscoveryService(network="10.90.0.0/24", backend=lan, on_events=events.extend)
+    service.event_executor = InlineExecutor()
+    mac = "3c:22:fb:00:00:07"
+
+    service.neighbor_watcher.feed(neighbor_message(RTM_NEWNEIGH, "10.90.0.20", mac))
+    # DHCP hands the device a new address; the old entry is deleted later
+    service.neighbor_watcher.feed(neighbor_message(RTM_NEWNEIGH, "10.90.0.21", mac))
+    service.neighbor_watcher.feed(neighbor_message(RTM_DELNEIGH, "10.90.0.20", state=0x20))
+
+    assert [(e.kind, e.ip) for e in events] == [(JOINED, "10.90.0.20"), (JOINED, "10.90.0.21"),
+                                                (IP_CHANGED, "10.90.0.21")]
+    assert [device.ip for device in service.devices.values()] == ["10.90.0.21"]
+    assert [device.ip for device in service.devices.by_mac(mac)] == ["10.90.0.21"]
+    service.close()
@@ -0,0 +1,92 @@
+"""
+Tests for the memory-mapped OUI vendor index
+"""
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from netmaster_pro.core.oui_db import (BUNDLED_INDEX, OuiDatabase, build_index, default_path, ensure_index,
+                                      is_locally_administered, main)
+
+REGISTRY_CSV = """Registry,Assignment,Organization Name,Organization Address
+MA-L,3C22FB,"Apple, Inc.",1 Infinite Loop Cupertino CA US 95014
+MA-L,001A11,Google Inc.,Mountain View CA US 94043
+MA-M,70B3D51,Example 28-bit Vendor,Somewhere
+MA-S,70B3D5123,Example 36-bit Vendor,Somewhere
+CID,0A1B2C,Company ID,Ignored
+"""
+
+
+def build(tmp_path):
+    csv_path = tmp_path / "oui.csv"
+    csv_path.write_text(REGISTRY_CSV)
+    index_path = str(tmp_path / "oui.idx")
+    assert build_index([str(csv_path)], index_path) == 4
+    return OuiDatabase(index_path)
+
+
+def test_lookup_longest_prefix(tmp_path):
+    database = build(tmp_path)
+    assert len(database) == 4
+    assert database.lookup("3c:22:fb:12:34:56") == "Apple, Inc."
+    assert database.lookup("00-1A-11-00-00-01") == "Google Inc."
+    assert database.lookup("70:b3:d5:1f:ff:ff") == "Example 28-bit Vendor"
+    assert database.lookup("70:b3:d5:12:3f:ff") == "Example 36-bit Vendor"
+    assert database.lookup("70:b3:d5:00:00:00") is None
+    database.close()
+
+
+def test_vendor_flags_randomized_macs(tmp_path):
+    database = build(tmp_path)
+    assert is_locally_administered("3e:22:fb:12:34:56")
+    assert not is_locally_administered("3c:22:fb:12:34:56")
+    assert database.vendor("3e:22:fb:12:34:56") == "Private (randomized)"
+    assert database.vendor("Unknown") == "Unknown"
+    assert database.vendor("00:00:5e:00:00:01") == "Unknown"
+    database.close()
+
+
+def test_missing_index_is_empty(tmp_path):
+    database = OuiDatabase(str(tmp_path / "missing.idx"))
+    assert len(database) == 0
+    assert database.vendor("3c:22:fb:12:34:56") == "Unknown"
+
+
+def test_builder_command(tmp_path, capsys):
+    csv_path = tmp_path / "oui.csv"
+    csv_path.write_text(REGISTRY_CSV)
+    index_path = tmp_path / "out.idx"
+
+    assert main(["build", str(csv_path), "-o", str(index_path)]) == 0
+    assert main(["lookup", "3c:22:fb:00:00:01", "-i", str(index_path)]) == 0
+    assert "Apple, Inc." in capsys.readouterr().out
+
+
+def test_index_is_built_in_the_user_data_dir_on_first_use(tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_DATA_HOME", str(tmp_path))
+    monkeypatch.setattr(sys, "platform", "linux")
+    index_path = default_path()
+    assert index_path == str(tmp_path / "netmaster-pro" / "oui.idx")
+    assert ensure_index() == BUNDLED_INDEX
+
+    (tmp_path / "netmaster-pro").mkdir()
+    (tmp_path / "netmaster-pro" / "oui.csv").write_text(REGISTRY_CSV)
+    assert ensure_index() == index_path
+    database = OuiDatabase(index_path)
+    assert database.lookup("3c:22:fb:12:34:56") == "Apple, Inc."
+    database.close()
+
+    # Newer registry files replace the index
+    built = os.path.getmtime(index_path)
+    (tmp_path / "netmaster-pro" / "oui.csv").write_text(REGISTRY_CSV.replace("Google Inc.", "Google LLC"))
+    os.utime(tmp_path / "netmaster-pro" / "oui.csv", (built + 10, built + 10))
+    ensure_index()
+    database = OuiDatabase(index_path)
+    assert database.lookup("00:1a:11:00:00:01") == "Google LLC"
+    database.close()
+
+    # The builder writes the per-user index unless told otherwise
+    os.remove(index_path)
+    assert main(["build", str(tmp_path / "netmaster-pro" / "oui.csv")]) == 0
+    assert os.path.exists(index_path)
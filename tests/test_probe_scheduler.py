@@ -0,0 +1,54 @@
+"""
+Tests for adaptive probe scheduling
+"""
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from netmaster_pro.core.probe_scheduler import ProbeScheduler
+
+
+def test_dead_addresses_back_off_exponentially():
+    scheduler = ProbeScheduler(base_interval=10, min_interval=1, max_interval=1000)
+    intervals = [scheduler.record("10.0.0.9", False, now=0).interval for _ in range(5)]
+    assert intervals == [20, 40, 80, 160, 320]
+
+    for _ in range(10):
+        state = scheduler.record("10.0.0.9", False, now=0)
+    assert state.interval == 1000
+
+
+def test_live_hosts_use_base_interval_and_flappers_tighten():
+    scheduler = ProbeScheduler(base_interval=30, min_interval=5)
+    assert scheduler.record("10.0.0.1", True, 0.002, now=0).interval == 30
+
+    scheduler.record("10.0.0.2", True, now=0)
+    scheduler.record("10.0.0.2", False, now=0)
+    state = scheduler.record("10.0.0.2", True, now=0)
+    assert state.flaps == 2
+    assert state.interval == 10
+
+
+def test_due_queue_orders_by_next_due():
+    scheduler = ProbeScheduler(base_interval=10, min_interval=1)
+    scheduler.record("10.0.0.1", True, now=0)      # due at 10
+    scheduler.record("10.0.0.2", False, now=0)     # due at 20
+    scheduler.record("10.0.0.3", True, now=5)      # due at 15
+
+    assert scheduler.next_due_time() == 10
+    assert list(scheduler.iter_due(now=9)) == []
+    assert list(scheduler.iter_due(now=16)) == ["10.0.0.1", "10.0.0.3"]
+    assert scheduler.time_until_due(now=16) == 4
+
+
+def test_interrupted_probe_stays_scheduled():
+    scheduler = ProbeScheduler(base_interval=10, min_interval=1)
+    scheduler.record("10.0.0.1", True, now=0)
+
+    due = scheduler.iter_due(now=10)
+    assert next(due) == "10.0.0.1"
+    due.close()  # The sweep was cancelled before the probe completed
+
+    assert "10.0.0.1" in scheduler
+    assert scheduler.next_due_time() == 20
@@ -0,0 +1,126 @@
+"""
+Tests for the thread-safe device registry
+"""
+import sys
+import os
+import threading
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from netmaster_pro.core.device import Device, ip_to_int
+from netmaster_pro.core.registry import DeviceRegistry, STATUS_ACTIVE, STATUS_STALE
+
+
+def test_snapshots_are_versioned_and_reused():
+    registry = DeviceRegistry()
+    empty = registry.snapshot()
+    assert empty.version == 0 and len(empty.devices) == 0
+
+    registry.put(Device("10.0.0.2"))
+    first = registry.snapshot()
+    assert first.version == 1
+    # Nothing changed: readers get the same object and can skip work
+    assert registry.snapshot() is first
+
+    registry.update(ip_to_int("10.0.0.2"), hostname="printer")
+    second = registry.snapshot()
+    assert second.version == 2
+    assert second.devices[ip_to_int("10.0.0.2")].hostname == "printer"
+    # Earlier snapshots and the records in them are unaffected by writes
+    assert first.devices[ip_to_int("10.0.0.2")].hostname is None
+
+
+def test_writes_and_lookups():
+    registry = DeviceRegistry({ip_to_int("10.0.0.2"): Device("10.0.0.2")})
+    assert registry.version == 1
+    assert ip_to_int("10.0.0.2") in registry and len(registry) == 1
+    assert registry.update(ip_to_int("10.0.0.9"), stale=True) is None
+    assert registry.version == 1
+
+    registry.update(ip_to_int("10.0.0.2"), mac="AA:BB:CC:00:00:01")
+    assert registry[ip_to_int("10.0.0.2")].mac == "aa:bb:cc:00:00:01"
+    assert registry.remove(ip_to_int("10.0.0.2")).ip == "10.0.0.2"
+    assert registry.remove(ip_to_int("10.0.0.2")) is None
+    registry.merge({ip_to_int("10.0.0.3"): Device("10.0.0.3")})
+    assert [d.ip for d in registry.values()] == ["10.0.0.3"]
+    registry.reset()
+    assert not registry and registry.version == 5
+
+
+def test_indexes_follow_every_write():
+    registry = DeviceRegistry()
+    registry.put(Device("10.0.0.2", mac="aa:bb:cc:00:00:02", vendor="Apple", interface="eth0"))
+    registry.put(Device("10.0.0.3", mac="aa:bb:cc:00:00:03", vendor="Apple", interface="wlan0"))
+    registry.put(Device("10.0.0.4", mac="aa:bb:cc:00:00:04", vendor="Intel", interface="eth0"))
+
+    assert [d.ip for d in registry.find(vendor="Apple")] == ["10.0.0.2", "10.0.0.3"]
+    assert [d.ip for d in registry.find(vendor="Apple", interface="eth0")] == ["10.0.0.2"]
+    assert registry.find(vendor="Nobody") == []
+    assert registry.values_of('interface') == ["eth0", "wlan0"]
+    assert [d.ip for d in registry.by_mac("AA:BB:CC:00:00:04")] == ["10.0.0.4"]
+
+    registry.update(ip_to_int("10.0.0.3"), stale=True)
+    registry.update(ip_to_int("10.0.0.4"), mac="aa:bb:cc:00:00:05", vendor="Apple")
+    assert [d.ip for d in registry.find(status=STATUS_STALE)] == ["10.0.0.3"]
+    assert len(registry.addresses(status=STATUS_ACTIVE)) == 2
+    assert len(registry.find(vendor="Apple")) == 3
+    assert registry.values_of('vendor') == ["Apple"]
+    assert registry.by_mac("aa:bb:cc:00:00:04") == []
+
+    registry.remove(ip_to_int("10.0.0.2"))
+    assert registry.find(vendor="Apple", interface="eth0")[0].ip == "10.0.0.4"
+    assert registry.by_mac("aa:bb:cc:00:00:02") == []
+
+
+def test_addresses_sharing_a_mac_are_separate_devices():
+    registry = DeviceRegistry()
+    registry.put(Device("10.0.0.5", mac="aa:bb:cc:00:00:05", hostname="router", interface="eth0"))
+    registry.put(Device("10.0.0.6", mac="aa:bb:cc:00:00:05", interface="eth0"))
+    registry.put(Device("10.0.0.5", mac="aa:bb:cc:00:00:05", hostname="router", interface="eth0"))
+    assert [d.ip for d in registry.values()] == ["10.0.0.6", "10.0.0.5"]
+    assert [d.ip for d in registry.by_mac("aa:bb:cc:00:00:05")] == ["10.0.0.5", "10.0.0.6"]
+
+    # A move is applied by removing the old address
+    registry.remove(ip_to_int("10.0.0.5"))
+    assert [d.ip for d in registry.by_mac("aa:bb:cc:00:00:05")] == ["10.0.0.6"]
+
+
+def test_readers_never_see_torn_state():
+    registry = DeviceRegistry()
+    stop = threading.Event()
+    errors = []
+
+    def writer(offset):
+        i = 0
+        while not stop.is_set():
+            address = 0x0A000000 + offset + i % 500
+            device = registry.get(address)
+            if device is None:
+                registry.put(Device(address, last_seen=0.0, bandwidth=0))
+            else:
+                # last_seen and bandwidth always change together
+                registry.update(address, last_seen=device.last_seen + 1, bandwidth=device.bandwidth + 1)
+            if i % 7 == 0:
+                registry.remove(address)
+            i += 1
+
+    def reader():
+        try:
+            for _ in range(300):
+                snapshot = registry.snapshot()
+                for device in snapshot.devices.values():
+                    assert device.last_seen == device.bandwidth
+                assert len(snapshot.devices) == sum(1 for _ in snapshot.devices.items())
+        except Exception as e:
+            errors.append(e)
+
+    writers = [threading.Thread(target=writer, args=(n * 1000,)) for n in range(2)]
+    readers = [threading.Thread(target=reader) for _ in range(2)]
+    for thread in writers + readers:
+        thread.start()
+    for thread in readers:
+        thread.join()
+    stop.set()
+    for thread in writers:
+        thread.join()
+    assert errors == []
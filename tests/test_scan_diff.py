@@ -0,0 +1,153 @@
+"""
+Tests for presence bitmaps and scan diff events
+"""
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from netmaster_pro.core.scan_diff import (
+    DeviceEvent, PresenceBitmap, ScanDiff, JOINED, LEFT, IP_CHANGED, MAC_CHANGED, HOSTNAME_RESOLVED
+)
+from netmaster_pro.core.scan_planner import ScanPlanner
+
+
+def kinds(events):
+    return [(event.kind, event.ip) for event in events]
+
+
+def test_bitmap_add_discard_iterate():
+    planner = ScanPlanner("10.0.0.0/22")
+    bitmap = PresenceBitmap(planner.first_host, planner.size)
+    for ip in ("10.0.0.1", "10.0.1.7", "10.0.3.254"):
+        bitmap.add(ip)
+    assert "10.0.1.7" in bitmap
+    assert "10.0.1.8" not in bitmap
+    assert "192.168.0.1" not in bitmap
+    assert list(bitmap) == ["10.0.0.1", "10.0.1.7", "10.0.3.254"]
+    bitmap.discard("10.0.1.7")
+    assert len(bitmap) == 2
+
+    bitmap.fill()
+    assert len(bitmap) == planner.size
+
+
+def test_join_and_leave_only_for_probed_hosts():
+    diff = ScanDiff(ScanPlanner("192.168.1.0/24"))
+    diff.begin_sweep()
+    assert kinds(diff.observe("192.168.1.10", "aa:00:00:00:00:0a")) == [(JOINED, "192.168.1.10")]
+    assert kinds(diff.observe("192.168.1.11")) == [(JOINED, "192.168.1.11")]
+    assert diff.end_sweep() == []
+
+    # A partial sweep that only reached .10 cannot report .11 as gone
+    diff.begin_sweep()
+    diff.probed("192.168.1.10")
+    events = diff.end_sweep()
+    assert kinds(events) == [(LEFT, "192.168.1.10")]
+    assert events[0].previous == "aa:00:00:00:00:0a"
+    assert "192.168.1.11" in diff
+
+    diff.begin_sweep(full=True)
+    assert diff.end_sweep(complete=False) == []
+    assert "192.168.1.11" in diff
+
+
+def test_ip_mac_and_hostname_changes():
+    diff = ScanDiff(ScanPlanner("192.168.1.0/24"))
+    diff.observe("192.168.1.10", "aa:00:00:00:00:0a")
+
+    # The MAC shows up at a new address; the move is only reported once
+    # the old address was probed and stayed silent
+    diff.begin_sweep()
+    assert diff.observe("192.168.1.20", "aa:00:00:00:00:0a") == []
+    diff.probed("192.168.1.10")
+    events = diff.end_sweep()
+    assert kinds(events) == [(IP_CHANGED, "192.168.1.20")]
+    assert events[0].previous == "192.168.1.10"
+    assert "192.168.1.10" not in diff
+
+    # An address that already left hands its MAC over straight away
+    diff.lost("192.168.1.20")
+    events = diff.observe("192.168.1.30", "aa:00:00:00:00:0a")
+    assert kinds(events) == [(IP_CHANGED, "192.168.1.30")]
+    assert events[0].previous == "192.168.1.20"
+    # Back at the old address while the new one is live: both are kept
+    events = diff.observe("192.168.1.20", "aa:00:00:00:00:0a")
+    assert kinds(events) == [(JOINED, "192.168.1.20")]
+    assert "192.168.1.30" in diff
+
+    events = diff.observe("192.168.1.20", "aa:00:00:00:00:0b")
+    assert kinds(events) == [(MAC_CHANGED, "192.168.1.20")]
+    assert (events[0].previous, events[0].current) == ("aa:00:00:00:00:0a", "aa:00:00:00:00:0b")
+
+    # A lookup miss is no news until it takes a name away
+    assert diff.resolved("192.168.1.20", None) == []
+    assert kinds(diff.resolved("192.168.1.20", "printer.lan")) == [(HOSTNAME_RESOLVED, "192.168.1.20")]
+    assert diff.resolved("192.168.1.20", "printer.lan") == []
+    events = diff.resolved("192.168.1.20", None)
+    assert (events[0].previous, events[0].current) == ("printer.lan", "")
+
+    assert kinds(diff.lost("192.168.1.20")) == [(LEFT, "192.168.1.20")]
+    assert diff.lost("192.168.1.20") == []
+
+
+def test_stable_network_sweep_yields_no_events():
+    diff = ScanDiff(ScanPlanner("10.0.0.0/22"))
+    hosts = [(f"10.0.{i // 250}.{i % 250 + 1}", f"aa:00:00:00:{i // 256:02x}:{i % 256:02x}")
+             for i in range(500)]
+
+    diff.begin_sweep(full=True)
+    first = [event for ip, mac in hosts for event in diff.observe(ip, mac)]
+    first += diff.end_sweep()
+    assert len(first) == 500
+
+    diff.begin_sweep(full=True)
+    second = [event for ip, mac in hosts for event in diff.observe(ip, mac)]
+    second += diff.end_sweep()
+    assert second == []
+    assert len(diff) == 500
+
+
+def test_two_live_addresses_sharing_a_mac_are_both_kept():
+    diff = ScanDiff(ScanPlanner("10.0.0.0/24"))
+    mac = "aa:00:00:00:00:05"
+    events = []
+    for order in (("10.0.0.5", "10.0.0.6"), ("10.0.0.6", "10.0.0.5"), ("10.0.0.5", "10.0.0.6")):
+        diff.begin_sweep(full=True)
+        for ip in order:
+            events.append(diff.observe(ip, mac))
+        events.append(diff.end_sweep())
+    assert kinds(events[0] + events[1] + events[2]) == [(JOINED, "10.0.0.5"), (JOINED, "10.0.0.6")]
+    assert all(batch == [] for batch in events[3:])
+
+    # Outside a sweep a second address is a join, not a move
+    assert kinds(diff.observe("10.0.0.7", mac)) == [(JOINED, "10.0.0.7")]
+    assert len(diff) == 3
+
+    # A first sighting of the second address before the first one answers
+    diff = ScanDiff(ScanPlanner("10.0.0.0/24"))
+    diff.observe("10.0.0.5", mac)
+    diff.begin_sweep(full=True)
+    assert diff.observe("10.0.0.6", mac) == []
+    assert diff.observe("10.0.0.5", mac) == []
+    assert kinds(diff.end_sweep()) == [(JOINED, "10.0.0.6")]
+    assert "10.0.0.5" in diff and "10.0.0.6" in diff
+
+
+def test_old_address_going_silent_after_a_join_is_a_move():
+    diff = ScanDiff(ScanPlanner("10.0.0.0/24"))
+    mac = "aa:00:00:00:00:05"
+    diff.observe("10.0.0.5", mac)
+    # Learned outside a sweep while the old address is still present
+    assert kinds(diff.observe("10.0.0.9", mac)) == [(JOINED, "10.0.0.9")]
+
+    diff.begin_sweep(full=True)
+    diff.observe("10.0.0.9", mac)
+    events = diff.end_sweep()
+    assert events == [DeviceEvent(IP_CHANGED, "10.0.0.9", "10.0.0.5", mac)]
+    assert "10.0.0.5" not in diff and len(diff) == 1
+
+    # A neighbor deletion of the old address is a move too
+    diff.observe("10.0.0.12", mac)
+    assert diff.lost("10.0.0.9") == [DeviceEvent(IP_CHANGED, "10.0.0.12", "10.0.0.9", mac)]
+    assert kinds(diff.lost("10.0.0.12")) == [(LEFT, "10.0.0.12")]
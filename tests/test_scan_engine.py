@@ -0,0 +1,105 @@
+"""
+Tests for the concurrent scan engine
+"""
+import asyncio
+import sys
+import os
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from netmaster_pro.core.scan_engine import ScanEngine, ProbeStage, ExecutorStage
+
+
+class SleepProbe(ProbeStage):
+    """Probe that answers for a fixed set of hosts after a short delay"""
+
+    def __init__(self, alive, delay=0.05):
+        self.alive = set(alive)
+        self.delay = delay
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def probe(self, ip):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.in_flight -= 1
+        return self.delay if ip in self.alive else None
+
+
+def test_sweep_runs_concurrently_and_reports_results():
+    targets = [f"10.0.0.{i}" for i in range(1, 255)]
+    probe = SleepProbe(alive={"10.0.0.1", "10.0.0.42"})
+    engine = ScanEngine(probe, ExecutorStage(lambda ip: {'ip': ip}), concurrency=64)
+    found = []
+
+    start = time.monotonic()
+    stats = engine.run(targets, on_result=lambda ip, rtt, info: found.append(info['ip']))
+    elapsed = time.monotonic() - start
+    engine.close()
+
+    assert sorted(found) == ["10.0.0.1", "10.0.0.42"]
+    assert stats['probed'] == 254
+    assert stats['alive'] == 2
+    assert probe.max_in_flight == 64
+    # 254 hosts at 50 ms each would take ~12.7 s sequentially
+    assert elapsed < 2.0
+
+
+def test_sweep_respects_deadline():
+    probe = SleepProbe(alive=set(), delay=0.2)
+    engine = ScanEngine(probe, concurrency=2, deadline=0.3)
+    stats = engine.run(f"10.0.0.{i}" for i in range(1, 255))
+
+    assert stats['timed_out']
+    assert stats['probed'] < 10
+
+
+def test_targets_are_consumed_lazily():
+    consumed = []
+
+    def targets():
+        for i in range(1, 255):
+            consumed.append(i)
+            yield f"10.0.0.{i}"
+
+    engine = ScanEngine(SleepProbe(alive=set(), delay=0.01), concurrency=4)
+    engine.run(targets())
+
+    assert consumed == list(range(1, 255))
+
+
+def test_abandoned_enrichment_is_bounded_by_the_pool():
+    release = threading.Event()
+    calls = []
+
+    def hang(ip):
+        calls.append(ip)
+        release.wait(5.0)
+        return {'ip': ip}
+
+    stage = ExecutorStage(hang, max_workers=2, timeout=0.05)
+
+    async def enrich(ips):
+        return await asyncio.gather(*[stage.run(ip) for ip in ips])
+
+    assert asyncio.run(enrich(["10.0.0.1", "10.0.0.2", "10.0.0.3"])) == [None, None, None]
+    # The queued third call was dropped; the two running ones hold the pool
+    assert sorted(calls) == ["10.0.0.1", "10.0.0.2"]
+    assert stage.abandoned == 2
+
+    start = time.monotonic()
+    assert asyncio.run(stage.run("10.0.0.4")) is None
+    assert time.monotonic() - start < 0.04
+
+    release.set()
+    deadline = time.monotonic() + 2.0
+    while stage.abandoned and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert stage.abandoned == 0
+    assert asyncio.run(stage.run("10.0.0.5")) == {'ip': "10.0.0.5"}
+    stage.close()
@@ -0,0 +1,60 @@
+"""
+Tests for the CIDR-aware scan planner
+"""
+import sys
+import os
+import itertools
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from netmaster_pro.core.scan_planner import ScanPlanner
+
+
+def test_real_prefix_sizes():
+    assert ScanPlanner("192.168.1.0/24").size == 254
+    assert ScanPlanner("10.0.0.0/23").size == 510
+    assert ScanPlanner("10.0.0.0/20").size == 4094
+    assert ScanPlanner("172.16.0.0/16").size == 65534
+    assert ScanPlanner("10.0.0.5/31").size == 2
+
+
+def test_priority_order_and_no_duplicates():
+    planner = ScanPlanner("10.0.0.0/23", gateway="10.0.1.1", neighborhood=2)
+    targets = list(planner.iter_targets(recent=["10.0.0.77", "192.168.5.5"]))
+
+    assert targets[:6] == ["10.0.0.77", "10.0.1.1", "10.0.1.0", "10.0.1.2", "10.0.0.255", "10.0.1.3"]
+    assert len(targets) == len(set(targets)) == 510
+    assert "10.0.0.0" not in targets and "10.0.1.255" not in targets
+
+
+def test_skip_predicate():
+    planner = ScanPlanner("192.168.1.0/24")
+    targets = list(planner.iter_targets(skip=lambda ip: ip.endswith(".1")))
+    assert "192.168.1.1" not in targets
+    assert len(targets) == 253
+
+
+def test_large_range_is_streamed_lazily():
+    planner = ScanPlanner("10.0.0.0/8")
+    first = list(itertools.islice(planner.iter_targets(), 3))
+    assert first == ["10.0.0.1", "10.0.0.2", "10.0.0.3"]
+
+
+def test_cursor_resumes_interrupted_sweep():
+    planner = ScanPlanner("10.0.0.0/22", chunk_size=256)
+    targets = planner.iter_targets()
+    list(itertools.islice(targets, 600))
+    targets.close()
+    assert planner.cursor == 2
+
+    resumed = next(planner.iter_targets())
+    assert resumed == "10.0.2.1"
+
+
+def test_shards_cover_range():
+    planner = ScanPlanner("172.16.0.0/16")
+    shards = list(planner.shards(4))
+    assert len(shards) == 4
+    assert shards[0][0] == planner.first_host
+    assert shards[-1][1] == planner.last_host
+    assert sum(end - start + 1 for start, end in shards) == planner.size
@@ -0,0 +1,52 @@
+"""
+Tests for multi-process sharded scanning
+"""
+import sys
+import os
+import multiprocessing
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from netmaster_pro.core.scan_engine import ProbeStage
+from netmaster_pro.core.scan_planner import ScanPlanner
+from netmaster_pro.core.sharded_scan import ShardedScanner
+
+
+class EveryTenthProbe(ProbeStage):
+    """Answers for addresses whose last octet is a multiple of ten"""
+
+    async def probe(self, ip):
+        return 0.0025 if int(ip.rsplit(".", 1)[1]) % 10 == 0 else None
+
+
+class StuckProbe(ProbeStage):
+    """Blocks its worker's event loop, so neither stop requests nor deadlines reach it"""
+
+    async def probe(self, ip):
+        time.sleep(60)
+
+
+def test_shards_merge_into_one_result_set():
+    planner = ScanPlanner("10.0.0.0/22")
+    scanner = ShardedScanner(workers=3, concurrency=32, probe_factory=EveryTenthProbe)
+    found = {}
+
+    stats = scanner.scan(planner, on_result=lambda ip, rtt: found.__setitem__(ip, rtt))
+
+    expected = {f"10.0.{a}.{b}" for a in range(4) for b in range(0, 255, 10)} - {"10.0.0.0"}
+    assert set(found) == expected
+    assert stats['workers'] == 3
+    assert stats['probed'] == planner.size
+    assert stats['alive'] == len(expected)
+    assert stats['errors'] == []
+    assert all(rtt == 0.0025 for rtt in found.values())
+
+
+def test_stuck_workers_are_terminated_at_the_deadline():
+    scanner = ShardedScanner(workers=2, concurrency=4, deadline=1.0, probe_factory=StuckProbe)
+    start = time.monotonic()
+    stats = scanner.scan(ScanPlanner("10.0.0.0/28"))
+    assert stats['timed_out']
+    assert time.monotonic() - start < 10.0
+    assert not [child for child in multiprocessing.active_children() if child.name.startswith("netmaster-shard")]
@@ -0,0 +1,107 @@
+"""
+Tests for the simulated LAN backend and the full pipeline running against it
+"""
+import ipaddress
+import sys
+import os
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from netmaster_pro.core.discovery import DiscoveryService
+from netmaster_pro.core.scan_diff import JOINED, LEFT
+from netmaster_pro.core.simulated_lan import SimulatedLan
+
+
+def make_service(lan, **kwargs):
+    return DiscoveryService(network=str(lan.network), backend=lan, concurrency=256, **kwargs)
+
+
+def test_same_seed_builds_the_same_lan():
+    first = SimulatedLan("10.0.0.0/16", hosts=500, loss=0.2, icmp_silent=0.3, seed=3)
+    second = SimulatedLan("10.0.0.0/16", hosts=500, loss=0.2, icmp_silent=0.3, seed=3)
+    assert first.hosts == second.hosts
+    assert len(first.hosts) == 500
+    assert all(ipaddress.IPv4Address(ip) in first.network for ip in first.hosts)
+
+    probes = [ip for ip in list(first.hosts)[:50] for _ in range(3)]
+    assert [first.answer(ip, "icmp") for ip in probes] == [second.answer(ip, "icmp") for ip in probes]
+    assert SimulatedLan("10.0.0.0/16", hosts=500, seed=4).hosts != first.hosts
+
+
+def test_pipeline_finds_every_host_including_icmp_silent_ones():
+    lan = SimulatedLan("10.50.0.0/22", hosts=40, icmp_silent=0.25, time_scale=0.0, seed=7)
+    assert any(host.icmp_silent for host in lan.hosts.values())
+    service = make_service(lan)
+    service.run(max_sweeps=1)
+    service.wait_idle()
+
+    assert sorted(d.ip for d in service.devices.values()) == sorted(lan.alive())
+    for device in service.devices.values():
+        host = lan.hosts[device.ip]
+        assert device.mac == host.mac
+        assert device.hostname == (host.hostname or "")
+    service.close()
+
+
+def test_lossy_sweeps_are_reproducible():
+    found = []
+    for _ in range(2):
+        lan = SimulatedLan("10.60.0.0/23", hosts=80, loss=0.3, time_scale=0.0, seed=11)
+        service = make_service(lan)
+        service.run(max_sweeps=1)
+        found.append(sorted(d.ip for d in service.devices.values()))
+        service.close()
+
+    assert found[0] == found[1]
+    assert set(found[0]) < set(lan.alive())
+
+
+def test_churn_surfaces_as_join_and_leave_events():
+    lan = SimulatedLan("10.70.0.0/24", hosts=60, churn=0.2, time_scale=0.0, seed=5)
+    events = []
+    service = make_service(lan, on_events=events.extend)
+    # Re-probe every known address on each sweep
+    service.probe_scheduler.base_interval = service.probe_scheduler.min_interval = 0.001
+    service.run(max_sweeps=1)
+    assert sorted(e.ip for e in events if e.kind == JOINED) == sorted(lan.alive())
+
+    changes = 0
+    for _ in range(3):
+        joined, left = lan.advance()
+        changes += len(joined) + len(left)
+        del events[:]
+        time.sleep(0.05)
+        service.run(max_sweeps=1)
+
+        assert sorted(e.ip for e in events if e.kind == JOINED) == sorted(joined)
+        assert sorted(e.ip for e in events if e.kind == LEFT) == sorted(left)
+    assert changes
+    service.close()
+
+
+def test_failed_enrichment_and_stopped_sweeps_report_no_departures():
+    lan = SimulatedLan("10.80.0.0/24", hosts=40, time_scale=0.0, seed=9)
+    events = []
+    service = make_service(lan, on_events=events.extend)
+    service.probe_scheduler.base_interval = service.probe_scheduler.min_interval = 0.0
+    service.run(max_sweeps=1)
+    assert len(service.devices) == 40
+
+    # Every host answers but none can be enriched
+    enrich = service.scan_engine.enrich_stage
+    enrich.func = lambda ip: None
+    del events[:]
+    service.run(max_sweeps=1)
+    assert not [e for e in events if e.kind == LEFT]
+
+    # Stop in the middle of enrichment
+    def stop(ip):
+        service.stop()
+        return None
+
+    enrich.func = stop
+    service.run(max_sweeps=1)
+    assert not [e for e in events if e.kind == LEFT]
+    assert not any(device.stale for device in service.devices.values())
+    service.close()
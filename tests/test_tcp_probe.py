@@ -0,0 +1,73 @@
+"""
+Tests for TCP/UDP fallback probes
+"""
+import socket
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from netmaster_pro.core.scan_engine import FallbackStage, ProbeStage
+from netmaster_pro.core.tcp_probe import TcpConnectStage
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def test_listening_port_counts_as_alive():
+    with socket.socket() as server:
+        server.bind(("127.0.0.1", 0))
+        server.listen()
+        stage = TcpConnectStage(ports=[server.getsockname()[1]], timeout=0.5)
+        assert stage.probe_sync("127.0.0.1") is not None
+
+
+def test_refused_connection_counts_as_alive():
+    stage = TcpConnectStage(ports=[free_port()], timeout=0.5)
+    assert stage.probe_sync("127.0.0.1") is not None
+
+
+def test_udp_port_unreachable_counts_as_alive():
+    stage = TcpConnectStage(ports=[], udp_ports=[free_port()], timeout=0.5)
+    assert stage.probe_sync("127.0.0.1") is not None
+
+
+def test_interface_bound_probes_reach_hosts_on_that_interface():
+    with socket.socket() as server:
+        server.bind(("127.0.0.1", 0))
+        server.listen()
+        stage = TcpConnectStage(ports=[server.getsockname()[1]], udp_ports=[free_port()],
+                                timeout=0.5, interface="lo")
+        assert stage.probe_sync("127.0.0.1") is not None
+    assert TcpConnectStage(ports=[], udp_ports=[free_port()], timeout=0.5, interface="lo").probe_sync("127.0.0.1")
+
+
+def test_unreachable_host_is_dead():
+    # TEST-NET-1 is reserved and never answers
+    stage = TcpConnectStage(ports=[80, 443], timeout=0.2)
+    assert stage.probe_sync("192.0.2.123") is None
+
+
+def test_fallback_only_runs_for_unconfirmed_hosts():
+    class Recording(ProbeStage):
+        def __init__(self, answer):
+            self.answer = answer
+            self.calls = []
+
+        async def probe(self, ip):
+            self.calls.append(ip)
+            return self.answer
+
+    primary = Recording(None)
+    secondary = Recording(0.01)
+    stage = FallbackStage(primary, secondary)
+    assert stage.probe_sync("10.0.0.1") == 0.01
+    assert secondary.calls == ["10.0.0.1"]
+
+    primary.answer = 0.001
+    assert stage.probe_sync("10.0.0.2") == 0.001
+    assert secondary.calls == ["10.0.0.1"]
+
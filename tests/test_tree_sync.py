@@ -0,0 +1,77 @@
+"""
+Tests for incremental Treeview updates
+"""
+import sys
+import os
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from netmaster_pro.core.tree_sync import TreeviewSync, SyncStats
+from netmaster_pro.utils.fake_tree import FakeTree
+
+
+def rows(*ids, status="Active"):
+    return [(str(i), (f"10.0.0.{i}", status)) for i in ids]
+
+
+def check(tree, expected):
+    assert list(tree.get_children()) == [iid for iid, _ in expected]
+    assert [tree.values(iid) for iid, _ in expected] == [values for _, values in expected]
+
+
+def test_only_differences_reach_the_tree():
+    tree = FakeTree()
+    sync = TreeviewSync(tree)
+    assert sync.apply(rows(*range(1, 101))) == SyncStats(100, 0, 0, 0)
+
+    tree.calls = 0
+    expected = rows(*range(1, 101))
+    expected[10] = ("11", ("10.0.0.11", "Stale"))
+    assert sync.apply(expected) == SyncStats(0, 0, 1, 0)
+    assert tree.calls == 1
+    check(tree, expected)
+
+    # Unchanged input costs nothing
+    tree.calls = 0
+    assert sync.apply(expected) == SyncStats(0, 0, 0, 0)
+    assert tree.calls == 0
+
+
+def test_inserts_and_deletes_keep_positions():
+    tree = FakeTree()
+    sync = TreeviewSync(tree)
+    sync.apply(rows(2, 4, 6, 8))
+
+    expected = rows(1, 2, 5, 6, 9)
+    assert sync.apply(expected) == SyncStats(3, 2, 0, 0)
+    check(tree, expected)
+
+    # A different order moves the surviving rows
+    expected = rows(9, 6, 5, 2, 1)
+    assert sync.apply(expected).moved == 5
+    check(tree, expected)
+
+    sync.clear()
+    assert tree.get_children() == () and len(sync) == 0
+
+
+def test_real_treeview_keeps_selection():
+    tk = pytest.importorskip("tkinter")
+    from tkinter import ttk
+    try:
+        root = tk.Tk()
+    except tk.TclError:
+        pytest.skip("no display")
+    try:
+        tree = ttk.Treeview(root, columns=("IP", "Status"), show="headings")
+        sync = TreeviewSync(tree)
+        sync.apply(rows(1, 2, 3))
+        tree.selection_set("2")
+        sync.apply(rows(1, 2, 3, 4, status="Stale"))
+        assert tree.selection() == ("2",)
+        assert tree.get_children() == ("1", "2", "3", "4")
+        assert tree.item("2")['values'][1] == "Stale"
+    finally:
+        root.destroy()
@@ -0,0 +1,96 @@
+"""
+Tests for the frame-rate-limited UI dispatch queue, driven by a fake clock
+"""
+import sys
+import os
+import threading
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from netmaster_pro.core.ui_dispatch import UiDispatcher
+
+
+class FakeWidget:
+    """Records ``after`` requests instead of running a Tk main loop"""
+
+    def __init__(self):
+        self.scheduled = []
+        self.exists = True
+
+    def after(self, ms, callback):
+        self.scheduled.append((ms, callback))
+        return len(self.scheduled)
+
+    def after_cancel(self, after_id):
+        self.scheduled[after_id - 1] = (None, None)
+
+    def winfo_exists(self):
+        return self.exists
+
+    def run_frame(self):
+        pending = [entry for entry in self.scheduled if entry[1] is not None]
+        self.scheduled = []
+        for _ms, callback in pending:
+            callback()
+
+
+def test_updates_run_once_per_frame_with_keyed_posts_merged():
+    widget = FakeWidget()
+    dispatcher = UiDispatcher(widget, interval=50)
+    dispatcher.start()
+    assert widget.scheduled[0][0] == 50
+
+    shown = []
+    for i in range(1000):
+        dispatcher.post(shown.append, f"status {i}", key="status")
+    dispatcher.post(shown.append, "dialog")
+    dispatcher.post(shown.append, "dialog")
+    assert shown == [] and len(dispatcher) == 3
+
+    widget.run_frame()
+    assert shown == ["status 999", "dialog", "dialog"]
+    # The next frame is scheduled
+    assert len(widget.scheduled) == 1
+
+
+def test_posts_from_many_threads():
+    widget = FakeWidget()
+    dispatcher = UiDispatcher(widget)
+    dispatcher.start()
+    seen = []
+
+    def worker(n):
+        for i in range(200):
+            dispatcher.post(seen.append, (n, i))
+            dispatcher.post(seen.append, ("list", n), key="device_list")
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    widget.run_frame()
+    assert sorted(item for item in seen if item[0] != "list") == [(n, i) for n in range(4) for i in range(200)]
+    assert sum(1 for item in seen if item[0] == "list") == 1
+
+
+def test_errors_do_not_stop_draining_and_destroy_stops_it():
+    widget = FakeWidget()
+    dispatcher = UiDispatcher(widget)
+    dispatcher.start()
+    shown = []
+    dispatcher.post(lambda: 1 / 0)
+    dispatcher.post(shown.append, "after error")
+    widget.run_frame()
+    assert shown == ["after error"]
+
+    widget.exists = False
+    dispatcher.post(shown.append, "too late")
+    widget.run_frame()
+    assert not dispatcher.running and widget.scheduled == []
+    assert shown == ["after error"]
+
+    dispatcher.start()
+    dispatcher.stop()
+    widget.run_frame()
+    assert widget.scheduled == []
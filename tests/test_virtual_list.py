@@ -0,0 +1,122 @@
+"""
+Tests for the virtualized device list, using a stand-in Treeview
+"""
+import sys
+import os
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from netmaster_pro.core.virtual_list import VirtualList
+from netmaster_pro.utils.fake_tree import FakeTree, FakeScrollbar
+
+
+def render(i):
+    return str(i), (f"10.0.{i >> 8 & 255}.{i & 255}",)
+
+
+def make(total=50000):
+    tree = FakeTree()
+    scrollbar = FakeScrollbar()
+    view = VirtualList(tree, scrollbar, overscan=5, visible=20)
+    view.set_rows(range(total), render)
+    return tree, scrollbar, view
+
+
+def test_only_the_window_is_materialized():
+    tree, scrollbar, view = make()
+    assert tree.children == [str(i) for i in range(25)]
+    assert scrollbar.view == (0.0, 20 / 50000)
+
+    view.yview("moveto", "0.5")
+    assert view.first == 25000
+    assert tree.children == [str(i) for i in range(24995, 25025)]
+    # The tree shows the first visible row, not the overscan above it
+    assert tree.top == 5 / 30
+
+    tree.calls = 0
+    view.yview("scroll", "1", "units")
+    assert tree.children[0] == "24996" and tree.children[-1] == "25025"
+    assert tree.calls == 2
+
+    view.yview("scroll", "1", "pages")
+    assert view.first == 25021
+
+    # Scrolling the full list never holds more than the window
+    for index in range(0, 50000, 997):
+        view.scroll_to(index)
+        assert len(tree.children) <= 30
+    view.yview("moveto", "1.0")
+    assert view.first == 50000 - 20 and tree.children[-1] == "49999"
+
+
+def test_wheel_resize_and_shrinking_rows():
+    tree, scrollbar, view = make(1000)
+    assert view.on_wheel(SimpleNamespace(num=5, delta=0)) == "break"
+    assert view.first == 3
+    view.on_wheel(SimpleNamespace(num=None, delta=120))
+    assert view.first == 0
+
+    view.on_resize(SimpleNamespace(height=40 * 20))
+    assert view.visible == 40 and len(tree.children) == 45
+
+    view.scroll_to(990)
+    view.set_rows(range(10), render)
+    assert view.first == 0 and tree.children == [str(i) for i in range(10)]
+    assert scrollbar.view == (0.0, 1.0)
+
+
+def test_selection_survives_scrolling():
+    tree, scrollbar, view = make(1000)
+    tree.selection_set(["3"])
+    view.on_select()
+    view.scroll_to(500)
+    view.on_select()  # Tk reports the deselection caused by removing the row
+    assert tree.selection() == () and view.selection() == ["3"]
+    view.scroll_to(0)
+    assert tree.selection() == ("3",)
+
+    tree.selection_set(["7"])
+    view.on_select()
+    assert view.selection() == ["7"]
+
+
+def test_keys_move_through_the_whole_sequence():
+    tree, scrollbar, view = make(1000)
+
+    def key(name):
+        return view.on_key(SimpleNamespace(keysym=name))
+
+    assert key("Down") == "break"
+    assert tree.focus() == "0" and view.selection() == ["0"]
+
+    for _ in range(25):
+        key("Down")
+    assert tree.focus() == "25" and view.first == 25 - 20 + 1
+    key("Next")
+    assert tree.focus() == "45" and view.first == 26
+    key("Prior")
+    key("Prior")
+    assert tree.focus() == "5" and view.first == 5
+    for _ in range(10):
+        key("Up")
+    assert tree.focus() == "0" and view.first == 0
+    assert view.on_key(SimpleNamespace(keysym="Left")) is None
+
+
+def test_tree_scrolling_moves_the_window():
+    tree, scrollbar, view = make(1000)
+    view.scroll_to(100)
+    start, end = view.window()
+    # The tree scrolled itself three rows down inside the window
+    view.on_tree_scroll(str((100 - start + 3) / (end - start)), "1.0")
+    assert view.first == 103 and scrollbar.view[0] == 103 / 1000
+    # The refresh's own scroll report changes nothing
+    view.on_tree_scroll(str(tree.top), "1.0")
+    assert view.first == 103
+
+
+def test_selection_is_in_numeric_order():
+    tree, scrollbar, view = make(1000)
+    view.selected = {"10", "9", "100"}
+    assert view.selection() == ["9", "10", "100"]
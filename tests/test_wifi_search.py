@@ -0,0 +1,65 @@
+"""
+Tests for the indexed WiFi network search
+"""
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from netmaster_pro.core.wifi_search import NetworkListFilter
+from netmaster_pro.utils.fake_tree import FakeTree
+
+
+def network(ssid, connected=False):
+    return {'ssid': ssid, 'security': "WPA2-Personal", 'signal': "N/A", 'status': "Saved",
+            'password': None, 'is_connected': connected, 'is_saved': True}
+
+
+def make(networks):
+    tree = FakeTree()
+    network_filter = NetworkListFilter(tree, lambda n: (n['ssid'], ()))
+    network_filter.load(networks)
+    return tree, network_filter
+
+
+def test_rows_load_once_in_display_order():
+    tree, network_filter = make([network("cafe"), network("Office", True), network("Attic"), network("office-5G")])
+    assert tree.shown() == ["Office", "Attic", "cafe", "office-5G"]
+    assert network_filter.network("1")['ssid'] == "Attic"
+
+    tree.calls = 0
+    assert network_filter.filter("OFF") == (0, 2)
+    assert tree.shown() == ["Office", "office-5G"]
+    assert network_filter.filter("") == (2, 0)
+    assert tree.shown() == ["Office", "Attic", "cafe", "office-5G"]
+    # Two detaches and two moves; nothing was re-inserted
+    assert tree.calls == 1 + 2
+
+    network_filter.filter("", show_connected=False)
+    assert tree.shown() == ["Attic", "cafe", "office-5G"]
+    network_filter.filter("", show_saved=False)
+    assert tree.shown() == ["Office"]
+
+    # Reloading replaces every row
+    network_filter.load([network("Garage")])
+    assert tree.shown() == ["Garage"] and list(tree.items) == ["0"]
+
+
+def test_extending_a_query_only_checks_previous_matches():
+    networks = [network(f"net-{i:04d}") for i in range(2000)]
+    tree, network_filter = make(networks)
+    network_filter.filter("net-1")
+    assert len(network_filter.visible) == 1000
+
+    checked = []
+    keys = network_filter.keys
+    network_filter.keys = type("Recorder", (), {"__getitem__": lambda self, i: checked.append(i) or keys[i]})()
+    network_filter.filter("net-12")
+    assert len(checked) == 1000
+    assert tree.shown() == [f"net-12{i:02d}" for i in range(100)]
+
+    # A query that is not an extension starts again from every network
+    checked.clear()
+    network_filter.filter("net-2")
+    assert len(checked) == 2000
+    network_filter.keys = keys